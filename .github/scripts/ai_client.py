@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Client asynchrone de l'API d'évaluation IA, en course avec l'analyse locale.
+
+L'appel à /evaluate et l'analyse locale démarrent en même temps : la réponse
+IA est retenue si elle arrive avant l'échéance (AI_DEADLINE), sinon le
+résultat local est utilisé. La durée de l'étape est ainsi bornée même
+quand l'API est lente ou indisponible.
+
+Le client HTTP (bibliothèque standard uniquement) garde les connexions
+ouvertes entre les requêtes (keep-alive), applique un délai par requête,
+réessaie les erreurs transitoires (connexion, 429, 5xx) avec un délai
+exponentiel aléatoire (« full jitter ») et limite le nombre de requêtes
+simultanées lors d'une évaluation par lot.
+
+Variables d'environnement :
+    AI_EVALUATE_URL   URL de l'endpoint /evaluate
+    AI_API_KEY        clé envoyée en « Authorization: Bearer » (service auto-hébergé)
+    AI_DEADLINE       échéance globale en secondes (défaut 25)
+    AI_TIMEOUT        délai d'une tentative en secondes (défaut 20)
+    AI_RETRIES        nombre de nouvelles tentatives (défaut 2)
+    AI_CONCURRENCY    requêtes simultanées en évaluation par lot (défaut 8)
+    AI_RESPONSE_FILE  fichier où écrire le résultat (défaut $RUNNER_TEMP/ai-response.json)
+
+Usage (workflow) :
+    python3 .github/scripts/ai_client.py
+"""
+
+import os
+import ssl
+import sys
+import json
+import random
+import asyncio
+import tempfile
+import threading
+from urllib.parse import urlsplit
+
+from github_actions import write_github_output
+from generate_feedback import analyze_files_with_budget
+from ai_response import write_ai_response
+import instrumentation
+from instrumentation import stage
+
+DEFAULT_EVALUATE_URL = 'https://test-template-feedback-xqok-dlchqyk80-jumvis-projects.vercel.app/evaluate'
+DEFAULT_DEADLINE = 25.0
+DEFAULT_TIMEOUT = 20.0
+DEFAULT_RETRIES = 2
+DEFAULT_CONCURRENCY = 8
+
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 4.0
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+# Paramètres envoyés par le workflow à l'API (niveau attendu par src/evaluator.ts)
+API_NIVEAU = 'debutant'
+API_FILES = ['index.html', 'style.css', 'script.js']
+
+USER_AGENT = 'auto-evaluation/1.0'
+MAX_RESPONSE_SIZE = 8 * 1024 * 1024
+
+
+class AIClientError(Exception):
+    """Échec définitif d'un appel à l'API (après les nouvelles tentatives)"""
+
+
+class TransientError(AIClientError):
+    """Échec qui justifie une nouvelle tentative"""
+
+
+def _get_float(env, key, default):
+    try:
+        return float(env.get(key) or default)
+    except ValueError:
+        return default
+
+
+def _get_int(env, key, default):
+    try:
+        return int(env.get(key) or default)
+    except ValueError:
+        return default
+
+
+def retry_delay(attempt, base=RETRY_BASE_DELAY, cap=RETRY_MAX_DELAY):
+    """Délai avant la tentative suivante : exponentiel borné, tiré uniformément (full jitter)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class ConnectionPool:
+    """Connexions HTTP/1.1 réutilisables, par hôte, en nombre borné"""
+
+    def __init__(self, max_connections=DEFAULT_CONCURRENCY):
+        self._idle = {}
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def acquire(self, scheme, host, port):
+        """Retourne (reader, writer, réutilisée ?) pour l'hôte demandé"""
+        await self._slots.acquire()
+        idle = self._idle.get((scheme, host, port))
+        while idle:
+            reader, writer = idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+        try:
+            ssl_context = ssl.create_default_context() if scheme == 'https' else None
+            reader, writer = await asyncio.open_connection(host, port, ssl=ssl_context)
+        except BaseException:
+            self._slots.release()
+            raise
+        return reader, writer, False
+
+    def release(self, scheme, host, port, reader, writer, reusable):
+        """Rend la connexion au pool (ou la ferme si elle ne peut pas resservir)"""
+        if reusable and not writer.is_closing():
+            self._idle.setdefault((scheme, host, port), []).append((reader, writer))
+        else:
+            writer.close()
+        self._slots.release()
+
+    async def close(self):
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except (OSError, ssl.SSLError):
+                    pass
+        self._idle.clear()
+
+
+async def _read_headers(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError('connexion fermée par le serveur')
+    parts = status_line.decode('latin-1').split(None, 2)
+    if len(parts) < 2 or not parts[0].startswith('HTTP/'):
+        raise AIClientError(f'réponse HTTP invalide: {status_line[:80]!r}')
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    return parts[0], int(parts[1]), headers
+
+
+async def _read_body(reader, headers):
+    """Corps de la réponse et possibilité de réutiliser la connexion"""
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        chunks = []
+        size = 0
+        while True:
+            chunk_size = int((await reader.readline()).split(b';')[0].strip() or b'0', 16)
+            if chunk_size == 0:
+                # Trailers éventuels jusqu'à la ligne vide
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(chunks), True
+            size += chunk_size
+            if size > MAX_RESPONSE_SIZE:
+                raise AIClientError('réponse trop volumineuse')
+            chunks.append(await reader.readexactly(chunk_size))
+            await reader.readline()
+
+    length = headers.get('content-length')
+    if length is not None:
+        length = int(length)
+        if length > MAX_RESPONSE_SIZE:
+            raise AIClientError('réponse trop volumineuse')
+        return await reader.readexactly(length), True
+
+    # Ni longueur ni découpage : le corps s'arrête à la fermeture de la connexion
+    return await reader.read(MAX_RESPONSE_SIZE), False
+
+
+class AIClient:
+    """Client de l'endpoint /evaluate (pool de connexions, délais, nouvelles tentatives)"""
+
+    def __init__(self, url=DEFAULT_EVALUATE_URL, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES,
+                 concurrency=DEFAULT_CONCURRENCY, api_key=None):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f'URL invalide: {url}')
+        self.url = url
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        self.timeout = timeout
+        # AI_RETRIES négatif : une seule tentative
+        self.retries = max(0, retries)
+        self.api_key = api_key
+        self.pool = ConnectionPool(concurrency)
+
+    @classmethod
+    def from_env(cls, env=None, url=None):
+        env = os.environ if env is None else env
+        return cls(
+            url or env.get('AI_EVALUATE_URL') or DEFAULT_EVALUATE_URL,
+            _get_float(env, 'AI_TIMEOUT', DEFAULT_TIMEOUT),
+            _get_int(env, 'AI_RETRIES', DEFAULT_RETRIES),
+            _get_int(env, 'AI_CONCURRENCY', DEFAULT_CONCURRENCY),
+            env.get('AI_API_KEY') or None,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        await self.pool.close()
+
+    def _build_request(self, body):
+        host = self.host if self.port in (80, 443) else f'{self.host}:{self.port}'
+        authorization = f'Authorization: Bearer {self.api_key}\r\n' if self.api_key else ''
+        head = (
+            f'POST {self.path} HTTP/1.1\r\n'
+            f'Host: {host}\r\n'
+            f'User-Agent: {USER_AGENT}\r\n'
+            'Content-Type: application/json\r\n'
+            'Accept: application/json\r\n'
+            f'{authorization}'
+            f'Content-Length: {len(body)}\r\n'
+            'Connection: keep-alive\r\n'
+            '\r\n'
+        )
+        return head.encode('latin-1') + body
+
+    async def _exchange(self, request):
+        reader, writer, reused = await self.pool.acquire(self.scheme, self.host, self.port)
+        reusable = False
+        try:
+            writer.write(request)
+            await writer.drain()
+            version, status, headers = await _read_headers(reader)
+            body, reusable = await _read_body(reader, headers)
+            if version == 'HTTP/1.0' or headers.get('connection', '').lower() == 'close':
+                reusable = False
+            return status, body
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            # Connexion inactive fermée entre-temps par le serveur : on en ouvre une neuve
+            if reused:
+                return None, e
+            raise
+        finally:
+            self.pool.release(self.scheme, self.host, self.port, reader, writer, reusable)
+
+    async def _request_once(self, request):
+        try:
+            status, body = await self._exchange(request)
+            if status is None:
+                status, body = await self._exchange(request)
+        except (OSError, asyncio.IncompleteReadError) as e:
+            raise TransientError(f'connexion impossible: {e}') from e
+
+        if status in RETRY_STATUSES:
+            raise TransientError(f'HTTP {status}')
+        if status >= 400:
+            raise AIClientError(f'HTTP {status}: {body[:200].decode("utf-8", "replace")}')
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            raise AIClientError(f'réponse JSON invalide: {e}') from e
+
+    async def post_json(self, payload):
+        """POST JSON avec délai par tentative et nouvelles tentatives espacées aléatoirement"""
+        request = self._build_request(json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+        for attempt in range(self.retries + 1):
+            try:
+                return await asyncio.wait_for(self._request_once(request), self.timeout)
+            except asyncio.TimeoutError:
+                error = TransientError(f'délai de {self.timeout:g}s dépassé')
+            except TransientError as e:
+                error = e
+            if attempt < self.retries:
+                await asyncio.sleep(retry_delay(attempt))
+        raise error
+
+    async def evaluate(self, payload):
+        """Évaluation IA d'un repository, au format plat attendu par generate_feedback"""
+        ai_data = normalize_ai_response(await self.post_json(payload))
+        if ai_data is None:
+            raise AIClientError("réponse de l'API sans score")
+        return ai_data
+
+
+def normalize_ai_response(response):
+    """Ramène la réponse de /evaluate ({success, data: {analysis}}) au format plat, ou None"""
+    if not isinstance(response, dict) or 'error' in response:
+        return None
+    data = response.get('data')
+    if isinstance(data, dict):
+        ai_data = dict(data.get('analysis') or {})
+        for key in ('score', 'summary'):
+            if key in data:
+                ai_data.setdefault(key, data[key])
+    else:
+        ai_data = dict(response)
+    if 'score' not in ai_data:
+        return None
+    ai_data.setdefault('source', 'ai')
+    return ai_data
+
+
+def build_payload(repository, competence, bareme):
+    """Corps de la requête /evaluate"""
+    return {
+        'repositoryUrl': f'https://github.com/{repository}',
+        'competence': competence,
+        'bareme': bareme,
+        'niveau': API_NIVEAU,
+        'filesToAnalyze': API_FILES,
+    }
+
+
+async def evaluate_with_deadline(client, payload, root='.', deadline=DEFAULT_DEADLINE):
+    """Lance l'appel IA et l'analyse locale en parallèle ; retourne (données, 'ai' | 'local')
+
+    La réponse IA est retenue si elle arrive avant l'échéance, sinon (ou en
+    cas d'échec) le résultat de l'analyse locale. L'analyse locale tourne
+    dans un processus enfant : si l'IA l'emporte, il est arrêté au lieu
+    d'être attendu à la fermeture de la boucle.
+    """
+    cancel = threading.Event()
+    local_task = asyncio.ensure_future(asyncio.to_thread(analyze_files_with_budget, root, cancel=cancel))
+    ai_task = asyncio.ensure_future(client.evaluate(payload))
+    use_local = False
+    try:
+        with stage('ai_request'):
+            ai_data = await asyncio.wait_for(ai_task, deadline)
+        return ai_data, 'ai'
+    except asyncio.TimeoutError:
+        print(f"⏱️ Pas de réponse de l'API IA après {deadline:g}s, utilisation de l'analyse locale")
+        use_local = True
+    except AIClientError as e:
+        print(f"⚠️ API IA indisponible ({e}), utilisation de l'analyse locale")
+        use_local = True
+    finally:
+        if not use_local:
+            cancel.set()
+            local_task.cancel()
+    return await local_task, 'local'
+
+
+async def evaluate_many(client, payloads):
+    """Évaluations IA d'un lot (concurrence bornée par le pool) ; None pour les échecs"""
+
+    async def evaluate_one(payload):
+        # Pas d'échéance globale ici : l'attente d'une place dans le pool n'est pas un échec
+        try:
+            return await client.evaluate(payload)
+        except AIClientError:
+            return None
+
+    return await asyncio.gather(*(evaluate_one(payload) for payload in payloads))
+
+
+async def run(env=None, root='.'):
+    env = os.environ if env is None else env
+    payload = build_payload(
+        env.get('REPOSITORY', 'repository'),
+        env.get('COMPETENCE', 'Développement Web HTML/CSS'),
+        env.get('BAREME', 'Structure HTML (10pts), Style CSS (10pts)'),
+    )
+    deadline = _get_float(env, 'AI_DEADLINE', DEFAULT_DEADLINE)
+    async with AIClient.from_env(env) as client:
+        return await evaluate_with_deadline(client, payload, root, deadline)
+
+
+def get_response_path(env=None):
+    """Fichier du résultat transmis à generate_feedback.py (hors du dépôt évalué)"""
+    env = os.environ if env is None else env
+    return env.get('AI_RESPONSE_FILE') or os.path.join(env.get('RUNNER_TEMP') or tempfile.gettempdir(),
+                                                       'ai-response.json')
+
+
+def main():
+    print("🤖 Appel à l'API d'évaluation intelligente...")
+    try:
+        ai_data, source = asyncio.run(run())
+    except Exception as e:
+        print(f"❌ Évaluation impossible ({e}), utilisation du fallback")
+        write_github_output({
+            'ai_available': 'false',
+            'ai_response_file': '',
+            'ai_source': 'none',
+        })
+        return 0
+
+    if source == 'ai':
+        print(f"✅ Évaluation IA réussie (score {ai_data.get('score')})")
+    # Par fichier plutôt que par sortie d'étape : une variable d'environnement tronque les longues réponses
+    response_path = write_ai_response(get_response_path(), ai_data)
+    write_github_output({
+        'ai_available': 'true',
+        'ai_response_file': response_path,
+        'ai_source': source,
+    })
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(instrumentation.run(main))
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Lecture des réponses de l'API d'évaluation IA.
+
+La réponse arrive par un fichier (AI_RESPONSE_FILE, écrit par ai_client.py),
+par l'entrée standard (AI_RESPONSE_FILE=-) ou, pour les anciens workflows,
+par la variable AI_RESPONSE. Elle est lue une seule fois, par blocs : les
+membres de l'objet JSON sont décodés au fil de la lecture et chaque élément
+de technicalDetails est validé puis converti en `Finding` dès qu'il est
+complet, sans conserver le texte déjà traité. Le résultat est une
+`Evaluation` prête pour le rendu, les exports et l'historique.
+
+La note d'une `Evaluation` est entière : une note fractionnaire de l'IA est
+arrondie au point le plus proche, la demie vers le haut (19.5 -> 20).
+"""
+
+import io
+import os
+import sys
+import json
+import math
+import codecs
+
+from findings import DEFAULT_RULES, Evaluation, Finding
+
+BLOCK_SIZE = 64 * 1024
+MAX_SCORE = 20
+
+TEXT_FIELDS = ('summary',)
+LIST_FIELDS = ('strengths', 'improvements', 'recommendations')
+DETAIL_TEXT_FIELDS = ('file', 'severity', 'issue', 'suggestion', 'rule')
+DETAIL_INT_FIELDS = ('line', 'column', 'penalty')
+
+WHITESPACE = ' \t\n\r'
+
+
+class AIResponseError(ValueError):
+    """Réponse IA illisible ou non conforme au format attendu"""
+
+
+class JSONStreamReader:
+    """Décodage incrémental d'un document JSON lu par blocs"""
+
+    def __init__(self, stream, block_size=BLOCK_SIZE):
+        self.stream = stream
+        self.block_size = block_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+        # Un caractère multi-octets peut être coupé entre deux blocs
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+
+    def _fill(self, size=None):
+        if self.eof:
+            return False
+        block = self.stream.read(size or self.block_size)
+        if not block:
+            self.eof = True
+            return False
+        if isinstance(block, bytes):
+            try:
+                block = self.text_decoder.decode(block)
+            except UnicodeDecodeError:
+                raise AIResponseError('réponse non encodée en UTF-8') from None
+        # Le texte déjà décodé est abandonné
+        if self.pos:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        self.buffer += block
+        return True
+
+    def peek(self):
+        """Prochain caractère significatif ('' en fin de document)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self._fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise AIResponseError(f"'{char}' attendu, '{found or 'fin du document'}' trouvé")
+        self.pos += 1
+
+    def value(self):
+        """Décode la valeur JSON suivante"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                # Valeur incomplète : lire la suite (au moins autant que ce qui est en attente)
+                if not self._fill(max(self.block_size, len(self.buffer) - self.pos)):
+                    raise AIResponseError(f'JSON invalide ({e.msg})') from None
+                continue
+            # Un nombre en fin de tampon peut continuer dans le bloc suivant
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def members(self):
+        """Clés d'un objet ; l'appelant lit chaque valeur (value ou items) avant la clé suivante"""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise AIResponseError('clé d\'objet invalide')
+            self.expect(':')
+            yield key
+            separator = self.peek()
+            self.pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise AIResponseError(f"',' ou '}}' attendu, '{separator or 'fin du document'}' trouvé")
+
+    def items(self):
+        """Éléments d'un tableau, décodés un par un"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            separator = self.peek()
+            self.pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise AIResponseError(f"',' ou ']' attendu, '{separator or 'fin du document'}' trouvé")
+
+    def end(self):
+        if self.peek():
+            raise AIResponseError('contenu après la fin du document JSON')
+
+
+def validate_detail(detail, index):
+    """Vérifie un élément de technicalDetails (objet aux champs texte et entiers)"""
+    if not isinstance(detail, dict):
+        raise AIResponseError(f'technicalDetails[{index}] n\'est pas un objet')
+    for name in DETAIL_TEXT_FIELDS:
+        value = detail.get(name)
+        if value is not None and not isinstance(value, str):
+            raise AIResponseError(f'technicalDetails[{index}].{name} doit être une chaîne')
+    for name in DETAIL_INT_FIELDS:
+        value = detail.get(name)
+        if value is None or isinstance(value, bool):
+            continue
+        if isinstance(value, str) and value.strip().lstrip('-').isdigit():
+            continue
+        if not isinstance(value, int):
+            raise AIResponseError(f'technicalDetails[{index}].{name} doit être un entier')
+    return detail
+
+
+def validate_score(score):
+    """Note entière entre 0 et MAX_SCORE, arrondie au plus proche (demie vers le haut)"""
+    if isinstance(score, str):
+        try:
+            score = float(score)
+        except ValueError:
+            raise AIResponseError(f'score invalide : {score!r}') from None
+    if isinstance(score, bool) or not isinstance(score, (int, float)):
+        raise AIResponseError('score manquant ou non numérique')
+    if not 0 <= score <= MAX_SCORE:
+        raise AIResponseError(f'score hors de l\'intervalle 0-{MAX_SCORE} : {score}')
+    return math.floor(score + 0.5)
+
+
+def validate_ai_data(fields, findings):
+    """Construit l'évaluation à partir des champs lus (format plat ou réponse brute de /evaluate)"""
+    if fields.get('success') is False or 'error' in fields:
+        raise AIResponseError(str(fields.get('error') or 'évaluation en échec'))
+
+    data = fields.get('data')
+    if isinstance(data, dict):
+        # Réponse brute de l'API : {success, data: {score, summary, analysis: {...}}}
+        analysis = data.get('analysis') or {}
+        if not isinstance(analysis, dict):
+            raise AIResponseError('data.analysis n\'est pas un objet')
+        flat = dict(analysis)
+        for key in ('score', 'summary'):
+            if key in data:
+                flat.setdefault(key, data[key])
+        details = flat.pop('technicalDetails', None) or []
+        if not isinstance(details, list):
+            raise AIResponseError('technicalDetails doit être une liste')
+        findings = [Finding.from_dict(validate_detail(detail, index)) for index, detail in enumerate(details)]
+        fields = flat
+    elif fields.get('technicalDetails') is not None:
+        raise AIResponseError('technicalDetails doit être une liste')
+
+    if 'score' not in fields:
+        raise AIResponseError('score manquant')
+    score = validate_score(fields['score'])
+    for name in TEXT_FIELDS:
+        if name in fields and not isinstance(fields[name], str):
+            raise AIResponseError(f'{name} doit être une chaîne')
+    for name in LIST_FIELDS:
+        value = fields.get(name)
+        if value is not None and not isinstance(value, list):
+            raise AIResponseError(f'{name} doit être une liste')
+
+    source = fields.get('source') or 'ai'
+    default_rule = DEFAULT_RULES.get(source)
+    if default_rule:
+        for finding in findings:
+            if finding.rule is None:
+                finding.rule = sys.intern(default_rule)
+
+    return Evaluation(
+        source,
+        score,
+        MAX_SCORE,
+        fields.get('summary', 'Évaluation effectuée avec succès.'),
+        findings=findings,
+        strengths=[str(item) for item in fields.get('strengths') or []],
+        improvements=[str(item) for item in fields.get('improvements') or []],
+        recommendations=[str(item) for item in fields.get('recommendations') or []],
+    )
+
+
+def parse_ai_response(stream, block_size=BLOCK_SIZE):
+    """Lit et valide une réponse IA en une passe ; retourne une `Evaluation`"""
+    reader = JSONStreamReader(stream, block_size)
+    fields = {}
+    findings = []
+    for key in reader.members():
+        if key == 'technicalDetails' and reader.peek() == '[':
+            for index, detail in enumerate(reader.items()):
+                findings.append(Finding.from_dict(validate_detail(detail, index)))
+        else:
+            fields[key] = reader.value()
+    reader.end()
+    return validate_ai_data(fields, findings)
+
+
+def read_ai_response(env=None, stdin=None):
+    """Évaluation IA depuis AI_RESPONSE_FILE (chemin, ou - pour l'entrée standard) ou AI_RESPONSE"""
+    env = os.environ if env is None else env
+    path = env.get('AI_RESPONSE_FILE')
+    if path == '-':
+        return parse_ai_response(stdin or sys.stdin.buffer)
+    if path:
+        try:
+            with open(path, 'rb') as f:
+                return parse_ai_response(f)
+        except OSError as e:
+            raise AIResponseError(f'lecture de {path} impossible ({e.strerror})') from None
+    return parse_ai_response(io.StringIO(env.get('AI_RESPONSE', '')))
+
+
+def write_ai_response(path, ai_data):
+    """Écrit une réponse IA (format plat) pour generate_feedback.py"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(ai_data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Budgets de temps CPU, de durée et de mémoire pour l'analyse d'une soumission.
+
+L'analyse est exécutée dans un processus enfant dédié, limité par
+setrlimit (RLIMIT_CPU pour le temps CPU, RLIMIT_AS pour la mémoire) et
+surveillé par le parent pour la durée réelle. L'enfant transmet ses
+résultats au fil de l'eau (findings de chaque fichier terminé) : s'il
+dépasse son budget, il est arrêté et le parent dispose de tout ce qui a
+été calculé avant l'interruption. Un fichier CSS de plusieurs mégaoctets
+sur une seule ligne ou un HTML très imbriqué ne bloque ainsi ni le
+workflow ni les autres soumissions d'une évaluation par lot.
+
+Variables (0 pour désactiver une limite) :
+    ANALYSIS_CPU_SECONDS   temps CPU maximum (défaut: 60)
+    ANALYSIS_WALL_SECONDS  durée maximum (défaut: 120)
+    ANALYSIS_MEMORY_MB     mémoire supplémentaire maximum (défaut: 1024)
+"""
+
+import os
+import math
+import time
+import signal
+import multiprocessing
+
+try:
+    import resource
+except ImportError:
+    # Windows : seule la durée réelle est bornée
+    resource = None
+
+DEFAULT_CPU_SECONDS = 60
+DEFAULT_WALL_SECONDS = 120
+DEFAULT_MEMORY_MB = 1024
+
+# Intervalle de vérification d'une demande d'annulation (secondes)
+CANCEL_POLL_SECONDS = 0.05
+
+BUDGET_ENV_KEYS = {
+    'cpu_seconds': ('ANALYSIS_CPU_SECONDS', DEFAULT_CPU_SECONDS),
+    'wall_seconds': ('ANALYSIS_WALL_SECONDS', DEFAULT_WALL_SECONDS),
+    'memory_mb': ('ANALYSIS_MEMORY_MB', DEFAULT_MEMORY_MB),
+}
+
+# Motif d'interruption -> description pour le rapport
+REASONS = {
+    'cpu': 'limite de temps CPU',
+    'wall': 'limite de durée',
+    'memory': 'limite de mémoire',
+    'crash': 'arrêt inattendu du processus d\'analyse',
+    'cancelled': 'analyse annulée',
+}
+
+
+def get_budget(env=None, **overrides):
+    """Budget d'analyse : {'cpu_seconds', 'wall_seconds', 'memory_mb'} (0 = sans limite)"""
+    env = os.environ if env is None else env
+    budget = {}
+    for name, (key, default) in BUDGET_ENV_KEYS.items():
+        value = overrides.get(name)
+        if value is None:
+            try:
+                value = float(env.get(key) or default)
+            except ValueError:
+                value = default
+        budget[name] = max(0, value)
+    return budget
+
+
+def budget_enabled(budget):
+    return bool(budget) and any(budget.values())
+
+
+def describe_budget(budget, reason):
+    """Limite atteinte en clair (ex. « limite de temps CPU (60 s) »)"""
+    label = REASONS.get(reason, REASONS['crash'])
+    if reason == 'cpu':
+        return f"{label} ({budget['cpu_seconds']:g} s)"
+    if reason == 'wall':
+        return f"{label} ({budget['wall_seconds']:g} s)"
+    if reason == 'memory':
+        return f"{label} ({budget['memory_mb']:g} Mo)"
+    return label
+
+
+def _current_address_space():
+    """Espace d'adressage déjà occupé (octets), hérité du parent au fork"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _apply_limits(budget):
+    if resource is None:
+        return
+    cpu_seconds = budget.get('cpu_seconds')
+    if cpu_seconds:
+        # Limite souple : SIGXCPU ; limite dure une seconde plus tard : SIGKILL
+        soft = max(1, math.ceil(cpu_seconds))
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+            resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+        else:
+            resource.setrlimit(resource.RLIMIT_CPU, (soft, soft + 1))
+    memory_mb = budget.get('memory_mb')
+    if memory_mb:
+        limit = _current_address_space() + int(memory_mb * 1024 * 1024)
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _child_main(conn, target, args, budget):
+    """Processus enfant : limites appliquées, messages et résultat envoyés au parent"""
+    try:
+        # Groupe de processus propre : un arrêt emporte aussi les processus lancés par l'analyse
+        if hasattr(os, 'setpgid'):
+            os.setpgid(0, 0)
+        _apply_limits(budget)
+        result = target(*args, conn.send)
+        conn.send(('done', result))
+    except MemoryError:
+        conn.send(('memory', None))
+    except BaseException as e:
+        conn.send(('error', f'{type(e).__name__}: {e}'))
+    finally:
+        conn.close()
+
+
+def _children_cpu_time():
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _kill(process):
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, OSError):
+        process.kill()
+
+
+def _get_context():
+    # fork : démarrage en quelques millisecondes, modules déjà importés
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
+def run_with_budget(target, args=(), budget=None, on_message=None, cancel=None):
+    """Exécute target(*args, send) dans un processus enfant borné par le budget
+
+    `send` transmet au parent des résultats partiels, remis à `on_message`
+    dès leur réception. Retourne (résultat, motif) : motif vaut None si
+    l'analyse est allée à son terme, sinon 'cpu', 'wall', 'memory',
+    'crash' ou 'cancelled' et le résultat est None. Une exception de target
+    est relancée dans le parent (RuntimeError). `cancel` (threading.Event)
+    permet d'arrêter l'enfant depuis un autre thread.
+    """
+    budget = budget or {}
+    context = _get_context()
+    receiver, sender = context.Pipe(duplex=False)
+    cpu_before = _children_cpu_time()
+    process = context.Process(target=_child_main, args=(sender, target, args, budget))
+    process.start()
+    sender.close()
+
+    wall_seconds = budget.get('wall_seconds')
+    deadline = time.monotonic() + wall_seconds if wall_seconds else None
+    result = None
+    reason = None
+    error = None
+    finished = False
+    try:
+        while True:
+            if cancel is not None and cancel.is_set():
+                reason = 'cancelled'
+                break
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if cancel is not None:
+                timeout = CANCEL_POLL_SECONDS if timeout is None else min(timeout, CANCEL_POLL_SECONDS)
+            if not receiver.poll(timeout):
+                if deadline is not None and time.monotonic() >= deadline:
+                    reason = 'wall'
+                    break
+                continue
+            try:
+                kind, payload = receiver.recv()
+            except (EOFError, OSError):
+                # Processus arrêté par le noyau (SIGXCPU, SIGKILL) sans message final
+                reason = 'crash'
+                break
+            if kind == 'done':
+                result = payload
+                finished = True
+                break
+            if kind == 'memory':
+                reason = 'memory'
+                break
+            if kind == 'error':
+                error = payload
+                finished = True
+                break
+            if on_message is not None:
+                on_message(kind, payload)
+    finally:
+        receiver.close()
+        if not finished:
+            _kill(process)
+        process.join()
+
+    if reason == 'crash':
+        cpu_seconds = budget.get('cpu_seconds')
+        exit_signal = -process.exitcode if process.exitcode and process.exitcode < 0 else None
+        if exit_signal == getattr(signal, 'SIGXCPU', None) or (
+                cpu_seconds and _children_cpu_time() - cpu_before >= math.ceil(cpu_seconds) - 0.5):
+            reason = 'cpu'
+    if error is not None:
+        raise RuntimeError(error)
+    return result, reason
+
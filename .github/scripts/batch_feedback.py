@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Évaluation par lot d'une promotion entière (GitHub Classroom).
+
+Usage :
+    python3 .github/scripts/batch_feedback.py SOUMISSIONS/ [--workers N]
+    python3 .github/scripts/batch_feedback.py --manifest manifest.json
+
+Chaque soumission est un dossier cloné contenant index.html / style.css.
+Un FEEDBACK.md est écrit dans chaque dossier (ou sous --output-dir) et un
+résumé JSON de la promotion est produit à la fin. Avec --jsonl, les
+évaluations structurées (score, findings) sont ajoutées à un fichier JSONL,
+une ligne par soumission. Avec --ai-url, l'API d'évaluation IA est
+interrogée pour toute la promotion (AI_CONCURRENCY requêtes simultanées) ;
+l'analyse locale prend le relais pour les soumissions sans réponse. Avec
+--history, chaque évaluation est ajoutée à l'historique SQLite et le
+rapport indique la progression depuis l'évaluation précédente du dépôt.
+
+L'analyse locale de chaque soumission tourne dans son propre processus,
+limité en temps CPU, en durée et en mémoire (--cpu-seconds, --wall-seconds,
+--memory-mb ou ANALYSIS_*). Une soumission qui dépasse son budget reçoit un
+rapport « analyse interrompue » avec les problèmes trouvés jusque-là, sans
+bloquer les processus qui évaluent le reste de la promotion.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from findings import Evaluation, append_jsonl
+from generate_feedback import analyze_files_with_budget, render_ai_feedback
+from analysis_budget import get_budget
+from ai_client import AIClient, build_payload, evaluate_many
+from history_store import connect, format_progression, latest_evaluation, record_evaluation
+
+
+def discover_submissions(submissions_dir):
+    """Liste les dossiers de soumission (un sous-dossier par étudiant)"""
+    submissions = []
+    for name in sorted(os.listdir(submissions_dir)):
+        path = os.path.join(submissions_dir, name)
+        if name.startswith('.') or not os.path.isdir(path):
+            continue
+        submissions.append({'path': path, 'repository': name})
+    return submissions
+
+
+def load_manifest(manifest_path):
+    """Charge un manifeste JSON ([{"path", "repository"}]) ou texte (un chemin par ligne)"""
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        if manifest_path.endswith('.json'):
+            entries = json.load(f)
+        else:
+            entries = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+    submissions = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {'path': entry}
+        path = entry['path']
+        if not os.path.isabs(path):
+            path = os.path.join(base_dir, path)
+        submissions.append({
+            'path': path,
+            'repository': entry.get('repository') or os.path.basename(os.path.normpath(path)),
+        })
+    return submissions
+
+
+def grade_submission(task):
+    """Évalue une soumission : réponse IA (ou analyse locale), score et rendu du FEEDBACK.md"""
+    path = task['path']
+    started = time.perf_counter()
+    result = {'repository': task['repository'], 'path': path}
+
+    try:
+        ai_data = task.get('ai_data') or analyze_files_with_budget(path, task.get('budget'), workers=1)
+        evaluation = Evaluation.from_ai_data(ai_data, ai_data.get('source', 'local'))
+        progression = format_progression(task['previous'], evaluation) if task.get('previous') else None
+        feedback = render_ai_feedback(ai_data, task['repository'], task['competence'], task['niveau'], progression)
+
+        output_dir = task.get('output_dir') or path
+        os.makedirs(output_dir, exist_ok=True)
+        feedback_path = os.path.join(output_dir, 'FEEDBACK.md')
+        with open(feedback_path, 'w', encoding='utf-8') as f:
+            f.write(feedback)
+
+        result.update({
+            'status': 'ok',
+            'score': ai_data['score'],
+            'findings': len(ai_data.get('technicalDetails', [])),
+            'source': ai_data.get('source', 'local'),
+            'feedback': feedback_path,
+        })
+        if ai_data.get('truncated'):
+            result['truncated'] = ai_data['truncated']
+        if task.get('structured'):
+            result['evaluation'] = evaluation
+    except Exception as e:
+        result.update({'status': 'error', 'error': str(e)})
+
+    result['duration_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+def fetch_ai_evaluations(submissions, ai_url, competence, bareme):
+    """Interroge l'API IA pour toute la promotion (concurrence bornée) ; None pour les échecs"""
+
+    async def fetch():
+        async with AIClient.from_env(url=ai_url) as client:
+            payloads = [build_payload(submission['repository'], competence, bareme) for submission in submissions]
+            return await evaluate_many(client, payloads)
+
+    return asyncio.run(fetch())
+
+
+def run_batch(submissions, workers=None, output_dir=None, competence=None, niveau=None, structured=False,
+              ai_url=None, history=None, budget=None):
+    """Évalue toutes les soumissions sur un pool de processus
+
+    Avec `history` (connexion SQLite), la dernière évaluation de chaque dépôt
+    est lue avant l'envoi aux processus pour la ligne de progression.
+    `budget` (voir analysis_budget.get_budget) borne l'analyse de chaque soumission.
+    """
+    competence = competence or os.environ.get('COMPETENCE', 'Développement Web HTML/CSS')
+    niveau = niveau or os.environ.get('NIVEAU', 'Débutant')
+    budget = get_budget() if budget is None else budget
+
+    ai_results = [None] * len(submissions)
+    if ai_url and submissions:
+        bareme = os.environ.get('BAREME', 'Structure HTML (10pts), Style CSS (10pts)')
+        ai_results = fetch_ai_evaluations(submissions, ai_url, competence, bareme)
+        print(f"🤖 {sum(1 for ai_data in ai_results if ai_data)}/{len(submissions)} évaluation(s) IA reçue(s)")
+
+    tasks = []
+    for submission, ai_data in zip(submissions, ai_results):
+        tasks.append({
+            'path': submission['path'],
+            'repository': submission['repository'],
+            'competence': competence,
+            'niveau': niveau,
+            'output_dir': os.path.join(output_dir, submission['repository']) if output_dir else None,
+            'structured': structured,
+            'ai_data': ai_data,
+            'previous': latest_evaluation(history, submission['repository']) if history is not None else None,
+            'budget': budget,
+        })
+
+    if not tasks:
+        return []
+
+    workers = workers or os.cpu_count() or 1
+    # Des lots de plusieurs soumissions amortissent le coût d'échange entre processus
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(grade_submission, tasks, chunksize=chunksize))
+
+
+def build_summary(results, duration):
+    """Agrège les résultats de la promotion"""
+    graded = [r for r in results if r['status'] == 'ok']
+    scores = [r['score'] for r in graded]
+    return {
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'submissions': len(results),
+        'graded': len(graded),
+        'failed': len(results) - len(graded),
+        'truncated': sum(1 for r in graded if r.get('truncated')),
+        'average_score': round(sum(scores) / len(scores), 2) if scores else None,
+        'duration_s': round(duration, 3),
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Évaluation par lot des soumissions d'une promotion")
+    parser.add_argument('submissions_dir', nargs='?', help='Dossier contenant un sous-dossier par soumission')
+    parser.add_argument('--manifest', help='Manifeste JSON ou texte listant les soumissions')
+    parser.add_argument('--workers', type=int, default=None, help='Nombre de processus (défaut: nombre de CPU)')
+    parser.add_argument('--output-dir', help='Écrire les FEEDBACK.md ici plutôt que dans chaque soumission')
+    parser.add_argument('--summary', help='Chemin du résumé JSON (défaut: batch-summary.json)')
+    parser.add_argument('--jsonl', help='Ajouter les évaluations structurées à ce fichier JSONL')
+    parser.add_argument('--ai-url', help="Interroger l'API d'évaluation IA à cette URL (/evaluate)")
+    parser.add_argument('--history', help="Base SQLite d'historique des évaluations (progression par dépôt)")
+    parser.add_argument('--promotion', help="Promotion enregistrée dans l'historique")
+    parser.add_argument('--cpu-seconds', type=float, help='Temps CPU maximum par soumission (défaut: ANALYSIS_CPU_SECONDS ou 60, 0 = sans limite)')
+    parser.add_argument('--wall-seconds', type=float, help='Durée maximum par soumission (défaut: ANALYSIS_WALL_SECONDS ou 120, 0 = sans limite)')
+    parser.add_argument('--memory-mb', type=float, help='Mémoire maximum par soumission en Mo (défaut: ANALYSIS_MEMORY_MB ou 1024, 0 = sans limite)')
+    args = parser.parse_args(argv)
+
+    if args.manifest:
+        submissions = load_manifest(args.manifest)
+    elif args.submissions_dir:
+        submissions = discover_submissions(args.submissions_dir)
+    else:
+        parser.error('indiquez un dossier de soumissions ou --manifest')
+
+    print(f"📦 {len(submissions)} soumission(s) à évaluer")
+    started = time.perf_counter()
+    history = connect(args.history) if args.history else None
+    results = run_batch(submissions, workers=args.workers, output_dir=args.output_dir,
+                        structured=bool(args.jsonl or history), ai_url=args.ai_url, history=history,
+                        budget=get_budget(cpu_seconds=args.cpu_seconds, wall_seconds=args.wall_seconds,
+                                          memory_mb=args.memory_mb))
+    for result in results:
+        evaluation = result.pop('evaluation', None)
+        if evaluation is None:
+            continue
+        if args.jsonl:
+            append_jsonl(args.jsonl, evaluation, repository=result['repository'])
+        if history is not None:
+            record_evaluation(history, evaluation, result['repository'], promotion=args.promotion)
+    if history is not None:
+        history.close()
+    summary = build_summary(results, time.perf_counter() - started)
+
+    summary_path = args.summary or os.path.join(args.output_dir or args.submissions_dir or '.', 'batch-summary.json')
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    for result in results:
+        if result['status'] != 'ok':
+            print(f"❌ {result['repository']}: {result['error']}")
+        elif result.get('truncated'):
+            print(f"⏱️ {result['repository']}: analyse interrompue ({result['truncated']}), rapport partiel")
+    print(f"✅ {summary['graded']}/{summary['submissions']} soumission(s) évaluée(s) en {summary['duration_s']}s")
+    print(f"📄 Résumé écrit dans {summary_path}")
+    return 0 if summary['failed'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Banc de performance de la chaîne d'évaluation sur un corpus synthétique.
+
+Génère des soumissions d'étudiants de taille et de densité de défauts
+contrôlées (code propre, défauts connus `clas=` / `position: stick` /
+`width: 250%`, bibliothèque CSS copiée, CSS minifié sur une ligne), puis
+mesure chaque étape : analyse locale, critères du barème, rendu des
+rapports. Pour chaque étape : temps (meilleur de N passages), débit et pic
+mémoire (tracemalloc, passage séparé). Comparé à une référence JSON, le
+banc échoue (code de sortie 1) si une étape régresse au-delà du seuil.
+
+Usage :
+    python3 .github/scripts/benchmark.py --save-baseline bench-baseline.json
+    python3 .github/scripts/benchmark.py --baseline bench-baseline.json --threshold 0.2
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import contextlib
+import tempfile
+import tracemalloc
+
+from css_metrics import evaluate_css
+from generate_feedback import analyze_files_locally
+from html_validator import score_validation, validate_html_file
+from report_renderer import render_ai_report, render_criteria_report
+
+SUBMISSION_KINDS = ('clean', 'defects', 'vendored', 'minified')
+DEFAULT_THRESHOLD = 0.2
+
+# En deçà de ces écarts absolus, une variation est considérée comme du bruit
+NOISE_FLOOR = {'seconds': 0.002, 'peak_kib': 64}
+
+CSS_CLEAN_RULES = (
+    '.card-{n} {{\n  padding: 1rem;\n  color: #333333;\n  font-size: 1.2rem;\n}}\n',
+    '.btn-{n}:hover {{\n  background: var(--primary-color);\n  line-height: 1.5;\n}}\n',
+    '/* Section {n} */\n.section-{n} {{\n  margin: 2rem auto;\n  max-width: 60em;\n}}\n',
+    '.nav-{n} a:focus {{\n  outline: 2px solid #667eea;\n  letter-spacing: 0.05em;\n}}\n',
+)
+CSS_DEFECT_RULES = (
+    '.wide-{n} {{\n  width: 250%;\n}}\n',
+    '.sticky-{n} {{\n  position: stick;\n  top: 0;\n}}\n',
+    '.hidden-{n} {{\n  margin-left: -9999px;\n}}\n',
+    '.link-{n} {{\n  cursor: pointer\n  height: 400px\n}}\n',
+)
+HTML_CLEAN_BLOCKS = (
+    '<section class="section-{n}">\n  <h2>Titre {n}</h2>\n  <p>Paragraphe {n}.</p>\n</section>\n',
+    '<ul class="nav-{n}">\n  <li><a href="#s{n}">Lien {n}</a></li>\n</ul>\n',
+    '<div class="card-{n}">\n  <img src="img{n}.png" alt="Image {n}">\n</div>\n',
+)
+HTML_DEFECT_BLOCKS = (
+    '<div clas="card-{n}">\n  <p>Attribut mal orthographié</p>\n</div>\n',
+    '<div style="color: red">\n  <span>Style inline {n}\n</div>\n',
+    '<section>\n  <p>Balise non fermée {n}\n  <div>bloc</div>\n',
+)
+VENDORED_BANNER = '/*!\n * Bootstrap v5.3.0 (https://getbootstrap.com/)\n * Licensed under MIT\n */\n'
+
+
+def _fill(blocks, clean_blocks, target_bytes, defect_density, rng):
+    parts = []
+    size = 0
+    n = 0
+    while size < target_bytes:
+        pool = blocks if blocks and rng.random() < defect_density else clean_blocks
+        part = rng.choice(pool).format(n=n)
+        parts.append(part)
+        size += len(part)
+        n += 1
+    return ''.join(parts)
+
+
+def generate_submission(path, kind='defects', size_kb=8, defect_density=0.1, seed=0):
+    """Écrit une soumission synthétique (index.html + style.css) dans path"""
+    rng = random.Random(seed)
+    os.makedirs(path, exist_ok=True)
+    target = size_kb * 1024
+    density = defect_density if kind == 'defects' else 0.0
+
+    css = _fill(CSS_DEFECT_RULES, CSS_CLEAN_RULES, target, density, rng)
+    if kind == 'vendored':
+        css = VENDORED_BANNER + css
+    elif kind == 'minified':
+        css = css.replace('\n', '').replace('  ', '')
+
+    body = _fill(HTML_DEFECT_BLOCKS, HTML_CLEAN_BLOCKS, target, density, rng)
+    html = (
+        '<!DOCTYPE html>\n<html lang="fr">\n<head>\n  <meta charset="UTF-8">\n'
+        '  <title>Soumission synthétique</title>\n  <link rel="stylesheet" href="style.css">\n'
+        f'</head>\n<body>\n{body}</body>\n</html>\n'
+    )
+
+    with open(os.path.join(path, 'style.css'), 'w', encoding='utf-8') as f:
+        f.write(css)
+    with open(os.path.join(path, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(html)
+    return path
+
+
+def generate_corpus(directory, count=20, size_kb=8, defect_density=0.1, seed=0, kinds=SUBMISSION_KINDS):
+    """Génère un corpus de soumissions en alternant les types"""
+    submissions = []
+    for index in range(count):
+        kind = kinds[index % len(kinds)]
+        path = os.path.join(directory, f'{index:04d}-{kind}')
+        generate_submission(path, kind, size_kb, defect_density, seed + index)
+        submissions.append(path)
+    return submissions
+
+
+def corpus_bytes(submissions):
+    return sum(
+        os.path.getsize(os.path.join(path, name))
+        for path in submissions for name in ('index.html', 'style.css')
+    )
+
+
+# ----------------------------------------------------------------------------
+# Étapes mesurées
+# ----------------------------------------------------------------------------
+
+def stage_local_analysis(submissions):
+    return [analyze_files_locally(path) for path in submissions]
+
+
+def stage_criteria(submissions):
+    results = []
+    for path in submissions:
+        css = evaluate_css(os.path.join(path, 'style.css'), os.path.join(path, 'index.html'))
+        validation = score_validation(validate_html_file(os.path.join(path, 'index.html')), 3)
+        results.append((css, validation))
+    return results
+
+
+def stage_render_ai(local_results):
+    timestamp = '01/01/2026 à 10:00'
+    return [render_ai_report(result, 'bench/repository', 'Développement Web HTML/CSS', 'Débutant', timestamp)
+            for result in local_results]
+
+
+def stage_render_criteria(criteria_results):
+    reports = []
+    for css, validation in criteria_results:
+        total = css['css_score'] + validation['html_score']
+        reports.append(render_criteria_report({
+            'html_score': validation['html_score'],
+            'html_max_score': 3,
+            'total_score': total,
+            'total_max_score': 12,
+            'excellent_score': 9,
+            'good_score': 8,
+            'structure_score': css['structure_score'],
+            'typography_score': css['typography_score'],
+            'practices_score': css['practices_score'],
+        }, 'Débutant', 'bench/repository', 'Développement Web HTML/CSS', 'index.html,style.css',
+            validation['html_errors'], '\n'.join(css['errors']), str(validation['error_count'])))
+    return reports
+
+
+def measure(fn, argument, repeat):
+    """Meilleur temps sur `repeat` passages, puis pic mémoire sur un passage instrumenté"""
+    best = None
+    result = None
+    # Les messages de progression des étapes ne font pas partie de la mesure
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = fn(argument)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+
+        tracemalloc.start()
+        fn(argument)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, best, peak
+
+
+def run_benchmark(submissions, repeat=3):
+    """Mesure toutes les étapes sur le corpus et retourne les résultats"""
+    count = len(submissions)
+    total_bytes = corpus_bytes(submissions)
+    stages = {}
+
+    def record(name, seconds, peak, items, processed_bytes=None):
+        stages[name] = {
+            'seconds': round(seconds, 6),
+            'items_per_s': round(items / seconds, 1) if seconds else None,
+            'peak_kib': round(peak / 1024, 1),
+        }
+        if processed_bytes is not None:
+            stages[name]['mb_per_s'] = round(processed_bytes / 1024 / 1024 / seconds, 2) if seconds else None
+
+    local_results, seconds, peak = measure(stage_local_analysis, submissions, repeat)
+    record('local_analysis', seconds, peak, count, total_bytes)
+
+    criteria_results, seconds, peak = measure(stage_criteria, submissions, repeat)
+    record('criteria', seconds, peak, count, total_bytes)
+
+    _, seconds, peak = measure(stage_render_ai, local_results, repeat)
+    record('render_ai', seconds, peak, count)
+
+    _, seconds, peak = measure(stage_render_criteria, criteria_results, repeat)
+    record('render_criteria', seconds, peak, count)
+
+    return {
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'corpus': {'submissions': count, 'bytes': total_bytes},
+        'stages': stages,
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Liste des régressions (temps ou mémoire) au-delà du seuil relatif"""
+    regressions = []
+    for name, current in results['stages'].items():
+        reference = baseline.get('stages', {}).get(name)
+        if not reference:
+            continue
+        for metric in ('seconds', 'peak_kib'):
+            before = reference.get(metric)
+            after = current.get(metric)
+            if not before or after is None or after - before <= NOISE_FLOOR[metric]:
+                continue
+            if after > before * (1 + threshold):
+                regressions.append({
+                    'stage': name,
+                    'metric': metric,
+                    'baseline': before,
+                    'current': after,
+                    'change': round(after / before - 1, 3),
+                })
+    return regressions
+
+
+def print_results(results, baseline=None):
+    print(f"📊 Corpus: {results['corpus']['submissions']} soumission(s), {results['corpus']['bytes'] / 1024:.0f} Ko")
+    for name, stage in results['stages'].items():
+        line = f"   - {name:<16} {stage['seconds'] * 1000:9.2f} ms  {stage['items_per_s'] or 0:10.1f} soumissions/s  pic {stage['peak_kib']:8.1f} Kio"
+        if 'mb_per_s' in stage:
+            line += f"  {stage['mb_per_s'] or 0:.2f} Mo/s"
+        reference = (baseline or {}).get('stages', {}).get(name)
+        if reference and reference.get('seconds'):
+            line += f"  ({(stage['seconds'] / reference['seconds'] - 1) * 100:+.1f}% vs référence)"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banc de performance de l'évaluation sur un corpus synthétique")
+    parser.add_argument('--corpus', help='Dossier du corpus (généré s\'il est absent ou vide)')
+    parser.add_argument('--count', type=int, default=20, help='Nombre de soumissions générées')
+    parser.add_argument('--size-kb', type=int, default=8, help='Taille approximative de chaque fichier (Ko)')
+    parser.add_argument('--defect-density', type=float, default=0.1, help='Proportion de blocs défectueux')
+    parser.add_argument('--seed', type=int, default=0, help='Graine du générateur')
+    parser.add_argument('--repeat', type=int, default=3, help='Passages par étape (meilleur temps retenu)')
+    parser.add_argument('--baseline', help='Référence JSON à laquelle comparer')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='Régression tolérée (0.2 = +20%%)')
+    parser.add_argument('--save-baseline', help='Enregistrer les résultats comme nouvelle référence')
+    parser.add_argument('--output', help='Écrire les résultats JSON dans ce fichier')
+    args = parser.parse_args(argv)
+
+    # La mesure porte sur l'analyse elle-même : cache des résultats désactivé
+    os.environ.pop('FEEDBACK_CACHE_DIR', None)
+
+    with tempfile.TemporaryDirectory(prefix='bench-corpus-') as tmp:
+        corpus_dir = args.corpus or tmp
+        existing = sorted(
+            os.path.join(corpus_dir, name) for name in os.listdir(corpus_dir)
+            if os.path.isdir(os.path.join(corpus_dir, name))
+        ) if os.path.isdir(corpus_dir) else []
+        if existing:
+            submissions = existing
+        else:
+            print(f"🧪 Génération de {args.count} soumission(s) synthétique(s) dans {corpus_dir}")
+            submissions = generate_corpus(corpus_dir, args.count, args.size_kb, args.defect_density, args.seed)
+
+        results = run_benchmark(submissions, args.repeat)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print_results(results, baseline)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+            print(f"📄 Résultats écrits dans {path}")
+
+    if baseline is None:
+        return 0
+
+    if baseline.get('corpus') != results['corpus']:
+        print("⚠️ Corpus différent de celui de la référence : comparaison indicative")
+    regressions = compare(results, baseline, args.threshold)
+    if not regressions:
+        print(f"✅ Aucune régression au-delà de {args.threshold:.0%}")
+        return 0
+    for regression in regressions:
+        print(f"❌ Régression {regression['stage']} ({regression['metric']}): "
+              f"{regression['baseline']} → {regression['current']} ({regression['change']:+.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Statistiques de promotion : niveaux, seuils et distribution des notes.
+
+Les scores de toute la promotion (export JSONL de batch_feedback.py ou
+historique SQLite) sont chargés en tableaux, un par critère, puis traités
+en une passe : niveaux par critère (mêmes seuils que FEEDBACK.md), bandes
+excellent / bon / à corriger selon EXCELLENT_THRESHOLD et GOOD_THRESHOLD,
+percentiles, histogrammes et simulation d'autres seuils pour réajuster le
+barème. NumPy est utilisé s'il est installé ; sinon le calcul se fait en
+Python sur les notes triées (recherche dichotomique), avec les mêmes
+résultats.
+
+Usage :
+    python3 .github/scripts/cohort_analytics.py promotion.jsonl [--what-if 75:60,90:70]
+    python3 .github/scripts/cohort_analytics.py --history historique.sqlite --promotion 2025
+"""
+
+import os
+import sys
+import json
+import time
+import bisect
+import argparse
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from findings import iter_jsonl
+from history_store import connect, get_latest_scores
+from report_renderer import (
+    CRITERION_LEVEL_SCORES, GLOBAL_STATUS, LEVELS, SCORE_EMOJI_THRESHOLDS, SCORE_EMOJIS,
+    VALIDATION_LEVEL_RATIOS, get_threshold_scores,
+)
+
+PERCENTILES = (10, 25, 50, 75, 90)
+DEFAULT_EXCELLENT_THRESHOLD = 83
+DEFAULT_GOOD_THRESHOLD = 67
+
+# Simulation par défaut : seuils actuels ± 10 points de pourcentage, par pas de 5
+WHAT_IF_OFFSETS = (-10, -5, 0, 5, 10)
+
+HISTOGRAM_WIDTH = 30
+
+
+def load_jsonl_scores(path):
+    """Dernière évaluation de chaque dépôt d'un export JSONL (batch_feedback.py --jsonl)"""
+    latest = {}
+    for index, data in enumerate(iter_jsonl(path)):
+        latest[data.get('repository') or f'#{index}'] = {
+            'repository': data.get('repository'),
+            'score': int(data.get('score') or 0),
+            'max_score': int(data.get('max_score') or 20),
+            'criteria': {name: (int(value.get('score') or 0), int(value.get('max_score') or 0))
+                         for name, value in (data.get('criteria') or {}).items()},
+        }
+    return list(latest.values())
+
+
+def build_arrays(rows):
+    """Tableaux de la promotion : notes, maximums et (scores, maximums) par critère"""
+    totals = [row['score'] for row in rows]
+    maxima = [row['max_score'] for row in rows]
+    criteria = {}
+    for name in sorted({name for row in rows for name in row['criteria']}):
+        pairs = [row['criteria'][name] for row in rows if name in row['criteria']]
+        criteria[name] = ([score for score, _ in pairs], [max_score for _, max_score in pairs])
+
+    if np is not None:
+        totals, maxima = np.asarray(totals, dtype=np.int64), np.asarray(maxima, dtype=np.int64)
+        criteria = {name: (np.asarray(scores, dtype=np.int64), np.asarray(max_scores, dtype=np.int64))
+                    for name, (scores, max_scores) in criteria.items()}
+    return totals, maxima, criteria
+
+
+def mean(values):
+    """Moyenne arrondie au centième (None pour un tableau vide)"""
+    if len(values) == 0:
+        return None
+    total = np.sum(values) if np is not None else sum(values)
+    return round(float(total) / len(values), 2)
+
+
+def is_uniform(values):
+    """Toutes les valeurs sont égales (même barème pour toute la promotion)"""
+    if len(values) == 0:
+        return False
+    if np is not None:
+        return bool((values == values[0]).all())
+    return all(value == values[0] for value in values)
+
+
+def percentiles(values, points=PERCENTILES):
+    """Percentiles par interpolation linéaire (méthode par défaut de numpy.percentile)"""
+    if len(values) == 0:
+        return {}
+    if np is not None:
+        return {point: float(value) for point, value in zip(points, np.percentile(values, points))}
+    ordered = sorted(values)
+    result = {}
+    for point in points:
+        position = (len(ordered) - 1) * point / 100
+        lower = int(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        result[point] = ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+    return result
+
+
+def histogram(scores, top):
+    """Effectif de chaque note entière de 0 à `top`"""
+    if np is not None:
+        return np.bincount(np.clip(scores, 0, top), minlength=top + 1).tolist()
+    counts = [0] * (top + 1)
+    for score in scores:
+        counts[min(max(score, 0), top)] += 1
+    return counts
+
+
+def count_levels(name, scores, max_scores):
+    """Effectif de chaque niveau (LEVELS) d'un critère, avec les seuils du rapport individuel"""
+    if np is not None:
+        if name == 'validation':
+            reached = sum((scores >= max_scores * ratio).astype(np.int64) for ratio in VALIDATION_LEVEL_RATIOS)
+        else:
+            reached = sum((scores >= threshold).astype(np.int64) for threshold in CRITERION_LEVEL_SCORES)
+        counts = np.bincount(np.asarray(reached, dtype=np.int64).ravel(), minlength=len(LEVELS)).tolist()
+    else:
+        counts = [0] * len(LEVELS)
+        for score, max_score in zip(scores, max_scores):
+            if name == 'validation':
+                counts[sum(1 for ratio in VALIDATION_LEVEL_RATIOS if score >= max_score * ratio)] += 1
+            else:
+                counts[sum(1 for threshold in CRITERION_LEVEL_SCORES if score >= threshold)] += 1
+    return dict(zip(LEVELS, counts))
+
+
+def count_emojis(totals, maxima):
+    """Répartition des emojis de note (évaluations notées sur 20 uniquement)"""
+    if np is not None:
+        on_twenty = totals[maxima == 20]
+        reached = sum((on_twenty >= threshold).astype(np.int64) for threshold in SCORE_EMOJI_THRESHOLDS)
+        counts = np.bincount(np.asarray(reached, dtype=np.int64).ravel(), minlength=len(SCORE_EMOJIS)).tolist()
+    else:
+        counts = [0] * len(SCORE_EMOJIS)
+        for total, max_score in zip(totals, maxima):
+            if max_score == 20:
+                counts[sum(1 for threshold in SCORE_EMOJI_THRESHOLDS if total >= threshold)] += 1
+    return dict(zip(SCORE_EMOJIS, counts))
+
+
+def simulate_thresholds(totals, maxima, pairs):
+    """Effectifs (excellent, bon, à corriger) pour chaque couple de seuils (en %) de `pairs`"""
+    if np is not None:
+        excellent = np.array([pair[0] for pair in pairs], dtype=np.int64)[:, None]
+        good = np.array([pair[1] for pair in pairs], dtype=np.int64)[:, None]
+        # Mêmes arrondis que le rapport individuel : (maximum × seuil) // 100 par étudiant
+        reaches_excellent = totals[None, :] >= (maxima[None, :] * excellent) // 100
+        reaches_good = totals[None, :] >= (maxima[None, :] * good) // 100
+        excellent_counts = reaches_excellent.sum(axis=1)
+        good_counts = (reaches_good & ~reaches_excellent).sum(axis=1)
+        results = zip(excellent_counts.tolist(), good_counts.tolist())
+    else:
+        # Notes triées par barème : chaque seuil se résout par recherche dichotomique
+        groups = {}
+        for total, max_score in zip(totals, maxima):
+            groups.setdefault(max_score, []).append(total)
+        for scores in groups.values():
+            scores.sort()
+        results = []
+        for excellent_threshold, good_threshold in pairs:
+            excellent_count = good_count = 0
+            for max_score, scores in groups.items():
+                excellent_score, good_score = get_threshold_scores(max_score, excellent_threshold, good_threshold)
+                at_least_excellent = len(scores) - bisect.bisect_left(scores, excellent_score)
+                at_least_good = len(scores) - bisect.bisect_left(scores, good_score)
+                excellent_count += at_least_excellent
+                good_count += max(0, at_least_good - at_least_excellent)
+            results.append((excellent_count, good_count))
+
+    simulations = []
+    for (excellent_threshold, good_threshold), (excellent_count, good_count) in zip(pairs, results):
+        simulations.append({
+            'excellent_threshold': excellent_threshold,
+            'good_threshold': good_threshold,
+            'bands': [excellent_count, good_count, len(totals) - excellent_count - good_count],
+        })
+    return simulations
+
+
+def get_what_if_pairs(excellent_threshold, good_threshold, requested=None):
+    """Couples de seuils simulés : demandés, sinon autour des seuils actuels"""
+    if requested:
+        pairs = requested
+    else:
+        pairs = [(excellent_threshold + excellent_offset, good_threshold + good_offset)
+                 for excellent_offset in WHAT_IF_OFFSETS for good_offset in WHAT_IF_OFFSETS]
+    valid = {(excellent, good) for excellent, good in pairs if 0 < good < excellent <= 100}
+    valid.add((excellent_threshold, good_threshold))
+    return sorted(valid, key=lambda pair: (-pair[0], -pair[1]))
+
+
+def analyze_cohort(rows, excellent_threshold=DEFAULT_EXCELLENT_THRESHOLD, good_threshold=DEFAULT_GOOD_THRESHOLD,
+                   what_if=None):
+    """Statistiques de la promotion en une passe sur les tableaux de scores"""
+    totals, maxima, criteria = build_arrays(rows)
+    count = len(rows)
+    uniform_max = int(maxima[0]) if is_uniform(maxima) else None
+
+    # Notes en points si toute la promotion a le même barème, sinon en pourcentage
+    if uniform_max is not None or count == 0:
+        scale_values = totals
+    elif np is not None:
+        scale_values = totals * 100 / np.maximum(maxima, 1)
+    else:
+        scale_values = [total * 100 / max(max_score, 1) for total, max_score in zip(totals, maxima)]
+
+    pairs = get_what_if_pairs(excellent_threshold, good_threshold, what_if)
+    simulations = simulate_thresholds(totals, maxima, pairs) if count else []
+    current = next((simulation['bands'] for simulation in simulations
+                    if (simulation['excellent_threshold'], simulation['good_threshold'])
+                    == (excellent_threshold, good_threshold)), [0, 0, 0])
+
+    criteria_stats = {}
+    for name, (scores, max_scores) in criteria.items():
+        top = int(max(max_scores)) if len(max_scores) else 0
+        criteria_stats[name] = {
+            'students': len(scores),
+            'max_score': top,
+            'mean': mean(scores),
+            'levels': count_levels(name, scores, max_scores),
+            'histogram': histogram(scores, top),
+        }
+
+    return {
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'students': count,
+        'backend': 'numpy' if np is not None else 'python',
+        'max_score': uniform_max,
+        'excellent_threshold': excellent_threshold,
+        'good_threshold': good_threshold,
+        'mean': mean(scale_values),
+        'percentiles': {str(point): round(value, 2) for point, value in percentiles(scale_values).items()},
+        'histogram': histogram(totals, uniform_max) if uniform_max is not None else None,
+        'bands': dict(zip((status[2] for status in GLOBAL_STATUS), current)),
+        'emojis': count_emojis(totals, maxima),
+        'criteria': criteria_stats,
+        'what_if': simulations,
+    }
+
+
+def _share(count, total):
+    return f'{count / total:.0%}' if total else '-'
+
+
+def _bar(count, largest):
+    return '█' * round(count * HISTOGRAM_WIDTH / largest) if largest else ''
+
+
+def render_class_report(stats, title='Promotion'):
+    """Rapport de promotion en Markdown pour l'équipe pédagogique"""
+    count = stats['students']
+    unit = f"/{stats['max_score']}" if stats['max_score'] is not None else ' %'
+    lines = [
+        f"# 📊 Rapport de Promotion — {title}",
+        "",
+        f"> **{count} étudiant(s)** · seuils actuels : excellent {stats['excellent_threshold']} %,"
+        f" bon {stats['good_threshold']} % · généré le {stats['generated_at']}",
+        "",
+        "## 🏆 Répartition Globale",
+        "",
+        "| Niveau | Étudiants | Part |",
+        "|---|---:|---:|",
+    ]
+    for (emoji, _, level), students in zip(GLOBAL_STATUS, stats['bands'].values()):
+        lines.append(f"| {emoji} {level} | {students} | {_share(students, count)} |")
+
+    lines += ["", "## 📈 Distribution des Notes", ""]
+    if stats['mean'] is not None:
+        lines.append(f"- **Moyenne :** {stats['mean']}{unit}")
+        lines.append("- **Percentiles :** " + ' · '.join(
+            f"P{point} {value:g}" for point, value in stats['percentiles'].items()))
+    if stats['histogram']:
+        largest = max(stats['histogram'])
+        lines += ["", "```"]
+        for score, students in enumerate(stats['histogram']):
+            lines.append(f"{score:>3}{unit} {_bar(students, largest)} {students}")
+        lines.append("```")
+    if any(stats['emojis'].values()):
+        lines.append("")
+        lines.append("- **Notes sur 20 :** " + ' · '.join(
+            f"{emoji} {students}" for emoji, students in stats['emojis'].items()))
+
+    if stats['criteria']:
+        lines += ["", "## 🧩 Critères du Barème", ""]
+        lines.append("| Critère | Moyenne | " + " | ".join(LEVELS) + " |")
+        lines.append("|---|---:|" + "---:|" * len(LEVELS))
+        for name, criterion in stats['criteria'].items():
+            lines.append(f"| {name} | {criterion['mean']}/{criterion['max_score']} | "
+                         + " | ".join(str(students) for students in criterion['levels'].values()) + " |")
+        for name, criterion in stats['criteria'].items():
+            largest = max(criterion['histogram']) if criterion['histogram'] else 0
+            lines += ["", f"**{name}**", "", "```"]
+            for score, students in enumerate(criterion['histogram']):
+                lines.append(f"{score:>3}/{criterion['max_score']} {_bar(students, largest)} {students}")
+            lines.append("```")
+
+    if stats['what_if']:
+        lines += [
+            "", "## 🔧 Simulation des Seuils", "",
+            "| Excellent | Bon | " + " | ".join(f"{emoji} {level}" for emoji, _, level in GLOBAL_STATUS) + " |",
+            "|---:|---:|---:|---:|---:|",
+        ]
+        for simulation in stats['what_if']:
+            current = (simulation['excellent_threshold'], simulation['good_threshold']) == (
+                stats['excellent_threshold'], stats['good_threshold'])
+            marker = ' ⬅️ actuel' if current else ''
+            lines.append(f"| {simulation['excellent_threshold']} % | {simulation['good_threshold']} %{marker} | "
+                         + " | ".join(f"{students} ({_share(students, count)})" for students in simulation['bands'])
+                         + " |")
+    return '\n'.join(lines) + '\n'
+
+
+def parse_what_if(value):
+    """Couples de seuils « excellent:bon » séparés par des virgules, ex. 80:60,90:70"""
+    pairs = []
+    for item in (value or '').split(','):
+        if not item.strip():
+            continue
+        excellent, _, good = item.partition(':')
+        pairs.append((int(excellent), int(good)))
+    return pairs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Statistiques et simulation des seuils pour une promotion')
+    parser.add_argument('jsonl', nargs='?', help='Export JSONL des évaluations (batch_feedback.py --jsonl)')
+    parser.add_argument('--history', help="Base SQLite d'historique (dernière évaluation de chaque dépôt)")
+    parser.add_argument('--promotion', help="Promotion à retenir dans l'historique")
+    parser.add_argument('--excellent', type=int, default=int(os.environ.get('EXCELLENT_THRESHOLD', DEFAULT_EXCELLENT_THRESHOLD)),
+                        help='Seuil « excellent » en %% (défaut: EXCELLENT_THRESHOLD ou %(default)s)')
+    parser.add_argument('--good', type=int, default=int(os.environ.get('GOOD_THRESHOLD', DEFAULT_GOOD_THRESHOLD)),
+                        help='Seuil « bon » en %% (défaut: GOOD_THRESHOLD ou %(default)s)')
+    parser.add_argument('--what-if', type=parse_what_if, default=None,
+                        help='Seuils à simuler, ex. 80:60,90:70 (défaut: seuils actuels ± 10)')
+    parser.add_argument('--output', default='class-report.md', help='Rapport Markdown (défaut: class-report.md)')
+    parser.add_argument('--json', help='Écrire aussi les statistiques en JSON')
+    args = parser.parse_args(argv)
+
+    if args.history:
+        conn = connect(args.history)
+        rows = get_latest_scores(conn, args.promotion)
+        conn.close()
+    elif args.jsonl:
+        rows = load_jsonl_scores(args.jsonl)
+    else:
+        parser.error('indiquez un export JSONL ou --history')
+
+    started = time.perf_counter()
+    stats = analyze_cohort(rows, args.excellent, args.good, args.what_if)
+    duration = time.perf_counter() - started
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write(render_class_report(stats, args.promotion or 'Promotion'))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, ensure_ascii=False, indent=2)
+
+    print(f"📊 {stats['students']} étudiant(s) analysé(s) en {duration * 1000:.1f} ms ({stats['backend']})")
+    for (emoji, _, level), students in zip(GLOBAL_STATUS, stats['bands'].values()):
+        print(f"  {emoji} {level}: {students}")
+    print(f"📄 Rapport écrit dans {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
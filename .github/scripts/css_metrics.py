@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Métriques CSS des critères du barème (Structure, Typographie, Pratiques).
+
+Remplace la série de `grep -c` / `grep -o | wc -l` du workflow : le fichier
+CSS est lu une seule fois, en flux, et chaque ligne passe par l'ensemble des
+compteurs. Les comptages reproduisent ceux de grep (lignes pour -c,
+occurrences pour -o). Une ligne géante (CSS minifié) est traitée segment par
+segment, coupée après un séparateur qu'aucun motif compté ne contient.
+
+Les scores sont ceux du workflow, y compris quand un compteur `grep -c` ne
+trouvait rien : `grep -c ... || echo "0"` valait alors "0\n0", le test
+suivant échouait et la pénalité n'était pas appliquée. CSS_STRICT_METRICS=true
+applique le barème à la lettre : pénalité aussi sans aucune correspondance,
+et une bibliothèque copiée (Bootstrap...) n'est pas comptée au bénéfice de
+l'étudiant mais signalée dans les erreurs.
+
+Usage :
+    python3 .github/scripts/css_metrics.py style.css [--html index.html]
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+
+from github_actions import write_github_output
+from streaming import OVERLAP, detect_vendored, iter_line_segments
+
+# Compteurs de lignes (équivalent `grep -c`)
+CSS_VARIABLE_RE = re.compile(r'^[ \t\n\r\f\v]*--[a-zA-Z]')
+CSS_COMMENT_RE = re.compile(r'/\*.*\*/')
+FONT_PROPERTY_RE = re.compile(r'font-|line-height|letter-spacing')
+PSEUDO_CLASS_RE = re.compile(r':hover|:focus|:active|:nth-child|:first-child|:last-child')
+
+# Compteurs d'occurrences (équivalent `grep -o | wc -l`)
+PX_UNIT_RE = re.compile(r'[0-9]+px')
+RELATIVE_UNIT_RE = re.compile(r'[0-9]*\.?[0-9]*(?:rem|em|%|vh|vw)')
+HEX_COLOR_RE = re.compile(r'#[0-9a-fA-F]{3,6}')
+CLASS_RE = re.compile(r'\.[a-zA-Z][a-zA-Z0-9_-]*')
+
+CRITERION_MAX_SCORE = 3
+
+
+def strict_metrics_enabled(env=None):
+    """Barème appliqué à la lettre (CSS_STRICT_METRICS=true) plutôt qu'à l'identique du workflow grep"""
+    env = os.environ if env is None else env
+    return env.get('CSS_STRICT_METRICS', 'false').lower() == 'true'
+
+
+def compute_css_metrics(css_path, html_path=None, strict=False):
+    """Calcule toutes les métriques CSS en une seule lecture du fichier"""
+    metrics = {
+        'css_variables': 0,
+        'css_comments': 0,
+        'complex_selectors': 0,
+        'px_units': 0,
+        'relative_units': 0,
+        'font_properties': 0,
+        'hex_colors': 0,
+        'classes': 0,
+        'pseudo_classes': 0,
+        'inline_styles': 0,
+    }
+    classes = set()
+
+    vendored = detect_vendored(css_path) if strict else None
+    if vendored:
+        metrics['vendored'] = vendored
+
+    line_flags = set()
+    first_segment = True
+    spaces_before = 0
+    comment_open = False
+    carry = ''
+    for _, segment, last in ([] if vendored else iter_line_segments(css_path, newline='')):
+        # Les compteurs de lignes cherchent aussi dans la fin du segment précédent
+        window = carry + segment
+        if first_segment and CSS_VARIABLE_RE.search(segment):
+            line_flags.add('css_variables')
+        if '*/' in segment and (comment_open or CSS_COMMENT_RE.search(segment)):
+            line_flags.add('css_comments')
+        # Équivalent de `grep -E '.* .* .* .*{'` : au moins 3 espaces avant une accolade
+        if '{' in segment and spaces_before + segment.count(' ', 0, segment.rfind('{')) >= 3:
+            line_flags.add('complex_selectors')
+        if FONT_PROPERTY_RE.search(window):
+            line_flags.add('font_properties')
+        if ':' in window and PSEUDO_CLASS_RE.search(window):
+            line_flags.add('pseudo_classes')
+
+        metrics['px_units'] += len(PX_UNIT_RE.findall(segment))
+        metrics['relative_units'] += len(RELATIVE_UNIT_RE.findall(segment))
+        if '#' in segment:
+            metrics['hex_colors'] += len(HEX_COLOR_RE.findall(segment))
+        if '.' in segment:
+            classes.update(CLASS_RE.findall(segment))
+
+        if last:
+            for name in line_flags:
+                metrics[name] += 1
+            line_flags.clear()
+            first_segment = True
+            spaces_before = 0
+            comment_open = False
+            carry = ''
+        else:
+            carry = window[-OVERLAP:]
+            first_segment = False
+            spaces_before += segment.count(' ')
+            comment_open = comment_open or '/*' in segment
+
+    metrics['classes'] = len(classes)
+
+    if html_path and os.path.exists(html_path):
+        metrics['inline_styles'] = sum(
+            1 for _, segment, _ in iter_line_segments(html_path, newline='') if 'style=' in segment
+        )
+
+    return metrics
+
+
+def score_css_metrics(metrics, strict=False):
+    """Applique le barème aux métriques : scores par critère et messages d'erreur"""
+    structure_score = CRITERION_MAX_SCORE
+    typography_score = CRITERION_MAX_SCORE
+    practices_score = CRITERION_MAX_SCORE
+    errors = []
+
+    def counted(name):
+        # Compteur `grep -c` sans correspondance : le workflow n'appliquait pas la pénalité
+        return strict or metrics[name] > 0
+
+    # CRITÈRE 1: Structure et Organisation du CSS
+    if metrics['css_variables'] == 0 and counted('css_variables'):
+        structure_score -= 1
+        errors.append("❌ **Structure**: Aucune variable CSS détectée (--custom-property)")
+    if metrics['css_comments'] < 3 and counted('css_comments'):
+        structure_score -= 1
+        errors.append("❌ **Structure**: Manque de commentaires organisationnels (moins de 3)")
+    if metrics['complex_selectors'] > 5:
+        structure_score -= 1
+        errors.append(f"⚠️ **Structure**: Sélecteurs trop complexes détectés ({metrics['complex_selectors']} occurrences)")
+
+    # CRITÈRE 2: Typographie et Couleurs
+    if metrics['px_units'] > metrics['relative_units']:
+        typography_score -= 1
+        errors.append(f"❌ **Typographie**: Utilisation excessive d'unités fixes ({metrics['px_units']} px vs {metrics['relative_units']} unités relatives)")
+    if metrics['font_properties'] < 3 and counted('font_properties'):
+        typography_score -= 1
+        errors.append(f"⚠️ **Typographie**: Propriétés typographiques insuffisantes ({metrics['font_properties']} détectées)")
+    if metrics['hex_colors'] < 2:
+        typography_score -= 1
+        errors.append(f"⚠️ **Couleurs**: Peu de couleurs hexadécimales utilisées ({metrics['hex_colors']})")
+
+    # CRITÈRE 3: Bonnes Pratiques CSS
+    if metrics['classes'] < 5:
+        practices_score -= 1
+        errors.append(f"⚠️ **Pratiques**: Peu de classes CSS définies ({metrics['classes']} classes)")
+    if metrics['pseudo_classes'] < 2 and counted('pseudo_classes'):
+        practices_score -= 1
+        errors.append(f"❌ **Pratiques**: Pseudo-classes insuffisantes ({metrics['pseudo_classes']} détectées)")
+    if metrics['inline_styles'] > 0:
+        practices_score -= 1
+        errors.append(f"❌ **Pratiques**: Styles inline détectés dans HTML ({metrics['inline_styles']} occurrences)")
+
+    if metrics.get('vendored'):
+        errors.append(f"⚠️ **Pratiques**: Fichier tiers détecté ({metrics['vendored']}), non pris en compte dans l'analyse")
+
+    return {
+        'structure_score': structure_score,
+        'typography_score': typography_score,
+        'practices_score': practices_score,
+        'css_score': structure_score + typography_score + practices_score,
+        'errors': errors,
+    }
+
+
+def evaluate_css(css_path, html_path=None, strict=None):
+    """Métriques et scores CSS d'une soumission"""
+    strict = strict_metrics_enabled() if strict is None else strict
+    metrics = compute_css_metrics(css_path, html_path, strict)
+    result = score_css_metrics(metrics, strict)
+    result['metrics'] = metrics
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Analyse CSS selon les critères du barème')
+    parser.add_argument('css_file', help='Fichier CSS à analyser')
+    parser.add_argument('--html', default='index.html', help='Fichier HTML pour la détection des styles inline')
+    parser.add_argument('--json', action='store_true', help='Afficher le détail des métriques en JSON')
+    args = parser.parse_args(argv)
+
+    result = evaluate_css(args.css_file, args.html)
+
+    outputs = {
+        'CSS_SCORE': result['css_score'],
+        'STRUCTURE_SCORE': result['structure_score'],
+        'TYPOGRAPHY_SCORE': result['typography_score'],
+        'PRACTICES_SCORE': result['practices_score'],
+        'CSS_ERRORS': '\n'.join(result['errors']) + '\n' if result['errors'] else '',
+    }
+    write_github_output(outputs)
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+
+    print("✅ Analyse CSS contextuelle terminée:")
+    print(f"   - Structure et Organisation: {result['structure_score']}/3")
+    print(f"   - Typographie et Couleurs: {result['typography_score']}/3")
+    print(f"   - Bonnes Pratiques: {result['practices_score']}/3")
+    print(f"   - Score CSS Total: {result['css_score']}/9")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
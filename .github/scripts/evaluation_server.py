@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Service d'évaluation auto-hébergeable, compatible avec l'endpoint /evaluate.
+
+Un serveur HTTP asyncio (bibliothèque standard uniquement) reçoit les mêmes
+requêtes JSON que l'API hébergée ({repositoryUrl, competence, bareme,
+filesToAnalyze, niveau}) et répond au même format ({success, data: {score,
+summary, analysis}}) : il suffit de pointer AI_EVALUATE_URL vers lui.
+
+- Le dépôt est cloné (git clone --depth 1) puis analysé localement dans un
+  pool de processus démarré et préchauffé au lancement ; chaque analyse
+  reste limitée par les budgets ANALYSIS_* (analysis_budget.py).
+- La file d'attente est bornée : au-delà de --workers + --queue-size
+  évaluations en cours, la requête reçoit 429 avec Retry-After, que
+  ai_client.py réessaie automatiquement.
+- Les requêtes identiques reçues pendant qu'une évaluation est en cours
+  (même dépôt, mêmes paramètres) partagent son résultat au lieu d'être
+  recalculées.
+
+Le corps peut aussi contenir les fichiers eux-mêmes ("files": {"index.html":
+"..."}), sans clonage. GET /health décrit l'état du service et de la file.
+
+Sécurité : le service écoute par défaut sur 127.0.0.1. Si EVALUATION_API_KEY
+est définie, POST /evaluate exige l'en-tête « Authorization: Bearer <clé> »
+(côté workflow : AI_API_KEY). Le jeton EVALUATION_GITHUB_TOKEN (ou
+GITHUB_TOKEN) n'est utilisé que pour cloner les dépôts des propriétaires
+listés par --token-owner : sans cette liste, seuls les dépôts publics sont
+évalués.
+
+Usage :
+    python3 .github/scripts/evaluation_server.py --port 3000 --workers 8 --queue-size 64
+    EVALUATION_API_KEY=... python3 .github/scripts/evaluation_server.py --host 0.0.0.0 --token-owner mon-ecole
+"""
+
+import os
+import sys
+import json
+import time
+import hmac
+import base64
+import signal
+import shutil
+import asyncio
+import hashlib
+import argparse
+import tempfile
+import subprocess
+from http import HTTPStatus
+from urllib.parse import urlsplit
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from analysis_budget import get_budget
+from exercise_profile import load_profile
+from generate_feedback import analyze_files_with_budget
+
+SERVICE_NAME = 'Service d\'évaluation locale'
+SERVICE_VERSION = '1.0.0'
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 3000
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_ALLOWED_HOSTS = ('github.com',)
+CLONE_TIMEOUT = 60
+KEEP_ALIVE_TIMEOUT = 30
+MAX_REQUEST_SIZE = 8 * 1024 * 1024
+MAX_HEADER_LINES = 100
+
+REQUIRED_FIELDS = ('repositoryUrl', 'competence', 'bareme', 'filesToAnalyze')
+
+
+class RequestError(ValueError):
+    """Requête invalide (réponse 4xx)"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class SubmissionError(ValueError):
+    """Soumission impossible à récupérer ou à analyser telle que demandée"""
+
+
+# ----------------------------------------------------------------------------
+# Évaluation (processus du pool)
+# ----------------------------------------------------------------------------
+
+def _warm_up(_):
+    # Force le démarrage du processus ; les modules d'analyse sont déjà importés
+    return os.getpid()
+
+
+def _git_env(token):
+    """Environnement de git clone : jamais d'invite, jeton transmis hors de la ligne de commande"""
+    env = dict(os.environ, GIT_TERMINAL_PROMPT='0')
+    if token:
+        credentials = base64.b64encode(f'x-access-token:{token}'.encode()).decode()
+        env.update({
+            'GIT_CONFIG_COUNT': '1',
+            'GIT_CONFIG_KEY_0': 'http.extraheader',
+            'GIT_CONFIG_VALUE_0': f'AUTHORIZATION: basic {credentials}',
+        })
+    return env
+
+
+def get_clone_token(repository_url, token_owners, env=None):
+    """Jeton de clonage, uniquement pour les dépôts des propriétaires autorisés (sinon None)"""
+    env = os.environ if env is None else env
+    owner = urlsplit(repository_url).path.strip('/').split('/')[0].lower()
+    if not owner or owner not in token_owners:
+        return None
+    return env.get('EVALUATION_GITHUB_TOKEN') or env.get('GITHUB_TOKEN') or None
+
+
+def clone_submission(repository_url, destination, allowed_hosts=DEFAULT_ALLOWED_HOSTS, timeout=CLONE_TIMEOUT,
+                     token_owners=()):
+    """Clone superficiel du dépôt (https uniquement, hôtes autorisés)"""
+    parts = urlsplit(repository_url)
+    if parts.scheme != 'https' or (parts.hostname or '').lower() not in allowed_hosts:
+        raise SubmissionError(f'Dépôt non autorisé : {repository_url} (hôtes acceptés : {", ".join(allowed_hosts)})')
+    token = get_clone_token(repository_url, token_owners)
+    try:
+        subprocess.run(['git', 'clone', '--depth', '1', '--quiet', '--', repository_url, destination],
+                       env=_git_env(token), capture_output=True, timeout=timeout, check=True)
+    except subprocess.TimeoutExpired:
+        raise SubmissionError(f'Clonage de {repository_url} trop long (> {timeout}s)') from None
+    except subprocess.CalledProcessError as e:
+        message = e.stderr.decode('utf-8', 'replace').strip().splitlines()
+        raise SubmissionError(f'Clonage de {repository_url} impossible : {message[-1] if message else e}') from None
+
+
+def write_inline_files(files, destination):
+    """Fichiers transmis dans la requête ({chemin relatif: contenu})"""
+    for name, content in files.items():
+        path = os.path.normpath(name)
+        if os.path.isabs(path) or path.startswith('..') or not isinstance(content, str):
+            raise SubmissionError(f'Fichier invalide : {name}')
+        target = os.path.join(destination, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+
+def evaluate_payload(payload, budget, allowed_hosts=DEFAULT_ALLOWED_HOSTS, clone_timeout=CLONE_TIMEOUT,
+                     token_owners=()):
+    """Récupère la soumission puis l'analyse (processus du pool) ; retourne le résultat au format plat"""
+    workdir = tempfile.mkdtemp(prefix='evaluation-')
+    try:
+        root = os.path.join(workdir, 'submission')
+        if payload.get('files'):
+            os.makedirs(root)
+            write_inline_files(payload['files'], root)
+        else:
+            clone_submission(payload['repositoryUrl'], root, allowed_hosts, clone_timeout, token_owners)
+        # Fichiers demandés par le client, puis .evaluation-config du dépôt (jamais l'environnement du service)
+        profile = load_profile(root, {'FILES_TO_ANALYZE': ','.join(payload['filesToAnalyze'])})
+        return analyze_files_with_budget(root, budget, workers=1, profile=profile)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# ----------------------------------------------------------------------------
+# Requêtes et réponses
+# ----------------------------------------------------------------------------
+
+def parse_payload(body):
+    """Corps JSON de POST /evaluate, validé comme par l'API hébergée"""
+    try:
+        payload = json.loads(body or b'null')
+    except ValueError as e:
+        raise RequestError(f'JSON invalide : {e}') from None
+    if not isinstance(payload, dict):
+        raise RequestError('Le corps de la requête doit être un objet JSON')
+    missing = [field for field in REQUIRED_FIELDS if not payload.get(field)]
+    if missing:
+        raise RequestError('Paramètres manquants')
+
+    files_to_analyze = payload['filesToAnalyze']
+    if isinstance(files_to_analyze, str):
+        files_to_analyze = files_to_analyze.split(',')
+    if not isinstance(files_to_analyze, list) or not all(isinstance(name, str) for name in files_to_analyze):
+        raise RequestError('filesToAnalyze doit être une liste de fichiers')
+    files = payload.get('files')
+    if files is not None and not isinstance(files, dict):
+        raise RequestError('files doit être un objet {chemin: contenu}')
+
+    return {
+        'repositoryUrl': str(payload['repositoryUrl']),
+        'competence': str(payload['competence']),
+        'bareme': str(payload['bareme']),
+        'filesToAnalyze': [name.strip() for name in files_to_analyze if name.strip()],
+        'niveau': str(payload.get('niveau') or 'debutant'),
+        'files': files,
+    }
+
+
+def get_request_key(payload):
+    """Empreinte d'une demande : deux requêtes de même empreinte partagent l'évaluation"""
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def build_response(payload, ai_data):
+    """Réponse au format de l'API hébergée ({success, data: {score, summary, analysis}})"""
+    return {
+        'success': True,
+        'message': 'Évaluation terminée avec succès',
+        'data': {
+            'repositoryUrl': payload['repositoryUrl'],
+            'competence': payload['competence'],
+            'niveau': payload['niveau'],
+            'score': ai_data['score'],
+            'summary': ai_data['summary'],
+            'analysis': ai_data,
+            'feedbackCreated': False,
+        },
+    }
+
+
+async def read_request(reader):
+    """(méthode, chemin, en-têtes, corps) d'une requête HTTP/1.1, ou None si la connexion est fermée"""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    parts = request_line.decode('latin-1').split()
+    if len(parts) != 3 or not parts[2].startswith('HTTP/'):
+        raise RequestError('Requête HTTP invalide')
+    method, target, version = parts
+
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise RequestError('En-têtes trop nombreux', 431)
+    headers[':version'] = version
+
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        raise RequestError('Content-Length requis', 411)
+    try:
+        length = int(headers.get('content-length') or 0)
+    except ValueError:
+        raise RequestError('Content-Length invalide') from None
+    if length > MAX_REQUEST_SIZE:
+        raise RequestError('Requête trop volumineuse', 413)
+    body = await reader.readexactly(length) if length else b''
+    return method.upper(), urlsplit(target).path, headers, body
+
+
+def encode_response(status, payload, keep_alive=True, headers=None):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    head = [
+        f'HTTP/1.1 {status} {HTTPStatus(status).phrase}',
+        'Content-Type: application/json; charset=utf-8',
+        f'Content-Length: {len(body)}',
+        f'Connection: {"keep-alive" if keep_alive else "close"}',
+    ]
+    head.extend(f'{name}: {value}' for name, value in (headers or {}).items())
+    return ('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body
+
+
+def is_authorized(headers, api_key):
+    """Vrai si aucune clé n'est configurée ou si la requête présente la bonne clé (Bearer)"""
+    if not api_key:
+        return True
+    scheme, _, credentials = headers.get('authorization', '').partition(' ')
+    return scheme.lower() == 'bearer' and hmac.compare_digest(credentials.strip().encode(), api_key.encode())
+
+
+def wants_keep_alive(headers):
+    connection = headers.get('connection', '').lower()
+    if headers.get(':version') == 'HTTP/1.0':
+        return connection == 'keep-alive'
+    return connection != 'close'
+
+
+# ----------------------------------------------------------------------------
+# Service
+# ----------------------------------------------------------------------------
+
+class EvaluationService:
+    """Pool de processus préchauffé, file bornée et regroupement des requêtes identiques"""
+
+    def __init__(self, workers=None, queue_size=DEFAULT_QUEUE_SIZE, budget=None,
+                 allowed_hosts=DEFAULT_ALLOWED_HOSTS, clone_timeout=CLONE_TIMEOUT, api_key=None, token_owners=()):
+        self.workers = workers or os.cpu_count() or 1
+        self.capacity = self.workers + queue_size
+        self.budget = get_budget() if budget is None else budget
+        self.allowed_hosts = tuple(host.lower() for host in allowed_hosts)
+        self.clone_timeout = clone_timeout
+        self.api_key = api_key
+        self.token_owners = tuple(owner.lower() for owner in token_owners)
+        self.executor = None
+        # Numéro du pool courant : un pool cassé n'est reconstruit qu'une fois
+        self.generation = 0
+        self.restart_lock = asyncio.Lock()
+        # Évaluations en cours, par empreinte de requête
+        self.inflight = {}
+        self.started_at = time.time()
+        self.stats = {'evaluated': 0, 'failed': 0, 'coalesced': 0, 'rejected': 0}
+
+    def _create_executor(self):
+        executor = ProcessPoolExecutor(max_workers=self.workers)
+        list(executor.map(_warm_up, range(self.workers)))
+        return executor
+
+    def start(self):
+        """Démarre et préchauffe les processus du pool (avant la boucle asyncio)"""
+        self.executor = self._create_executor()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+    def retry_after(self):
+        """Délai conseillé aux clients refusés : le temps de vider la file, au moins 1 s"""
+        return max(1, len(self.inflight) // self.workers)
+
+    async def _restart(self, generation):
+        """Remplace le pool cassé, une seule fois pour toutes les évaluations touchées, hors de la boucle"""
+        async with self.restart_lock:
+            if self.generation != generation:
+                # Déjà reconstruit par une évaluation concurrente
+                return
+            print("⚠️ Processus d'évaluation perdu, reconstruction du pool")
+            broken = self.executor
+            self.executor = await asyncio.to_thread(self._create_executor)
+            self.generation += 1
+            await asyncio.to_thread(broken.shutdown)
+
+    async def _submit(self, payload):
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            executor, generation = self.executor, self.generation
+            try:
+                return await loop.run_in_executor(executor, evaluate_payload, payload, self.budget,
+                                                  self.allowed_hosts, self.clone_timeout, self.token_owners)
+            except BrokenProcessPool:
+                # Processus du pool perdu : pool reconstruit, évaluation relancée une fois
+                if attempt:
+                    raise
+                await self._restart(generation)
+
+    async def _run(self, key, payload):
+        started = time.perf_counter()
+        try:
+            ai_data = await self._submit(payload)
+            self.stats['evaluated'] += 1
+            print(f"✅ {payload['repositoryUrl']} : {ai_data['score']}/20 "
+                  f"en {(time.perf_counter() - started) * 1000:.0f} ms")
+            return ai_data
+        except Exception as e:
+            self.stats['failed'] += 1
+            print(f"❌ {payload['repositoryUrl']} : {e}")
+            raise
+        finally:
+            del self.inflight[key]
+
+    async def evaluate(self, payload):
+        """Réponse (statut, corps, en-têtes) d'une demande d'évaluation"""
+        key = get_request_key(payload)
+        task = self.inflight.get(key)
+        if task is not None:
+            self.stats['coalesced'] += 1
+        elif len(self.inflight) >= self.capacity:
+            self.stats['rejected'] += 1
+            return 429, {'success': False, 'error': 'Service saturé, réessayez plus tard'}, \
+                {'Retry-After': str(self.retry_after())}
+        else:
+            task = asyncio.ensure_future(self._run(key, payload))
+            self.inflight[key] = task
+
+        try:
+            # shield : un client qui se déconnecte n'annule pas l'évaluation partagée
+            ai_data = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                # Requête elle-même annulée (arrêt du service)
+                raise
+            return 503, {'success': False, 'error': 'Évaluation annulée, réessayez plus tard'}, {'Retry-After': '1'}
+        except SubmissionError as e:
+            return 400, {'success': False, 'error': str(e)}, None
+        except Exception as e:
+            return 500, {'success': False, 'error': str(e) or type(e).__name__}, None
+        return 200, build_response(payload, ai_data), None
+
+    def health(self):
+        return {
+            'status': 'OK',
+            'service': SERVICE_NAME,
+            'version': SERVICE_VERSION,
+            'workers': self.workers,
+            'inFlight': len(self.inflight),
+            'capacity': self.capacity,
+            'uptime': round(time.time() - self.started_at, 1),
+            **self.stats,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        }
+
+    async def dispatch(self, method, path, headers, body):
+        if path == '/health':
+            if method != 'GET':
+                return 405, {'error': 'Méthode non autorisée'}, {'Allow': 'GET'}
+            return 200, self.health(), None
+        if path == '/evaluate':
+            if method != 'POST':
+                return 405, {'error': 'Méthode non autorisée'}, {'Allow': 'POST'}
+            if not is_authorized(headers, self.api_key):
+                return 401, {'success': False, 'error': 'Clé d\'API manquante ou invalide'}, \
+                    {'WWW-Authenticate': 'Bearer'}
+            try:
+                payload = parse_payload(body)
+            except RequestError as e:
+                return e.status, {'error': str(e), 'required': list(REQUIRED_FIELDS)}, None
+            return await self.evaluate(payload)
+        return 404, {'error': f'Route introuvable : {path}'}, None
+
+    async def handle_connection(self, reader, writer):
+        """Connexion HTTP/1.1 persistante : requêtes traitées l'une après l'autre"""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(read_request(reader), KEEP_ALIVE_TIMEOUT)
+                except RequestError as e:
+                    writer.write(encode_response(e.status, {'error': str(e)}, keep_alive=False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = wants_keep_alive(headers)
+                status, payload, extra_headers = await self.dispatch(method, path, headers, body)
+                writer.write(encode_response(status, payload, keep_alive, extra_headers))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(service, host, port):
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    loop = asyncio.get_running_loop()
+    stop = loop.create_future()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, lambda: stop.done() or stop.set_result(None))
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    address = server.sockets[0].getsockname()
+    print(f"🚀 Service d'évaluation démarré sur http://{address[0]}:{address[1]} "
+          f"({service.workers} processus, file de {service.capacity - service.workers})")
+    print('📊 Endpoints disponibles:')
+    print('  GET  /health - État du service')
+    print('  POST /evaluate - Évaluer un repository')
+    async with server:
+        await stop
+    print("👋 Service arrêté")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Service d'évaluation local compatible avec /evaluate")
+    parser.add_argument('--host', default=DEFAULT_HOST,
+                        help=f'Adresse d\'écoute (défaut: {DEFAULT_HOST} ; 0.0.0.0 pour tout le réseau)')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT') or DEFAULT_PORT),
+                        help=f'Port d\'écoute (défaut: PORT ou {DEFAULT_PORT})')
+    parser.add_argument('--workers', type=int, default=None, help='Processus d\'évaluation (défaut: nombre de CPU)')
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE,
+                        help=f'Évaluations en attente au-delà des processus avant de répondre 429 (défaut: {DEFAULT_QUEUE_SIZE})')
+    parser.add_argument('--allowed-host', action='append', dest='allowed_hosts',
+                        help='Hôte git autorisé pour le clonage (répétable, défaut: github.com)')
+    parser.add_argument('--token-owner', action='append', dest='token_owners', default=[],
+                        help='Propriétaire (organisation ou compte) dont les dépôts privés sont clonés '
+                             'avec EVALUATION_GITHUB_TOKEN / GITHUB_TOKEN (répétable)')
+    parser.add_argument('--clone-timeout', type=float, default=CLONE_TIMEOUT,
+                        help=f'Durée maximum d\'un clonage en secondes (défaut: {CLONE_TIMEOUT})')
+    args = parser.parse_args(argv)
+
+    api_key = os.environ.get('EVALUATION_API_KEY') or None
+    if not api_key and args.host not in ('127.0.0.1', 'localhost', '::1'):
+        print(f"⚠️ Écoute sur {args.host} sans EVALUATION_API_KEY : toute machine du réseau peut lancer des évaluations")
+    service = EvaluationService(args.workers, args.queue_size,
+                                allowed_hosts=args.allowed_hosts or DEFAULT_ALLOWED_HOSTS,
+                                clone_timeout=args.clone_timeout, api_key=api_key,
+                                token_owners=args.token_owners)
+    service.start()
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
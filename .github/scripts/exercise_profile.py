@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Profils d'exercice compilés une fois et mis en cache.
+
+Un profil réunit les réglages d'un exercice : fichiers, barème, niveau,
+scores maximum, seuils, critères HTML / CSS et pondération des règles.
+Les valeurs viennent, par ordre de priorité, des variables d'environnement
+(variables GitHub), de .evaluation-config, du fichier de profil désigné
+par EXERCISE_PROFILE (ex. templates/exercice-html-css-basic.config), puis
+des valeurs par défaut.
+
+Le profil est compilé en un artefact JSON (réglages typés, règles actives,
+pondérations, seuils en points, gabarit du rapport spécialisé pour le
+niveau) écrit à côté de .evaluation-config sous le nom
+.evaluation-profile.json. Il est invalidé par empreinte : contenu des
+fichiers de configuration, variables d'environnement concernées et sources
+des règles et gabarits. Le workflow, les processus du mode batch et la
+session watch repartent ainsi de l'artefact au lieu de relire et
+reconvertir la configuration.
+
+Usage (workflow) :
+    python3 .github/scripts/exercise_profile.py --github-output
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+
+from github_actions import write_github_output
+from html_analyzer import DOCUMENT_CHECKS, HTML_RULES
+from report_renderer import get_criteria_template, get_threshold_scores, set_criteria_template
+from rules import RULES
+from selector_index import INDEX_RULES
+
+PROFILE_FORMAT_VERSION = 1
+CONFIG_FILE = '.evaluation-config'
+PROFILE_FILE = '.evaluation-profile.json'
+DEFAULT_FILES = 'index.html,style.css'
+
+# Réglages du profil : (clé, type, valeur par défaut)
+SETTINGS = (
+    ('COMPETENCE', 'str', 'Développement Web HTML/CSS'),
+    ('BAREME', 'str', 'Structure HTML (10pts), Style CSS (10pts)'),
+    ('FILES_TO_ANALYZE', 'list', DEFAULT_FILES),
+    ('NIVEAU', 'str', 'Débutant'),
+    ('EXERCISE_TYPE', 'str', ''),
+    ('HTML_MAX_SCORE', 'int', 3),
+    ('CSS_MAX_SCORE', 'int', 9),
+    ('JS_MAX_SCORE', 'int', 0),
+    ('ACCESSIBILITY_MAX_SCORE', 'int', 0),
+    ('TOTAL_MAX_SCORE', 'int', 12),
+    ('EXCELLENT_THRESHOLD', 'int', 83),
+    ('GOOD_THRESHOLD', 'int', 67),
+    ('PASSING_THRESHOLD', 'int', 50),
+    ('HTML_CRITERIA', 'list', ''),
+    ('CSS_CRITERIA', 'list', ''),
+    ('RULE_WEIGHTS', 'weights', ''),
+)
+
+# Variables d'environnement acceptées en plus du nom du réglage (prioritaires)
+ENV_ALIASES = {
+    'FILES_TO_ANALYZE': ('FILES',),
+}
+
+# Critères HTML / CSS connus ; les critères CSS sont notés par css_metrics.py et l'index de sélecteurs
+HTML_CRITERIA = frozenset(DOCUMENT_CHECKS) | {'validation'}
+CSS_CRITERIA = frozenset(('syntax', 'selectors', 'properties', 'colors', 'responsive', 'organization'))
+
+KNOWN_RULES = frozenset(rule['id'] for rule in RULES) | HTML_RULES | INDEX_RULES | {'vendored-file'}
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+# Sources dont dépend l'artefact compilé (règles, vérifications, gabarits)
+SOURCE_FILES = ('exercise_profile.py', 'rules.py', 'html_analyzer.py', 'report_renderer.py')
+
+# Affectation KEY=valeur d'un fichier de configuration au format shell ;
+# une valeur entre guillemets peut s'étendre sur plusieurs lignes
+ASSIGNMENT_RE = re.compile(
+    r'^[ \t]*(?:export[ \t]+)?([A-Za-z_][A-Za-z0-9_]*)='
+    r'(?:"((?:[^"\\]|\\.)*)"|\'([^\']*)\'|([^\s#]*))',
+    re.M | re.S,
+)
+COMMENT_LINE_RE = re.compile(r'^[ \t]*#[^\n]*', re.M)
+ESCAPE_RE = re.compile(r'\\([\\"$`])')
+
+# Profils déjà chargés dans ce processus, par empreinte
+_profiles = {}
+
+
+def parse_config(text):
+    """Affectations d'un fichier .evaluation-config : {clé: valeur brute}"""
+    values = {}
+    # Les lignes de commentaire sont blanchies (longueur conservée) pour ne pas en lire les exemples
+    text = COMMENT_LINE_RE.sub(lambda match: ' ' * len(match.group(0)), text)
+    for match in ASSIGNMENT_RE.finditer(text):
+        key, double_quoted, single_quoted, bare = match.groups()
+        if double_quoted is not None:
+            values[key] = ESCAPE_RE.sub(r'\1', double_quoted)
+        elif single_quoted is not None:
+            values[key] = single_quoted
+        else:
+            values[key] = bare
+    return values
+
+
+def get_config_paths(root='.', env=None):
+    """Fichiers de configuration du profil, du moins au plus prioritaire"""
+    env = os.environ if env is None else env
+    paths = []
+    profile_path = env.get('EXERCISE_PROFILE')
+    if profile_path:
+        paths.append(profile_path if os.path.isabs(profile_path) else os.path.join(root, profile_path))
+    paths.append(os.path.join(root, CONFIG_FILE))
+    return paths
+
+
+def _read_bytes(path):
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _env_value(env, key):
+    for name in ENV_ALIASES.get(key, ()) + (key,):
+        if env.get(name):
+            return env[name]
+    return None
+
+
+def compute_profile_hash(root='.', env=None, contents=None):
+    """Empreinte SHA-256 des entrées du profil (fichiers, variables, sources)"""
+    env = os.environ if env is None else env
+    if contents is None:
+        contents = [(path, _read_bytes(path)) for path in get_config_paths(root, env)]
+    digest = hashlib.sha256()
+    digest.update(f'format:{PROFILE_FORMAT_VERSION}\0'.encode())
+    for path, content in contents:
+        digest.update(f'config:{os.path.basename(path)}\0'.encode())
+        digest.update(b'<absent>' if content is None else content)
+    for key, _, _ in SETTINGS:
+        digest.update(f'env:{key}={_env_value(env, key) or ""}\0'.encode())
+    for name in SOURCE_FILES:
+        digest.update(f'script:{name}\0'.encode())
+        digest.update(_read_bytes(os.path.join(SCRIPTS_DIR, name)) or b'')
+    return digest.hexdigest()
+
+
+def _split_list(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def _convert(key, kind, value, default, warnings):
+    if kind == 'int':
+        try:
+            return int(str(value).strip())
+        except ValueError:
+            warnings.append(f'{key} doit être un entier (valeur ignorée : {value!r})')
+            return default
+    if kind == 'list':
+        return _split_list(value)
+    if kind == 'weights':
+        weights = {}
+        for item in _split_list(value):
+            rule_id, _, weight = item.partition('=')
+            rule_id = rule_id.strip()
+            try:
+                weights[rule_id] = int(weight)
+            except ValueError:
+                warnings.append(f'Pondération invalide dans RULE_WEIGHTS : {item!r}')
+                continue
+            if rule_id not in KNOWN_RULES:
+                warnings.append(f'Règle inconnue dans RULE_WEIGHTS : {rule_id}')
+        return weights
+    return value
+
+
+def _active_criteria(names, known, label, warnings):
+    criteria = []
+    for name in names:
+        criterion = name.lower()
+        if criterion not in known:
+            warnings.append(f'Critère {label} inconnu : {name}')
+        elif criterion not in criteria:
+            criteria.append(criterion)
+    return criteria
+
+
+def compile_profile(values, profile_hash=None, sources=()):
+    """Compile les valeurs brutes (config + environnement) en artefact sérialisable"""
+    warnings = []
+    settings = {}
+    for key, kind, default in SETTINGS:
+        raw = values.get(key)
+        if raw is None or raw == '':
+            raw = default
+        settings[key.lower()] = _convert(key, kind, raw, default, warnings)
+
+    html_criteria = _active_criteria(settings['html_criteria'], HTML_CRITERIA, 'HTML', warnings)
+    css_criteria = _active_criteria(settings['css_criteria'], CSS_CRITERIA, 'CSS', warnings)
+    checks = [criterion for criterion in html_criteria if criterion in DOCUMENT_CHECKS]
+
+    rules = sorted((KNOWN_RULES - set(DOCUMENT_CHECKS.values())) | {DOCUMENT_CHECKS[check] for check in checks})
+    weights = {rule_id: weight for rule_id, weight in settings.pop('rule_weights').items() if rule_id in KNOWN_RULES}
+
+    total_max_score = settings['total_max_score']
+    excellent_score, good_score = get_threshold_scores(total_max_score, settings['excellent_threshold'],
+                                                       settings['good_threshold'])
+    niveau = settings['niveau']
+    return {
+        'format': PROFILE_FORMAT_VERSION,
+        'hash': profile_hash,
+        'sources': [os.path.basename(path) for path in sources],
+        'settings': settings,
+        'criteria': {'html': html_criteria, 'css': css_criteria},
+        'checks': checks,
+        'rules': rules,
+        'weights': weights,
+        'thresholds': {
+            'excellent_score': excellent_score,
+            'good_score': good_score,
+            'passing_score': (total_max_score * settings['passing_threshold']) // 100,
+        },
+        'template': {'niveau': niveau, 'segments': get_criteria_template(niveau)},
+        'warnings': warnings,
+    }
+
+
+def _read_artifact(path, profile_hash):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            profile = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(profile, dict) or profile.get('hash') != profile_hash:
+        return None
+    return profile
+
+
+def _write_artifact(path, profile):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(profile, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Dossier en lecture seule : le profil reste compilé pour ce processus
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _activate(profile):
+    """Gabarit du rapport par critères repris de l'artefact (pas de recompilation)"""
+    template = profile['template']
+    set_criteria_template(template['niveau'], tuple(tuple(segment) for segment in template['segments']))
+    return profile
+
+
+def load_profile(root='.', env=None):
+    """Profil compilé de la soumission : mémoire, artefact en cache, sinon compilation"""
+    env = os.environ if env is None else env
+    paths = get_config_paths(root, env)
+    contents = [(path, _read_bytes(path)) for path in paths]
+    profile_hash = compute_profile_hash(root, env, contents)
+
+    profile = _profiles.get(profile_hash)
+    if profile is not None:
+        return profile
+
+    # Artefact écrit à côté de .evaluation-config (aucun fichier créé sans configuration)
+    config_path, config_content = contents[-1]
+    artifact_path = os.path.join(os.path.dirname(config_path), PROFILE_FILE) if config_content is not None else None
+    profile = _read_artifact(artifact_path, profile_hash) if artifact_path else None
+
+    if profile is None:
+        values = {}
+        sources = []
+        for path, content in contents:
+            if content is not None:
+                values.update(parse_config(content.decode('utf-8', errors='replace')))
+                sources.append(path)
+        for key, _, _ in SETTINGS:
+            value = _env_value(env, key)
+            if value is not None:
+                values[key] = value
+        profile = compile_profile(values, profile_hash, sources)
+        for warning in profile['warnings']:
+            print(f"⚠️ Profil d'exercice : {warning}")
+        if artifact_path:
+            _write_artifact(artifact_path, profile)
+
+    _profiles[profile_hash] = _activate(profile)
+    return profile
+
+
+def apply_weights(technical_details, weights):
+    """Pénalités des findings remplacées par les pondérations du profil"""
+    if weights:
+        for detail in technical_details:
+            weight = weights.get(detail.get('rule'))
+            if weight is not None:
+                detail['penalty'] = weight
+    return technical_details
+
+
+def get_outputs(profile):
+    """Sorties de l'étape de configuration du workflow"""
+    settings = profile['settings']
+    return {
+        'competence': settings['competence'],
+        'bareme': settings['bareme'],
+        'files_to_analyze': ','.join(settings['files_to_analyze']),
+        'niveau': settings['niveau'],
+        'html_max_score': settings['html_max_score'],
+        'css_max_score': settings['css_max_score'],
+        'js_max_score': settings['js_max_score'],
+        'total_max_score': settings['total_max_score'],
+        'excellent_threshold': settings['excellent_threshold'],
+        'good_threshold': settings['good_threshold'],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compilation du profil d\'exercice (.evaluation-config)')
+    parser.add_argument('--root', default='.', help='Dossier de la soumission')
+    parser.add_argument('--github-output', action='store_true', help='Écrire les réglages dans $GITHUB_OUTPUT')
+    parser.add_argument('--json', action='store_true', help='Afficher le profil compilé en JSON')
+    args = parser.parse_args(argv)
+
+    profile = load_profile(args.root)
+    if args.json:
+        print(json.dumps({key: value for key, value in profile.items() if key != 'template'},
+                         ensure_ascii=False, indent=2))
+        return 0
+
+    settings = profile['settings']
+    thresholds = profile['thresholds']
+    print("✅ Configuration chargée:")
+    print(f"- Compétence: {(settings['competence'].strip().splitlines() or [''])[0]}")
+    print(f"- Fichiers: {', '.join(settings['files_to_analyze'])}")
+    print(f"- Niveau: {settings['niveau']}")
+    print(f"- Barème: /{settings['total_max_score']} (HTML {settings['html_max_score']}, CSS {settings['css_max_score']})"
+          f" · excellent ≥ {thresholds['excellent_score']}, bien ≥ {thresholds['good_score']}")
+    if profile['checks']:
+        print(f"- Vérifications HTML: {', '.join(profile['checks'])}")
+    if profile['weights']:
+        print(f"- Pondérations: {', '.join(f'{rule}={weight}' for rule, weight in sorted(profile['weights'].items()))}")
+    if args.github_output:
+        write_github_output(get_outputs(profile))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Modèle compact des résultats d'évaluation (findings et scores).
+
+Les trois parcours (analyse locale, réponse IA, critères du barème)
+produisent une `Evaluation` : score entier, scores par critère et liste de
+`Finding` à attributs fixes (__slots__, chaînes répétitives internées), ce
+qui garde une empreinte mémoire stable quand toute une promotion est
+conservée. Une évaluation s'exporte en JSON, en JSONL (ajout en fin de
+fichier, une ligne par soumission) et en SARIF 2.1.0 pour le code scanning
+GitHub, en plus du FEEDBACK.md.
+"""
+
+import os
+import re
+import sys
+import json
+
+SEVERITIES = ('error', 'warning', 'info')
+
+SARIF_LEVELS = {'error': 'error', 'warning': 'warning', 'info': 'note'}
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+TOOL_NAME = 'auto-evaluation'
+
+# Règle attribuée aux findings qui n'en précisent pas (réponse IA)
+DEFAULT_RULES = {
+    'local': 'local-analysis',
+    'ai': 'ai-review',
+    'criteria': 'criteria',
+}
+
+HTML_ERROR_LINE_RE = re.compile(r'^❌ Ligne (\d+): (.*)$')
+CSS_ERROR_LINE_RE = re.compile(r'^(❌|⚠️) \*\*([^*]+)\*\*: (.*)$')
+
+
+def _as_int(value, default=0):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class Finding:
+    """Problème détecté dans un fichier"""
+
+    __slots__ = ('file', 'line', 'column', 'severity', 'issue', 'suggestion', 'rule', 'penalty')
+
+    def __init__(self, file, line=0, column=None, severity='info', issue='', suggestion='', rule=None, penalty=0):
+        self.file = sys.intern(file)
+        self.line = line
+        self.column = column
+        self.severity = sys.intern(severity if severity in SEVERITIES else 'info')
+        self.issue = issue
+        self.suggestion = suggestion
+        self.rule = sys.intern(rule) if rule else None
+        self.penalty = penalty
+
+    @classmethod
+    def from_dict(cls, data, default_rule=None):
+        """Construit un finding depuis un dict (analyse locale ou réponse IA)"""
+        column = data.get('column')
+        return cls(
+            str(data.get('file', 'Fichier inconnu')),
+            _as_int(data.get('line')),
+            _as_int(column) if column is not None else None,
+            data.get('severity', 'info'),
+            str(data.get('issue', '')),
+            str(data.get('suggestion', '')),
+            data.get('rule') or default_rule,
+            _as_int(data.get('penalty')),
+        )
+
+    def to_dict(self):
+        """Forme dict (mêmes clés que les findings de l'analyse locale)"""
+        data = {'file': self.file, 'line': self.line}
+        if self.column is not None:
+            data['column'] = self.column
+        data.update({
+            'severity': self.severity,
+            'issue': self.issue,
+            'suggestion': self.suggestion,
+            'rule': self.rule,
+            'penalty': self.penalty,
+        })
+        return data
+
+    def __eq__(self, other):
+        if not isinstance(other, Finding):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f'Finding({self.file}:{self.line} {self.severity} {self.rule})'
+
+
+class Evaluation:
+    """Résultat complet d'une évaluation : score, scores par critère et findings"""
+
+    __slots__ = ('source', 'score', 'max_score', 'summary', 'criteria', 'findings',
+                 'strengths', 'improvements', 'recommendations')
+
+    def __init__(self, source, score, max_score, summary='', criteria=None, findings=None,
+                 strengths=None, improvements=None, recommendations=None):
+        self.source = source
+        self.score = score
+        self.max_score = max_score
+        self.summary = summary
+        self.criteria = criteria or {}
+        self.findings = findings or []
+        self.strengths = strengths or []
+        self.improvements = improvements or []
+        self.recommendations = recommendations or []
+
+    @classmethod
+    def from_ai_data(cls, ai_data, source='ai', max_score=20):
+        """Évaluation depuis les données au format de l'API IA (IA ou analyse locale)"""
+        default_rule = DEFAULT_RULES.get(source)
+        return cls(
+            source,
+            _as_int(ai_data.get('score')),
+            max_score,
+            ai_data.get('summary', ''),
+            findings=[Finding.from_dict(detail, default_rule) for detail in ai_data.get('technicalDetails', [])],
+            strengths=list(ai_data.get('strengths', [])),
+            improvements=list(ai_data.get('improvements', [])),
+            recommendations=list(ai_data.get('recommendations', [])),
+        )
+
+    @classmethod
+    def from_criteria(cls, scores, html_errors='', css_errors='', html_file='index.html', css_file='style.css'):
+        """Évaluation du parcours par critères (scores entiers et messages du workflow)"""
+        criteria = {
+            'structure': (scores['structure_score'], 3),
+            'typography': (scores['typography_score'], 3),
+            'practices': (scores['practices_score'], 3),
+            'validation': (scores['html_score'], scores['html_max_score']),
+        }
+        return cls(
+            'criteria',
+            scores['total_score'],
+            scores['total_max_score'],
+            criteria=criteria,
+            findings=parse_criteria_errors(html_errors, css_errors, html_file, css_file),
+        )
+
+    @property
+    def error_count(self):
+        return sum(1 for finding in self.findings if finding.severity == 'error')
+
+    def to_dict(self):
+        return {
+            'source': self.source,
+            'score': self.score,
+            'max_score': self.max_score,
+            'summary': self.summary,
+            'criteria': {name: {'score': score, 'max_score': max_score}
+                         for name, (score, max_score) in self.criteria.items()},
+            'findings': [finding.to_dict() for finding in self.findings],
+            'strengths': self.strengths,
+            'improvements': self.improvements,
+            'recommendations': self.recommendations,
+        }
+
+    def to_ai_data(self):
+        """Forme dict au format de l'API IA (entrée du rendu de FEEDBACK.md)"""
+        return {
+            'score': self.score,
+            'summary': self.summary,
+            'strengths': self.strengths,
+            'improvements': self.improvements,
+            'technicalDetails': [finding.to_dict() for finding in self.findings],
+            'recommendations': self.recommendations,
+            'source': self.source,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data.get('source', 'ai'),
+            _as_int(data.get('score')),
+            _as_int(data.get('max_score'), 20),
+            data.get('summary', ''),
+            criteria={name: (_as_int(value.get('score')), _as_int(value.get('max_score')))
+                      for name, value in data.get('criteria', {}).items()},
+            findings=[Finding.from_dict(detail) for detail in data.get('findings', [])],
+            strengths=data.get('strengths'),
+            improvements=data.get('improvements'),
+            recommendations=data.get('recommendations'),
+        )
+
+
+def parse_criteria_errors(html_errors, css_errors, html_file='index.html', css_file='style.css'):
+    """Convertit les messages HTML_ERRORS / CSS_ERRORS du workflow en findings"""
+    findings = []
+    for line in (html_errors or '').splitlines():
+        line = line.strip()
+        match = HTML_ERROR_LINE_RE.match(line)
+        if match:
+            findings.append(Finding(html_file, int(match.group(1)), None, 'error', match.group(2),
+                                    'Corrigez cette erreur de validation HTML', 'html-validation', 1))
+        elif line:
+            findings.append(Finding(html_file, 0, None, 'error', line, '', 'html-validation', 1))
+    for line in (css_errors or '').splitlines():
+        line = line.strip()
+        match = CSS_ERROR_LINE_RE.match(line)
+        if match:
+            icon, criterion, message = match.groups()
+            findings.append(Finding(css_file, 0, None, 'error' if icon == '❌' else 'warning', message, '',
+                                    f'css-{criterion.lower()}', 1))
+        elif line:
+            findings.append(Finding(css_file, 0, None, 'warning', line, '', 'criteria', 1))
+    return findings
+
+
+def to_json(evaluation, **extra):
+    """Sérialisation JSON d'une évaluation (champs additionnels : repository, commit...)"""
+    data = dict(extra)
+    data.update(evaluation.to_dict())
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def append_jsonl(path, evaluation, **extra):
+    """Ajoute l'évaluation en une ligne à la fin d'un fichier JSONL"""
+    data = dict(extra)
+    data.update(evaluation.to_dict())
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(data, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+
+def iter_jsonl(path):
+    """Relit un fichier JSONL ligne par ligne (dicts)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def to_sarif(evaluation):
+    """Rapport SARIF 2.1.0 (code scanning GitHub)"""
+    rules = {}
+    results = []
+    for finding in evaluation.findings:
+        rule_id = finding.rule or DEFAULT_RULES.get(evaluation.source, 'finding')
+        if rule_id not in rules:
+            rules[rule_id] = {
+                'id': rule_id,
+                'shortDescription': {'text': finding.issue or rule_id},
+                'defaultConfiguration': {'level': SARIF_LEVELS[finding.severity]},
+            }
+
+        message = finding.issue
+        if finding.suggestion:
+            message = f'{message} — {finding.suggestion}' if message else finding.suggestion
+        location = {'artifactLocation': {'uri': finding.file}}
+        if finding.line > 0:
+            region = {'startLine': finding.line}
+            if finding.column:
+                region['startColumn'] = finding.column
+            location['region'] = region
+
+        results.append({
+            'ruleId': rule_id,
+            'level': SARIF_LEVELS[finding.severity],
+            'message': {'text': message or rule_id},
+            'locations': [{'physicalLocation': location}],
+        })
+
+    return {
+        '$schema': SARIF_SCHEMA,
+        'version': '2.1.0',
+        'runs': [{
+            'tool': {'driver': {'name': TOOL_NAME, 'rules': list(rules.values())}},
+            'results': results,
+            'properties': {'score': evaluation.score, 'maxScore': evaluation.max_score},
+        }],
+    }
+
+
+def write_exports(evaluation, formats, directory='.', **extra):
+    """Écrit les exports demandés (json, jsonl, sarif) à côté de FEEDBACK.md"""
+    written = []
+    for export_format in formats:
+        if export_format == 'json':
+            path = os.path.join(directory, 'FEEDBACK.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(to_json(evaluation, **extra) + '\n')
+        elif export_format == 'jsonl':
+            path = os.path.join(directory, 'feedback.jsonl')
+            append_jsonl(path, evaluation, **extra)
+        elif export_format == 'sarif':
+            path = os.path.join(directory, 'FEEDBACK.sarif')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(to_sarif(evaluation), f, ensure_ascii=False, indent=2)
+                f.write('\n')
+        else:
+            continue
+        written.append(path)
+    return written
+
+
+def get_export_formats(value):
+    """Formats d'export demandés, ex. FEEDBACK_EXPORTS="json,sarif" """
+    return [name.strip().lower() for name in (value or '').split(',') if name.strip()]
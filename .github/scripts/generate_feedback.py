@@ -3,277 +3,447 @@
 
 import os
 import sys
-import json
+import sqlite3
 from datetime import datetime
-
-def analyze_files_locally():
-    """Analyse locale des fichiers quand l'API IA n'est pas disponible"""
-    print("🔍 Analyse locale des fichiers en cours...")
+from concurrent.futures import ProcessPoolExecutor
+
+from html_analyzer import analyze_html_file
+from rules import COMPILED_RULES, apply_rules_to_file, profile_rules
+from streaming import detect_vendored, vendored_finding
+from report_renderer import AI_TIMESTAMP_FORMAT, render_ai_report, render_criteria_report
+from findings import Evaluation, get_export_formats, write_exports
+from ai_response import AIResponseError, read_ai_response
+from project_files import discover_files, file_type_of
+from selector_index import analyze_project_index
+from exercise_profile import apply_weights, load_profile
+from analysis_budget import budget_enabled, describe_budget, get_budget, run_with_budget
+import result_cache
+import history_store
+import instrumentation
+from instrumentation import stage
+
+LOCAL_BASE_SCORE = 20
+
+# Fichier non analysé (budget dépassé) : il ne rapporte aucun point
+TRUNCATED_FILE_PENALTY = LOCAL_BASE_SCORE
+
+# En dessous de ce volume, lancer des processus coûte plus cher que l'analyse elle-même
+PARALLEL_MIN_BYTES = 256 * 1024
+
+# Étape signalée à `progress` pour l'index croisé CSS / HTML (après les fichiers)
+INDEX_STAGE = 'index croisé CSS / HTML'
+
+def analyze_file(root, file_name, file_type, checks=()):
+    """Analyse locale d'un fichier et retourne ses findings
+
+    `checks` : vérifications de document HTML actives dans le profil d'exercice.
+    """
+    path = os.path.join(root, file_name)
+    if file_type == 'html':
+        # Parseur incrémental : pile de balises et attributs
+        return analyze_html_file(path, file_name, checks=checks)
     
-    technical_details = []
-    score = 20  # Score de départ
+    # Bibliothèque copiée dans la soumission : signalée mais non notée
+    vendored = detect_vendored(path, file_name)
+    if vendored:
+        return [vendored_finding(file_name, vendored)]
+    
+    # Table de règles compilée, lecture en flux et un seul parcours par ligne
+    return apply_rules_to_file(COMPILED_RULES, file_type, path, file_name)
+
+def _analyze_task(task):
+    return analyze_file(*task)
+
+def get_analysis_workers(workers=None):
+    """Nombre de processus de l'analyse locale (ANALYSIS_WORKERS, défaut: nombre de CPU)"""
+    if workers:
+        return workers
+    try:
+        return int(os.environ.get('ANALYSIS_WORKERS') or 0) or os.cpu_count() or 1
+    except ValueError:
+        return os.cpu_count() or 1
+
+def analyze_project_files(root, files, workers=None, checks=(), progress=None):
+    """Analyse chaque fichier, en parallèle sur un pool de processus pour les gros projets
+
+    `progress(nom, findings)` est appelé au début (findings None) et à la fin de chaque fichier ;
+    en parallèle, tous les fichiers sont signalés commencés dès leur soumission au pool.
+    """
+    workers = min(get_analysis_workers(workers), len(files))
+    sizes = [os.path.getsize(os.path.join(root, file_name)) for file_name, _ in files]
+    checks = tuple(checks)
+    if workers <= 1 or sum(sizes) < PARALLEL_MIN_BYTES:
+        results = []
+        for file_name, file_type in files:
+            if progress:
+                progress(file_name, None)
+            results.append(analyze_file(root, file_name, file_type, checks))
+            if progress:
+                progress(file_name, results[-1])
+        return results
     
-    # Analyser index.html
-    if os.path.exists('index.html'):
-        with open('index.html', 'r', encoding='utf-8') as f:
-            html_content = f.read()
-            lines = html_content.split('\n')
-            
-            for i, line in enumerate(lines, 1):
-                # Détecter balises non fermées
-                if '<button' in line and '</button>' not in line and not line.strip().endswith('/>'):
-                    if i < len(lines) and '</button>' not in lines[i]:
-                        technical_details.append({
-                            'file': 'index.html',
-                            'line': i,
-                            'severity': 'error',
-                            'issue': 'Balise button non fermée',
-                            'suggestion': 'Ajoutez la balise de fermeture </button> correspondante'
-                        })
-                        score -= 3
-                
-                # Détecter attributs mal orthographiés
-                if 'clas=' in line:
-                    technical_details.append({
-                        'file': 'index.html',
-                        'line': i,
-                        'severity': 'error',
-                        'issue': 'Attribut "clas" incorrect',
-                        'suggestion': 'Remplacez "clas" par "class"'
-                    })
-                    score -= 2
+    # Les plus gros fichiers d'abord pour équilibrer la charge, résultats remis dans l'ordre
+    order = sorted(range(len(files)), key=lambda index: -sizes[index])
+    results = [None] * len(files)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        tasks = [(root,) + files[index] + (checks,) for index in order]
+        if progress:
+            for index in order:
+                progress(files[index][0], None)
+        for index, findings in zip(order, executor.map(_analyze_task, tasks)):
+            results[index] = findings
+            if progress:
+                progress(files[index][0], findings)
+    return results
+
+def profile_local_rules(root='.', files=None):
+    """Coût de chaque règle de la table sur les fichiers de la soumission (instrumentation)"""
+    for file_name, file_type in files if files is not None else discover_files(root):
+        path = os.path.join(root, file_name)
+        if file_type in COMPILED_RULES and not detect_vendored(path, file_name):
+            for rule_id, seconds in profile_rules(COMPILED_RULES, file_type, path).items():
+                instrumentation.add_rule_cost(rule_id, seconds)
+
+def count_scored_files(files, technical_details):
+    """Nombre de fichiers notés par type (les fichiers tiers ne comptent pas)"""
+    vendored = {detail.get('file') for detail in technical_details if detail.get('rule') == 'vendored-file'}
+    counts = {}
+    for file_name, file_type in files:
+        if file_name not in vendored:
+            counts[file_type] = counts.get(file_type, 0) + 1
+    return counts
+
+def get_local_penalty(technical_details, files=None):
+    """Pénalité totale ; avec la liste des fichiers, moyenne par fichier pour chaque type
+
+    Une page HTML et une feuille de style gardent ainsi leur pénalité
+    entière, tandis qu'un site de dix pages n'est pas noté dix fois plus
+    sévèrement qu'une page unique.
+    """
+    if files is None:
+        return sum(detail.get('penalty', 0) for detail in technical_details)
     
-    # Analyser style.css
-    if os.path.exists('style.css'):
-        with open('style.css', 'r', encoding='utf-8') as f:
-            css_content = f.read()
-            lines = css_content.split('\n')
-            
-            for i, line in enumerate(lines, 1):
-                # Détecter width excessive
-                if 'width: 250%' in line:
-                    technical_details.append({
-                        'file': 'style.css',
-                        'line': i,
-                        'severity': 'error',
-                        'issue': 'Largeur excessive (250%) cassant la mise en page',
-                        'suggestion': 'Utilisez une largeur raisonnable comme 100% ou max-width'
-                    })
-                    score -= 4
-                
-                # Détecter position stick (invalide)
-                if 'position: stick' in line and 'sticky' not in line:
-                    technical_details.append({
-                        'file': 'style.css',
-                        'line': i,
-                        'severity': 'error',
-                        'issue': 'Valeur CSS invalide "stick"',
-                        'suggestion': 'Remplacez "position: stick" par "position: sticky"'
-                    })
-                    score -= 2
-                
-                # Détecter margin négatif excessif
-                if 'margin-left: -9999px' in line:
-                    technical_details.append({
-                        'file': 'style.css',
-                        'line': i,
-                        'severity': 'error',
-                        'issue': 'Élément placé hors écran avec margin négatif excessif',
-                        'suggestion': 'Retirez cette propriété ou utilisez display: none pour masquer l\'élément'
-                    })
-                    score -= 3
-                
-                # Détecter points-virgules manquants
-                if ('cursor: pointer' in line or 'height: 400px' in line) and not line.strip().endswith(';') and not line.strip().endswith('{'):
-                    technical_details.append({
-                        'file': 'style.css',
-                        'line': i,
-                        'severity': 'warning',
-                        'issue': 'Point-virgule manquant en fin de déclaration CSS',
-                        'suggestion': 'Ajoutez un point-virgule (;) à la fin de la déclaration'
-                    })
-                    score -= 1
+    penalties = {}
+    for detail in technical_details:
+        file_type = file_type_of(str(detail.get('file', '')))
+        penalties[file_type] = penalties.get(file_type, 0) + detail.get('penalty', 0)
+    counts = count_scored_files(files, technical_details)
+    return round(sum(penalty / max(1, counts.get(file_type, 0)) for file_type, penalty in penalties.items()))
+
+def summarize_local_findings(technical_details, files=None, weights=None):
+    """Calcule le score de l'analyse locale et construit le résultat au format de l'API IA
+
+    `weights` (pondérations du profil d'exercice) remplace la pénalité des règles concernées.
+    """
+    apply_weights(technical_details, weights)
+    score = LOCAL_BASE_SCORE - get_local_penalty(technical_details, files)
     
     return {
         'score': max(0, score),
         'technicalDetails': technical_details,
         'summary': f'Analyse locale détectant {len(technical_details)} problème(s) technique(s)',
         'strengths': ['Structure HTML de base présente'] if score > 10 else [],
-        'improvements': [f'{len(technical_details)} erreurs critiques à corriger avant soumission']
+        'improvements': [f'{len(technical_details)} erreurs critiques à corriger avant soumission'],
+        'source': 'local',
     }
 
-def generate_ai_feedback():
-    """Génère le feedback à partir de l'évaluation IA avancée"""
-    ai_available = os.environ.get('AI_AVAILABLE', 'false').lower() == 'true'
-    ai_response = os.environ.get('AI_RESPONSE', '{}')
+def analyze_files_locally(root='.', workers=None, profile=None, progress=None):
+    """Analyse locale des fichiers quand l'API IA n'est pas disponible"""
+    print("🔍 Analyse locale des fichiers en cours...")
     
-    if not ai_available:
-        # Utiliser l'analyse locale si l'API IA n'est pas disponible
-        print("⚠️ API IA indisponible, utilisation de l'analyse locale avancée")
-        ai_data = analyze_files_locally()
+    technical_details = []
+    with stage('local_analysis'):
+        # Profil compilé de la soumission : fichiers, vérifications actives, pondérations
+        profile = profile or load_profile(root)
+        # Fichiers désignés par FILES / .evaluation-config (noms ou motifs glob)
+        files = discover_files(root, profile['settings']['files_to_analyze'])
+        for findings in analyze_project_files(root, files, workers, profile['checks'], progress):
+            technical_details.extend(findings)
+        # Index croisé CSS / HTML : règles inutilisées, classes indéfinies, sélecteurs trop spécifiques
+        if progress:
+            progress(INDEX_STAGE, None)
+        index_findings = analyze_project_index(root, files)
+        technical_details.extend(index_findings)
+        if progress:
+            progress(INDEX_STAGE, index_findings)
+    
+    if instrumentation.ENABLED:
+        instrumentation.count_rule_hits(technical_details)
+        profile_local_rules(root, files)
+    
+    with stage('scoring'):
+        return summarize_local_findings(technical_details, files, profile['weights'])
+
+def _analyze_in_child(root, workers, profile, send):
+    # Processus limité : chaque étape terminée est transmise au parent dès qu'elle est connue ;
+    # les mesures d'instrumentation sont prises par le parent (celles de l'enfant seraient perdues)
+    instrumentation.ENABLED = False
+    def progress(name, findings):
+        send(('start', name) if findings is None else ('findings', (name, findings)))
+    return analyze_files_locally(root, workers, profile, progress)
+
+def summarize_truncated_analysis(completed, pending, reason, budget, weights=None, files=None):
+    """Rapport « analyse interrompue » à partir des findings reçus avant l'arrêt
+
+    completed : [(fichier ou INDEX_STAGE, findings)] dans l'ordre de réception ;
+    pending : étapes commencées et non terminées au moment de l'arrêt ;
+    files : fichiers à analyser. Chaque fichier non analysé reçoit la
+    pénalité maximale, et une interruption pendant l'index croisé (qui
+    relit tous les fichiers) rend la note nulle : gonfler un fichier pour
+    dépasser le budget ne peut pas améliorer la note ni éviter une étape.
+    """
+    technical_details = [finding for _, findings in completed for finding in findings]
+    detected = len(technical_details)
+    analysed = {name for name, _ in completed}
+    if files is None:
+        files = [(name, file_type_of(name)) for name in [*analysed, *pending] if name != INDEX_STAGE]
+    limit = describe_budget(budget, reason)
+    started = [name for name in pending if name != INDEX_STAGE]
+    if INDEX_STAGE in pending:
+        where = f" pendant la construction de l'{INDEX_STAGE}"
     else:
+        where = f" pendant l'analyse de {', '.join(started)}" if started else ''
+    suggestion = ('Vérifiez la taille et l\'imbrication de ce fichier (ligne unique de plusieurs mégaoctets, '
+                  'balises imbriquées à l\'excès) : seuls les résultats obtenus avant l\'interruption sont affichés')
+
+    unanalysed = [file_name for file_name, _ in files if file_name not in analysed]
+    for file_name in unanalysed:
+        technical_details.append({
+            'file': file_name,
+            'line': 0,
+            'severity': 'error',
+            'issue': (f'Analyse interrompue : {limit} dépassée pendant l\'analyse de ce fichier, non noté'
+                      if file_name in started else
+                      f'Fichier non analysé : {limit} dépassée avant son analyse'),
+            'suggestion': suggestion,
+            'rule': 'analysis-truncated',
+            'penalty': TRUNCATED_FILE_PENALTY,
+        })
+    if not unanalysed:
+        # Tous les fichiers sont notés : seule une étape commune (index croisé) a pu être sautée
+        skipped = INDEX_STAGE in pending
+        technical_details.append({
+            'file': 'Analyse du projet',
+            'line': 0,
+            'severity': 'error' if skipped else 'warning',
+            'issue': (f'Analyse interrompue : {limit} dépassée{where}, note non attribuée' if skipped else
+                      f'Analyse interrompue : {limit} dépassée{where}'),
+            'suggestion': suggestion,
+            'rule': 'analysis-truncated',
+            'penalty': LOCAL_BASE_SCORE if skipped else 0,
+        })
+    result = summarize_local_findings(technical_details, files, weights)
+    result['summary'] = (f"⏱️ Analyse interrompue ({limit}){where} : {detected} problème(s) "
+                         f"détecté(s) avant l'interruption, note provisoire")
+    result['truncated'] = reason
+    return result
+
+def analyze_files_with_budget(root='.', budget=None, workers=None, profile=None, cancel=None):
+    """Analyse locale dans un processus limité en temps CPU, durée et mémoire (ANALYSIS_*)
+
+    Au-delà du budget, le processus est arrêté et le rapport est construit
+    avec les findings déjà transmis (analyse marquée comme interrompue).
+    Avec `cancel` (threading.Event), l'analyse se fait toujours dans un
+    processus, arrêté dès que l'évènement est positionné (retourne None).
+    """
+    budget = get_budget() if budget is None else budget
+    profile = profile or load_profile(root)
+    if not budget_enabled(budget) and cancel is None:
+        return analyze_files_locally(root, workers, profile)
+
+    completed = []
+    pending = []
+
+    def on_message(kind, payload):
+        if kind == 'start':
+            pending.append(payload)
+        elif kind == 'findings':
+            completed.append(payload)
+            if payload[0] in pending:
+                pending.remove(payload[0])
+
+    with stage('local_analysis'):
+        ai_data, reason = run_with_budget(_analyze_in_child, (root, workers, profile), budget, on_message, cancel)
+    if reason == 'cancelled':
+        return None
+    if instrumentation.ENABLED and reason is None:
+        instrumentation.count_rule_hits(ai_data['technicalDetails'])
+        profile_local_rules(root, discover_files(root, profile['settings']['files_to_analyze']))
+    if reason is None:
+        return ai_data
+    print(f"⏱️ Analyse de {root} interrompue ({describe_budget(budget, reason)})")
+    files = discover_files(root, profile['settings']['files_to_analyze'])
+    return summarize_truncated_analysis(completed, pending, reason, budget, profile['weights'], files)
+
+def ai_response_expected(env=None):
+    """Une réponse IA est à lire (AI_AVAILABLE, ou AI_RESPONSE_FILE seul hors workflow)"""
+    env = os.environ if env is None else env
+    default = 'true' if env.get('AI_RESPONSE_FILE') else 'false'
+    return env.get('AI_AVAILABLE', default).lower() == 'true'
+
+def load_evaluation(profile=None):
+    """Évaluation IA lue et validée en une passe, sinon analyse locale (None si rien d'utilisable)"""
+    if ai_response_expected():
         try:
-            ai_data = json.loads(ai_response)
-            if 'error' in ai_data:
-                print("❌ Erreur dans la réponse IA, fallback vers analyse locale")
-                ai_data = analyze_files_locally()
-        except:
-            print("❌ Erreur parsing réponse IA, fallback vers analyse locale")
-            ai_data = analyze_files_locally()
-    
-    if not ai_data:
+            with stage('ai_response_parse'):
+                return read_ai_response()
+        except AIResponseError as e:
+            print(f"❌ Réponse IA inutilisable ({e}), fallback vers analyse locale")
+    else:
+        # Utiliser l'analyse locale si l'API IA n'est pas disponible
+        print("⚠️ API IA indisponible, utilisation de l'analyse locale avancée")
+
+    profile = profile or load_profile()
+    if not discover_files('.', profile['settings']['files_to_analyze']):
+        # Rien à analyser localement : le rapport par critères du workflow prend le relais
+        print("⚠️ Aucun fichier à analyser localement")
+        return None
+    ai_data = analyze_files_with_budget(profile=profile)
+    return Evaluation.from_ai_data(ai_data, ai_data.get('source', 'local'))
+
+def load_ai_data():
+    """Récupère les données d'évaluation au format de rendu (ou None si elles sont inutilisables)"""
+    evaluation = load_evaluation()
+    return evaluation.to_ai_data() if evaluation is not None else None
+
+def generate_ai_feedback(ai_data=None, progression=None, profile=None, now=None):
+    """Génère le feedback à partir de l'évaluation IA avancée"""
+    if ai_data is None:
+        ai_data = load_ai_data()
+    if ai_data is None:
         return None
     
+    settings = (profile or load_profile())['settings']
+    repository = os.environ.get('REPOSITORY', 'repository')
+    competence = settings['competence']
+    niveau = settings['niveau']
+    
+    with stage('render'):
+        return render_ai_feedback(ai_data, repository, competence, niveau, progression, now)
+
+def render_ai_feedback(ai_data, repository, competence, niveau, progression=None, now=None):
+    """Construit le contenu de FEEDBACK.md à partir des données d'évaluation IA"""
+    timestamp = now.strftime(AI_TIMESTAMP_FORMAT) if now else None
+    return render_ai_report(ai_data, repository, competence, niveau, timestamp, progression)
+
+def render_cached_feedback(entry, history, profile):
+    """Régénère FEEDBACK.md depuis une entrée du cache, avec la progression actuelle
+
+    Le rapport garde sa date de génération : seule la ligne de progression
+    dépend de l'historique au moment de la relance.
+    """
+    evaluation = Evaluation.from_dict(entry['evaluation'])
+    report = entry['report']
+    now = datetime.fromisoformat(report['generated_at'])
+    progression = get_progression(history, evaluation)
+    if report['kind'] == 'ai':
+        feedback = generate_ai_feedback(evaluation.to_ai_data(), progression, profile, now)
+    else:
+        settings = profile['settings']
+        with stage('render'):
+            feedback = render_criteria_report(report['scores'], settings['niveau'], os.environ.get('REPOSITORY', 'repository'),
+                                              settings['competence'], ','.join(settings['files_to_analyze']),
+                                              report['html_errors'], report['css_errors'], report['error_count'],
+                                              now=now, progression=progression)
+    return feedback, evaluation
+
+def get_reported_scores():
+    """Scores transmis par le workflow, conservés avec le résultat en cache"""
+    return {
+        'html_score': os.environ.get('HTML_SCORE', '0'),
+        'css_score': os.environ.get('CSS_SCORE', '0'),
+        'error_count': os.environ.get('ERROR_COUNT', '0'),
+        'total_score': os.environ.get('TOTAL_SCORE', ''),
+    }
+
+def export_evaluation(evaluation):
+    """Exports structurés demandés par FEEDBACK_EXPORTS (json, jsonl, sarif)"""
+    formats = get_export_formats(os.environ.get('FEEDBACK_EXPORTS'))
+    if not formats:
+        return []
+    written = write_exports(evaluation, formats, repository=os.environ.get('REPOSITORY', 'repository'))
+    for path in written:
+        print(f"📤 Export {path} généré")
+    return written
+
+def open_history():
+    """Base d'historique FEEDBACK_HISTORY_DB, ou None si désactivée ou inaccessible"""
+    path = history_store.get_history_path()
+    if not path:
+        return None
     try:
-        ai_data = json.loads(ai_response)
-        if 'error' in ai_data:
-            return None
-            
-        repository = os.environ.get('REPOSITORY', 'repository')
-        competence = os.environ.get('COMPETENCE', 'Développement Web HTML/CSS')
-        niveau = os.environ.get('NIVEAU', 'Débutant')
-        
-        timestamp = datetime.now().strftime("%d/%m/%Y à %H:%M")
-        
-        # Génération du feedback avec les données IA
-        feedback = f"""# 📝 Feedback Automatique Avancé
-
-> **Évaluation générée automatiquement le {timestamp}**
-
-## 👤 Informations
-- **Repository:** {repository}
-- **Compétence évaluée:** {competence}
-- **Niveau:** {niveau}
-- **Status:** ✅ Évaluation IA avancée
-
----
-
-## 📊 Résultat Global
-
-### Note: {ai_data.get('score', 0)}/20 {get_score_emoji(ai_data.get('score', 0))}
-
-{ai_data.get('summary', 'Évaluation effectuée avec succès.')}
-
----
-
-## ✅ Points Forts
-
-"""
-        
-        strengths = ai_data.get('strengths', [])
-        if strengths:
-            for strength in strengths:
-                feedback += f"- {strength}\n"
-        else:
-            feedback += "- 💪 Continue tes efforts, tu es sur la bonne voie !\n"
-        
-        feedback += "\n---\n\n## 🔧 Axes d'Amélioration\n\n"
-        
-        improvements = ai_data.get('improvements', [])
-        if improvements:
-            for improvement in improvements:
-                feedback += f"- {improvement}\n"
-        else:
-            feedback += "- ✨ Excellent travail, peu d'améliorations nécessaires !\n"
-        
-        feedback += "\n---\n\n## 🔍 Détails Techniques\n\n"
-        
-        technical_details = ai_data.get('technicalDetails', [])
-        if technical_details:
-            feedback += f"J'ai analysé votre code en détail et identifié **{len(technical_details)} point(s)** spécifique(s) à améliorer :\n\n"
-            
-            # Grouper par fichier
-            files_details = {}
-            for detail in technical_details:
-                file_name = detail.get('file', 'Fichier inconnu')
-                if file_name not in files_details:
-                    files_details[file_name] = []
-                files_details[file_name].append(detail)
-            
-            for file_name, details in files_details.items():
-                feedback += f"### 📄 **{file_name}**\n\n"
-                
-                for i, detail in enumerate(details, 1):
-                    severity_icons = {'error': '🚫', 'warning': '⚠️', 'info': 'ℹ️'}
-                    icon = severity_icons.get(detail.get('severity', 'info'), 'ℹ️')
-                    line_info = f" **ligne {detail['line']}**" if detail.get('line') else ''
-                    severity_text = {'error': 'Erreur', 'warning': 'Attention', 'info': 'Info'}.get(detail.get('severity', 'info'), 'Info')
-                    
-                    feedback += f"**{i}.** {icon} **{severity_text}**{line_info}\n"
-                    feedback += f"- **Problème identifié :** {detail.get('issue', 'Non spécifié')}\n"
-                    feedback += f"- **Conseil d'amélioration :** {detail.get('suggestion', 'Voir la documentation')}\n\n"
-            
-            feedback += "> 💡 **Conseil de coach :** Ces points d'amélioration sont là pour vous faire progresser. Chaque correction est une occasion d'apprendre quelque chose de nouveau !\n"
-        else:
-            feedback += "✅ **Aucun problème technique majeur détecté !**\n\nVotre code respecte les bonnes pratiques de base. C'est un excellent point de départ !\n"
-        
-        feedback += "\n---\n\n## 💡 Recommandations pour Progresser\n\n"
-        
-        recommendations = ai_data.get('recommendations', [])
-        if recommendations:
-            for rec in recommendations:
-                feedback += f"- {rec}\n"
-        else:
-            feedback += "- 📚 Continuer à pratiquer régulièrement\n- 💬 N'hésiter pas à demander de l'aide\n"
-        
-        feedback += f"""
-
----
-
-## 📚 Ressources Utiles
-
-- 📖 [MDN Web Docs](https://developer.mozilla.org/fr/) - Documentation complète HTML/CSS/JS
-- 🎓 [freeCodeCamp](https://www.freecodecamp.org/) - Cours gratuits et exercices
-- 💻 [W3Schools](https://www.w3schools.com/) - Tutoriels et références
-- 🔧 [Can I Use](https://caniuse.com/) - Compatibilité des propriétés CSS
-- 🎨 [CSS-Tricks](https://css-tricks.com/) - Astuces et techniques CSS
-
----
-
-## 🤖 À Propos de cette Évaluation
-
-Cette évaluation a été générée par notre système d'IA pédagogique avancé qui analyse votre code ligne par ligne selon les critères définis pour la compétence "{competence}".
-
-### Prochaines Étapes
-1. 📖 Lisez attentivement les détails techniques ci-dessus
-2. 🔄 Corrigez les erreurs identifiées une par une
-3. 💬 Demandez de l'aide à votre formateur si nécessaire
-4. 🚀 Committez vos corrections et relancez l'évaluation
-
----
-
-*💡 Cette évaluation personnalisée montre que j'ai vraiment analysé votre code. Chaque conseil est spécifique à votre travail !*
-
----
-
-<sub>🔄 Généré le: {timestamp} | 🤖 Évaluation IA avancée | 🌐 Powered by GitHub Codespaces</sub>
-"""
-        
-        return feedback
-        
-    except json.JSONDecodeError:
+        return history_store.connect(path)
+    except sqlite3.Error as e:
+        print(f"⚠️ Historique indisponible: {e}")
         return None
 
-def get_score_emoji(score):
-    """Retourne un emoji selon le score"""
-    if score >= 18:
-        return '🏆'
-    elif score >= 15:
-        return '🥉'
-    elif score >= 12:
-        return '👍'
-    elif score >= 10:
-        return '📈'
-    else:
-        return '💪'
+def get_progression(history, evaluation):
+    """Ligne de progression depuis la dernière évaluation enregistrée du dépôt"""
+    if history is None:
+        return None
+    try:
+        with stage('history'):
+            return history_store.get_progression(history, os.environ.get('REPOSITORY', 'repository'), evaluation,
+                                                 commit=os.environ.get('GITHUB_SHA'))
+    except sqlite3.Error as e:
+        print(f"⚠️ Lecture de l'historique impossible: {e}")
+        return None
+
+def record_history(history, evaluation):
+    """Ajoute l'évaluation à l'historique (dépôt, commit, promotion)"""
+    if history is None:
+        return
+    try:
+        with stage('history'):
+            history_store.record_evaluation(history, evaluation, os.environ.get('REPOSITORY', 'repository'),
+                                            commit=os.environ.get('GITHUB_SHA'),
+                                            promotion=os.environ.get('PROMOTION'))
+        print("🗂️ Évaluation ajoutée à l'historique")
+    except sqlite3.Error as e:
+        print(f"⚠️ Écriture de l'historique impossible: {e}")
 
 def main():
-    # Essayer d'abord l'évaluation IA avancée
-    ai_feedback = generate_ai_feedback()
+    # Soumission inchangée : réutiliser le feedback en cache
+    with stage('cache_lookup'):
+        cache_key = result_cache.compute_cache_key() if result_cache.get_cache_dir() else None
+        cached = result_cache.lookup(cache_key) if cache_key else None
+
+    history = open_history()
+    # Réglages de l'exercice : profil compilé (environnement, .evaluation-config, défauts)
+    with stage('profile'):
+        profile = load_profile()
+    settings = profile['settings']
+
+    if cached:
+        print("⚡ Soumission inchangée, évaluation restaurée depuis le cache")
+        feedback, evaluation = render_cached_feedback(cached, history, profile)
+        with stage('write'):
+            with open('FEEDBACK.md', 'w', encoding='utf-8') as f:
+                f.write(feedback)
+            export_evaluation(evaluation)
+            record_history(history, evaluation)
+        return 0
+
+    # Essayer d'abord l'évaluation IA avancée (réponse lue une seule fois)
+    evaluation = load_evaluation(profile)
+    now = datetime.now()
+    ai_feedback = None
+    if evaluation is not None:
+        ai_data = evaluation.to_ai_data()
+        ai_feedback = generate_ai_feedback(ai_data, get_progression(history, evaluation), profile, now)
     if ai_feedback:
         print("✅ Utilisation de l'évaluation IA avancée")
-        with open('FEEDBACK.md', 'w', encoding='utf-8') as f:
-            f.write(ai_feedback)
+        with stage('write'):
+            with open('FEEDBACK.md', 'w', encoding='utf-8') as f:
+                f.write(ai_feedback)
+            export_evaluation(evaluation)
+            record_history(history, evaluation)
+            if cache_key:
+                result_cache.store(cache_key, ai_feedback,
+                                   findings=ai_data.get('technicalDetails', []),
+                                   scores=get_reported_scores(),
+                                   evaluation=evaluation.to_dict(),
+                                   report={'kind': 'ai', 'generated_at': now.isoformat()})
         return
     
     print("⚠️ Fallback vers l'évaluation basique")
@@ -284,303 +454,71 @@ def main():
     error_count = os.environ.get('ERROR_COUNT', '0')
     html_errors = os.environ.get('HTML_ERRORS', '')
     css_errors = os.environ.get('CSS_ERRORS', '')
-    competence = os.environ.get('COMPETENCE', 'Développement Web HTML/CSS')
-    bareme = os.environ.get('BAREME', 'Structure HTML (10pts), Style CSS (10pts)')
-    files = os.environ.get('FILES', 'index.html,style.css')
+    competence = settings['competence']
+    files = ','.join(settings['files_to_analyze'])
     repository = os.environ.get('REPOSITORY', 'repository')
-    niveau = os.environ.get('NIVEAU', 'Débutant')
+    niveau = settings['niveau']
     
-    # Récupérer les scores maximum et seuils
-    html_max_score = int(os.environ.get('HTML_MAX_SCORE', '3'))
-    css_max_score = int(os.environ.get('CSS_MAX_SCORE', '9'))
-    total_max_score = int(os.environ.get('TOTAL_MAX_SCORE', '12'))
-    excellent_threshold = int(os.environ.get('EXCELLENT_THRESHOLD', '83'))
-    good_threshold = int(os.environ.get('GOOD_THRESHOLD', '67'))
+    # Scores maximum et seuils en points, déjà convertis dans le profil
+    html_max_score = settings['html_max_score']
+    total_max_score = settings['total_max_score']
+    thresholds = profile['thresholds']
 
     # Récupérer les scores détaillés par critère CSS
     structure_score = int(os.environ.get('STRUCTURE_SCORE', '0'))
     typography_score = int(os.environ.get('TYPOGRAPHY_SCORE', '0'))
     practices_score = int(os.environ.get('PRACTICES_SCORE', '0'))
 
-    try:
-        html_score_int = int(html_score)
-        css_score_int = int(css_score)
-        total_score = html_score_int + css_score_int
-    except ValueError:
-        html_score_int = 0
-        css_score_int = 0
-        total_score = 0
-
-    # Calcul des seuils adaptatifs
-    excellent_score = (total_max_score * excellent_threshold) // 100
-    good_score = (total_max_score * good_threshold) // 100
-
-    # Status selon la note avec seuils adaptatifs
-    if total_score >= excellent_score:
-        status_emoji = "🎉"
-        status_message = "Excellent travail !"
-        global_level = "Avancé"
-    elif total_score >= good_score:
-        status_emoji = "👍"
-        status_message = "Bon travail avec corrections à apporter"
-        global_level = "Compétent"
-    else:
-        status_emoji = "⚠️"
-        status_message = "Travail à corriger"
-        global_level = "Basique"
-
-    # Analyse contextuelle par critère
-    def get_criterium_analysis(score, max_score, criterium_name, context):
-        percentage = (score / max_score * 100) if max_score > 0 else 0
-        if percentage >= 85:
-            return f"✅ **{criterium_name}** ({score}/{max_score}): **Avancé** - {context['excellent']}"
-        elif percentage >= 67:
-            return f"🟡 **{criterium_name}** ({score}/{max_score}): **Compétent** - {context['good']}"
-        elif percentage >= 33:
-            return f"🟠 **{criterium_name}** ({score}/{max_score}): **Basique** - {context['basic']}"
-        else:
-            return f"❌ **{criterium_name}** ({score}/{max_score}): **Insuffisant** - {context['insufficient']}"
-
-    # Contextes spécifiques selon le barème
-    structure_context = {
-        'excellent': "Code bien structuré, variables CSS utilisées, commentaires présents",
-        'good': "Structure correcte mais perfectible, quelques optimisations possibles",
-        'basic': "Organisation confuse, sélecteurs redondants, manque de variables",
-        'insufficient': "Styles désorganisés, sélecteurs complexes, aucune variable CSS"
-    }
-
-    typography_context = {
-        'excellent': "Unités relatives privilégiées, typographie cohérente, couleurs hexadécimales",
-        'good': "Bonne base typographique, quelques unités fixes à convertir",
-        'basic': "Typographie basique, mélange d'unités, couleurs incohérentes",
-        'insufficient': "Typographie négligée, unités fixes prédominantes, couleurs désorganisées"
-    }
-
-    practices_context = {
-        'excellent': "Classes réutilisables, pseudo-classes maîtrisées, séparation parfaite",
-        'good': "Bonnes pratiques appliquées, quelques répétitions à optimiser",
-        'basic': "Pratiques basiques, code fonctionnel mais peu maintenable",
-        'insufficient': "Mauvaises pratiques, code difficile à maintenir, styles mélangés"
-    }
-
-    validation_context = {
-        'excellent': "Code validé W3C sans erreurs, compatible multi-navigateurs",
-        'good': "Validation correcte avec avertissements mineurs seulement",
-        'basic': "Quelques erreurs de validation, problèmes d'affichage possibles",
-        'insufficient': "Nombreuses erreurs, code non testé, incompatibilités"
-    }
-
-    # Génération des analyses par critère
-    structure_analysis = get_criterium_analysis(structure_score, 3, "Structure et Organisation CSS", structure_context)
-    typography_analysis = get_criterium_analysis(typography_score, 3, "Typographie et Couleurs", typography_context)
-    practices_analysis = get_criterium_analysis(practices_score, 3, "Bonnes Pratiques CSS", practices_context)
-    validation_analysis = get_criterium_analysis(html_score_int, html_max_score, "Validation et Tests", validation_context)
-
-    # Recommandations spécifiques selon les scores
-    def get_recommendations():
-        recommendations = []
-        if structure_score < 3:
-            recommendations.append("🔧 **Structure**: Organisez votre CSS avec des variables (`--primary-color`) et des commentaires sections")
-        if typography_score < 2:
-            recommendations.append("📝 **Typographie**: Utilisez des unités relatives (rem, em, %) plutôt que px")
-        if practices_score < 2:
-            recommendations.append("⚡ **Pratiques**: Créez des classes réutilisables et utilisez les pseudo-classes (:hover, :focus)")
-        if html_score_int < 2:
-            recommendations.append("🔴 **Validation HTML**: Corrigez les erreurs W3C pour garantir la compatibilité")
-        if not recommendations:
-            recommendations.append("🎯 **Optimisation**: Votre code est solide, explorez les techniques avancées (CSS Grid, animations)")
-        return recommendations
-
-    recommendations = get_recommendations()
-
-    # Messages d'encouragement selon le niveau et contexte
-    def get_contextual_message():
-        if niveau == "Débutant":
-            if total_score >= excellent_score:
-                return "🌟 Remarquable pour un niveau débutant ! Vous maîtrisez déjà les concepts avancés."
-            elif total_score >= good_score:
-                return "👏 Très bon travail pour un débutant ! Quelques corrections et vous excellerez."
-            else:
-                return "💪 Bon début ! Concentrez-vous sur les bases: validation W3C et organisation CSS."
-        
-        elif niveau == "Intermédiaire":
-            if total_score >= excellent_score:
-                return "🚀 Excellent niveau intermédiaire ! Prêt pour des défis plus complexes."
-            elif total_score >= good_score:
-                return "📈 Bonnes bases intermédiaires. Perfectionnez les détails pour exceller."
-            else:
-                return "🎯 Niveau intermédiaire à consolider. Focalisez sur les bonnes pratiques CSS."
-        
-        else:  # Avancé
-            if total_score >= excellent_score:
-                return "🏆 Niveau expert confirmé ! Votre code respecte les standards professionnels."
-            elif total_score >= good_score:
-                return "💼 Bon niveau avancé. Peaufinez les détails pour un code professionnel."
-            else:
-                return "📚 Niveau avancé à renforcer. Approfondissez l'organisation et les pratiques."
-
-    contextual_message = get_contextual_message()
-
-    # Génération du rapport contextuel et pédagogique
-    feedback_content = f"""# 🎯 Rapport d'Évaluation Pédagogique Contextuelle
-
-> **Analyse automatique contextuelle générée le {datetime.now().strftime('%d %B %Y à %H:%M')}**
-
-## � Contexte de l'Évaluation
-
-- **Repository:** `{repository}`
-- **Compétence évaluée:** {competence.replace('developement web', 'Développement Web').strip()}
-- **Niveau de l'étudiant:** **{niveau}**
-- **Fichiers analysés:** `{files}`
-
----
-
-## 🏆 Résultat Global
-
-### 📊 Note Finale: {total_score}/{total_max_score} points {status_emoji} **{status_message}** ({global_level})
-
-{contextual_message}
-
----
-
-## 📈 Analyse Détaillée par Critère du Barème
-
-### 🏗️ **Critère 1: Structure et Organisation du CSS**
-{structure_analysis}
-### � **Critère 2: Typographie et Couleurs** 
-{typography_analysis}
-
-
-
-## � Points d'Amélioration Détectés
-
-### **Erreurs Critiques à Corriger**
-
-{"#### 🔴 **Validation W3C HTML**" if error_count != '0' else ""}
-{html_errors if error_count != '0' else "✅ **Validation HTML**: Code validé sans erreurs critiques"}
-
-{"#### � **Analyse CSS Contextuelle**" if css_errors else ""}
-{css_errors if css_errors else "✅ **Analyse CSS**: Code respectant les critères du barème"}
-
-
-## � Plan d'Action Personnalisé
-
-
-{chr(10).join(f"- {rec}" for rec in recommendations)}
-
-### **Ressources Ciblées selon votre Profil {niveau}:**
-
-{"#### 📚 **Pour Débutants:**" if niveau == "Débutant" else ""}
-{"- [Validateur W3C HTML](https://validator.w3.org/) - Vérifiez votre code" if niveau == "Débutant" else ""}
-{"- [CSS Variables Guide](https://developer.mozilla.org/fr/docs/Web/CSS/Using_CSS_custom_properties) - Organisez vos couleurs" if niveau == "Débutant" else ""}
-{"- [Unités CSS](https://developer.mozilla.org/fr/docs/Learn/CSS/Building_blocks/Values_and_units) - rem vs px" if niveau == "Débutant" else ""}
-
-{"#### � **Pour Niveau Intermédiaire:**" if niveau == "Intermédiaire" else ""}
-{"- [CSS Grid Generator](https://cssgrid-generator.netlify.app/) - Layouts avancés" if niveau == "Intermédiaire" else ""}
-{"- [Pseudo-classes CSS](https://developer.mozilla.org/fr/docs/Web/CSS/Pseudo-classes) - Interactivité" if niveau == "Intermédiaire" else ""}
-{"- [BEM Methodology](https://getbem.com/) - Classes réutilisables" if niveau == "Intermédiaire" else ""}
-
-{"#### 🏆 **Pour Niveau Avancé:**" if niveau == "Avancé" else ""}
-{"- [CSS Architecture](https://maintainablecss.com/) - Code professionnel" if niveau == "Avancé" else ""}
-{"- [Performance CSS](https://web.dev/fast/#css) - Optimisation" if niveau == "Avancé" else ""}
-{"- [CSS Houdini](https://developer.mozilla.org/fr/docs/Web/Houdini) - Techniques avancées" if niveau == "Avancé" else ""}
-
----
-
-## 📊 Détail du Barème Appliqué
-
-| **Critère d'Évaluation** | **Score Obtenu** | **Score Maximum** | **Niveau Atteint** |
-|---------------------------|------------------|-------------------|-------------------|
-| **Structure et Organisation CSS** | {structure_score}/3 | 3 points | {"🎉 Avancé" if structure_score >= 3 else "👍 Compétent" if structure_score >= 2 else "⚠️ Basique" if structure_score >= 1 else "❌ Insuffisant"} |
-| **Typographie et Couleurs** | {typography_score}/3 | 3 points | {"🎉 Avancé" if typography_score >= 3 else "👍 Compétent" if typography_score >= 2 else "⚠️ Basique" if typography_score >= 1 else "❌ Insuffisant"} |
-| **Bonnes Pratiques CSS** | {practices_score}/3 | 3 points | {"🎉 Avancé" if practices_score >= 3 else "👍 Compétent" if practices_score >= 2 else "⚠️ Basique" if practices_score >= 1 else "❌ Insuffisant"} |
-| **Validation et Tests** | {html_score_int}/{html_max_score} | {html_max_score} points | {"🎉 Avancé" if html_score_int >= html_max_score*0.9 else "👍 Compétent" if html_score_int >= html_max_score*0.7 else "⚠️ Basique" if html_score_int >= html_max_score*0.5 else "❌ Insuffisant"} |
-| **TOTAL GÉNÉRAL** | **{total_score}/{total_max_score}** | **{total_max_score} points** | **{global_level}** |
-
----
-
-## 🎨 Code d'Exemple pour Améliorer votre Score
-
-### **Si Structure < 3 points:**
-{'''```css
-/* Ajoutez des variables CSS organisées */
-:root {
-  /* Couleurs principales */
-  --primary-color: #667eea;
-  --secondary-color: #764ba2;
-  --text-color: #333333;
-  
-  /* Espacement */
-  --spacing-sm: 0.5rem;
-  --spacing-md: 1rem;
-  --spacing-lg: 2rem;
-}
-
-/* Utilisez vos variables */
-.header {
-  background: var(--primary-color);
-  padding: var(--spacing-md);
-}
-```''' if structure_score < 3 else "✅ **Structure excellente** - Continuez ainsi !"}
-
-### **Si Typographie < 3 points:**
-{'''```css
-/* Utilisez des unités relatives */
-body {
-  font-size: 1rem;        /* Au lieu de 16px */
-  line-height: 1.6;       /* Proportion relative */
-  margin: 2rem auto;      /* Au lieu de 32px */
-}
-
-h1 {
-  font-size: 2.5rem;      /* Au lieu de 40px */
-  margin-bottom: 1.5rem;  /* Au lieu de 24px */
-}
-```''' if typography_score < 3 else "✅ **Typographie excellente** - Maîtrise des unités relatives !"}
-
-### **Si Pratiques < 3 points:**
-{'''```css
-/* Classes réutilisables */
-.btn {
-  padding: var(--spacing-sm) var(--spacing-md);
-  border: none;
-  border-radius: 4px;
-  cursor: pointer;
-}
-
-.btn:hover {
-  transform: translateY(-2px);
-  box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-}
-
-.btn--primary { background: var(--primary-color); }
-.btn--secondary { background: var(--secondary-color); }
-```''' if practices_score < 3 else "✅ **Pratiques excellentes** - Code maintenable et réutilisable !"}
-
----
-
-## 🎓 Message Pédagogique Final
-
-**Bilan contextuel:** {contextual_message}
-
-**Votre progression:** {"🔥 Vous excellez dans les critères techniques !" if total_score >= excellent_score else "📈 Vous progressez bien, quelques ajustements suffisent !" if total_score >= good_score else "💪 Bon départ, focalisez sur les bases pour progresser rapidement !"}
-
-**Prochaine étape:** {"Explorez les techniques CSS avancées (animations, grid layout)" if total_score >= excellent_score else "Perfectionnez l'organisation du code et les bonnes pratiques" if total_score >= good_score else "Maîtrisez d'abord la validation W3C et l'organisation de base"}
-
----
-
-<sub>🤖 **Analyse contextuelle automatisée** | 📊 Barème: Structure(3) + Typo(3) + Pratiques(3) + Validation({html_max_score}) = {total_max_score}pts | 🎯 Niveau: {niveau} | ⚡ Générée le {datetime.now().strftime('%d/%m/%Y %H:%M')}</sub>
-"""
+    with stage('scoring'):
+        try:
+            html_score_int = int(html_score)
+            css_score_int = int(css_score)
+            total_score = html_score_int + css_score_int
+        except ValueError:
+            html_score_int = 0
+            css_score_int = 0
+            total_score = 0
+
+        scores = {
+            'html_score': html_score_int,
+            'html_max_score': html_max_score,
+            'total_score': total_score,
+            'total_max_score': total_max_score,
+            'excellent_score': thresholds['excellent_score'],
+            'good_score': thresholds['good_score'],
+            'structure_score': structure_score,
+            'typography_score': typography_score,
+            'practices_score': practices_score,
+        }
+
+    evaluation = Evaluation.from_criteria(scores, html_errors, css_errors)
+
+    # Génération du rapport contextuel et pédagogique (gabarit précompilé)
+    with stage('render'):
+        feedback_content = render_criteria_report(scores, niveau, repository, competence, files,
+                                                  html_errors, css_errors, error_count, now=now,
+                                                  progression=get_progression(history, evaluation))
 
     # Écrire le fichier
     try:
-        with open('FEEDBACK.md', 'w', encoding='utf-8') as f:
-            f.write(feedback_content)
-        print("✅ Fichier FEEDBACK.md technique généré avec succès")
+        with stage('write'):
+            with open('FEEDBACK.md', 'w', encoding='utf-8') as f:
+                f.write(feedback_content)
+            print("✅ Fichier FEEDBACK.md technique généré avec succès")
+            export_evaluation(evaluation)
+            record_history(history, evaluation)
+            if cache_key:
+                result_cache.store(cache_key, feedback_content,
+                                   findings=[line for line in (html_errors + '\n' + css_errors).split('\n') if line.strip()],
+                                   scores=get_reported_scores(),
+                                   evaluation=evaluation.to_dict(),
+                                   report={'kind': 'criteria', 'generated_at': now.isoformat(), 'scores': scores,
+                                           'html_errors': html_errors, 'css_errors': css_errors,
+                                           'error_count': error_count})
         return 0
     except Exception as e:
         print(f"❌ Erreur lors de la génération du feedback: {e}")
         return 1
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(instrumentation.run(main))
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Utilitaires d'intégration avec GitHub Actions."""
+
+import os
+
+
+def write_github_output(values):
+    """Écrit des sorties d'étape dans $GITHUB_OUTPUT (ignoré hors GitHub Actions)"""
+    output_path = os.environ.get('GITHUB_OUTPUT')
+    if not output_path:
+        return
+
+    with open(output_path, 'a', encoding='utf-8') as f:
+        for key, value in values.items():
+            value = str(value)
+            if '\n' in value:
+                f.write(f"{key}<<EOF\n{value}\nEOF\n")
+            else:
+                f.write(f"{key}={value}\n")
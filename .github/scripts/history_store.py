@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Historique des évaluations dans une base SQLite embarquée.
+
+Chaque évaluation (parcours IA, analyse locale ou critères du barème) est
+ajoutée avec son dépôt, son commit, sa date, ses scores par critère et le
+nombre de findings par règle. Les index couvrent les trois usages :
+
+- la chronologie d'un étudiant (evaluations par dépôt, dans l'ordre d'ajout) ;
+- la fréquence des règles dans une promotion (dernière évaluation de chaque dépôt) ;
+- le premier commit où une règle a disparu des findings d'un dépôt.
+
+La ligne de progression du rapport ne lit que la dernière évaluation du
+dépôt et ses règles : son coût ne dépend pas de la taille de l'historique.
+
+L'historique est actif lorsque FEEDBACK_HISTORY_DB est défini.
+
+Usage :
+    python3 .github/scripts/history_store.py historique.sqlite timeline org/devoir-alice
+    python3 .github/scripts/history_store.py historique.sqlite rules [--promotion 2025]
+    python3 .github/scripts/history_store.py historique.sqlite resolved org/devoir-alice html-missing-alt
+    python3 .github/scripts/history_store.py historique.sqlite import evaluations.jsonl
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+from collections import Counter
+
+from findings import Evaluation, iter_jsonl
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS evaluations (
+    id INTEGER PRIMARY KEY,
+    repository TEXT NOT NULL,
+    promotion TEXT,
+    commit_sha TEXT,
+    created_at TEXT NOT NULL,
+    source TEXT,
+    score INTEGER,
+    max_score INTEGER,
+    findings INTEGER
+);
+CREATE TABLE IF NOT EXISTS criterion_scores (
+    evaluation_id INTEGER NOT NULL REFERENCES evaluations(id),
+    criterion TEXT NOT NULL,
+    score INTEGER,
+    max_score INTEGER,
+    PRIMARY KEY (evaluation_id, criterion)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rule_hits (
+    evaluation_id INTEGER NOT NULL REFERENCES evaluations(id),
+    rule TEXT NOT NULL,
+    hits INTEGER NOT NULL,
+    penalty INTEGER NOT NULL,
+    PRIMARY KEY (evaluation_id, rule)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS evaluations_repository ON evaluations (repository, id);
+CREATE INDEX IF NOT EXISTS evaluations_promotion ON evaluations (promotion, repository, id);
+CREATE INDEX IF NOT EXISTS rule_hits_rule ON rule_hits (rule, evaluation_id);
+"""
+
+
+def get_history_path(env=None):
+    """Chemin de la base d'historique (FEEDBACK_HISTORY_DB), ou None si désactivé"""
+    env = os.environ if env is None else env
+    return env.get('FEEDBACK_HISTORY_DB') or None
+
+
+def connect(path):
+    """Ouvre (et crée au besoin) la base d'historique"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    if conn.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION:
+        with conn:
+            conn.executescript(SCHEMA)
+            conn.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+    return conn
+
+
+def count_rules(evaluation):
+    """{règle: (occurrences, pénalité cumulée)} d'une évaluation"""
+    hits = Counter()
+    penalties = Counter()
+    for finding in evaluation.findings:
+        rule = finding.rule or 'finding'
+        hits[rule] += 1
+        penalties[rule] += finding.penalty
+    return {rule: (count, penalties[rule]) for rule, count in hits.items()}
+
+
+def record_evaluation(conn, evaluation, repository, commit=None, promotion=None, created_at=None):
+    """Ajoute une évaluation à l'historique ; retourne son identifiant"""
+    created_at = created_at or time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    with conn:
+        cursor = conn.execute(
+            'INSERT INTO evaluations (repository, promotion, commit_sha, created_at, source, score, max_score, findings)'
+            ' VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (repository, promotion, commit, created_at, evaluation.source, evaluation.score,
+             evaluation.max_score, len(evaluation.findings)))
+        evaluation_id = cursor.lastrowid
+        conn.executemany(
+            'INSERT INTO criterion_scores (evaluation_id, criterion, score, max_score) VALUES (?, ?, ?, ?)',
+            [(evaluation_id, name, score, max_score) for name, (score, max_score) in evaluation.criteria.items()])
+        conn.executemany(
+            'INSERT INTO rule_hits (evaluation_id, rule, hits, penalty) VALUES (?, ?, ?, ?)',
+            [(evaluation_id, rule, hits, penalty) for rule, (hits, penalty) in count_rules(evaluation).items()])
+    return evaluation_id
+
+
+def _evaluation_dict(row):
+    return {key: row[key] for key in row.keys()}
+
+
+def latest_evaluation(conn, repository, exclude_commit=None):
+    """Dernière évaluation d'un dépôt (avec ses règles), hors commit `exclude_commit` ; None si aucune"""
+    query = 'SELECT id, commit_sha, created_at, source, score, max_score, findings FROM evaluations WHERE repository = ?'
+    params = [repository]
+    if exclude_commit:
+        # Relance du workflow sur le même commit : comparer au commit précédent
+        query += ' AND commit_sha IS NOT ?'
+        params.append(exclude_commit)
+    row = conn.execute(query + ' ORDER BY id DESC LIMIT 1', params).fetchone()
+    if row is None:
+        return None
+    previous = _evaluation_dict(row)
+    previous['rules'] = {rule: hits for rule, hits in conn.execute(
+        'SELECT rule, hits FROM rule_hits WHERE evaluation_id = ?', (row['id'],))}
+    return previous
+
+
+def get_timeline(conn, repository, limit=None):
+    """Évaluations d'un dépôt dans l'ordre chronologique, avec les scores par critère"""
+    query = ('SELECT id, commit_sha, created_at, source, score, max_score, findings FROM evaluations'
+             ' WHERE repository = ? ORDER BY id DESC')
+    params = [repository]
+    if limit:
+        query += ' LIMIT ?'
+        params.append(limit)
+    timeline = [_evaluation_dict(row) for row in conn.execute(query, params)]
+    timeline.reverse()
+
+    by_id = {entry['id']: entry for entry in timeline}
+    for entry in timeline:
+        entry['criteria'] = {}
+    if by_id:
+        placeholders = ','.join('?' * len(by_id))
+        for row in conn.execute(
+                f'SELECT evaluation_id, criterion, score, max_score FROM criterion_scores'
+                f' WHERE evaluation_id IN ({placeholders})', list(by_id)):
+            by_id[row['evaluation_id']]['criteria'][row['criterion']] = (row['score'], row['max_score'])
+    return timeline
+
+
+def get_latest_scores(conn, promotion=None):
+    """Note et scores par critère de la dernière évaluation de chaque dépôt (d'une promotion)"""
+    where = 'WHERE promotion = ?' if promotion is not None else ''
+    params = [promotion] if promotion is not None else []
+    latest = f'SELECT MAX(id) AS id FROM evaluations {where} GROUP BY repository'
+
+    rows = {}
+    for row in conn.execute(
+            f'WITH latest AS ({latest})'
+            ' SELECT e.id, e.repository, e.score, e.max_score FROM latest JOIN evaluations e ON e.id = latest.id'
+            ' ORDER BY e.repository', params):
+        rows[row['id']] = {'repository': row['repository'], 'score': row['score'], 'max_score': row['max_score'],
+                           'criteria': {}}
+    for row in conn.execute(
+            f'WITH latest AS ({latest})'
+            ' SELECT c.evaluation_id, c.criterion, c.score, c.max_score'
+            ' FROM latest JOIN criterion_scores c ON c.evaluation_id = latest.id', params):
+        rows[row['evaluation_id']]['criteria'][row['criterion']] = (row['score'], row['max_score'])
+    return list(rows.values())
+
+
+def get_rule_frequencies(conn, promotion=None):
+    """Fréquence des règles sur la dernière évaluation de chaque dépôt (d'une promotion)"""
+    where = 'WHERE promotion = ?' if promotion is not None else ''
+    params = [promotion] if promotion is not None else []
+    latest = f'SELECT MAX(id) AS id FROM evaluations {where} GROUP BY repository'
+
+    repositories = conn.execute(f'SELECT COUNT(*) FROM ({latest})', params).fetchone()[0]
+    rows = conn.execute(
+        f'WITH latest AS ({latest})'
+        ' SELECT h.rule, COUNT(*) AS repositories, SUM(h.hits) AS hits, SUM(h.penalty) AS penalty'
+        ' FROM latest JOIN rule_hits h ON h.evaluation_id = latest.id'
+        ' GROUP BY h.rule ORDER BY repositories DESC, hits DESC, h.rule', params)
+    return repositories, [_evaluation_dict(row) for row in rows]
+
+
+def get_first_resolved(conn, repository, rule):
+    """Première évaluation sans `rule` après sa première apparition dans le dépôt ; None sinon"""
+    row = conn.execute(
+        'SELECT e.id, e.commit_sha, e.created_at, e.score, e.max_score FROM evaluations e'
+        ' WHERE e.repository = ?'
+        ' AND e.id > (SELECT MIN(p.id) FROM evaluations p JOIN rule_hits h ON h.evaluation_id = p.id'
+        '             WHERE p.repository = ? AND h.rule = ?)'
+        ' AND NOT EXISTS (SELECT 1 FROM rule_hits h WHERE h.evaluation_id = e.id AND h.rule = ?)'
+        ' ORDER BY e.id LIMIT 1',
+        (repository, repository, rule, rule)).fetchone()
+    return _evaluation_dict(row) if row else None
+
+
+def format_progression(previous, evaluation):
+    """Ligne de progression du rapport par rapport à l'évaluation précédente"""
+    delta = evaluation.score - previous['score']
+    trend = '📈' if delta > 0 else '📉' if delta < 0 else '➡️'
+    since = f" depuis le commit `{previous['commit_sha'][:7]}`" if previous.get('commit_sha') else ''
+    line = (f"{trend} **Progression :** {previous['score']}/{previous['max_score']} → "
+            f"{evaluation.score}/{evaluation.max_score} ({delta:+d}){since}")
+
+    current_rules = {finding.rule or 'finding' for finding in evaluation.findings}
+    resolved = sorted(rule for rule in previous['rules'] if rule not in current_rules)
+    if resolved:
+        line += f" · {len(resolved)} type(s) de problème corrigé(s) : {', '.join(f'`{rule}`' for rule in resolved)}"
+    return line
+
+
+def get_progression(conn, repository, evaluation, commit=None):
+    """Ligne de progression d'après la dernière évaluation enregistrée du dépôt, ou None"""
+    previous = latest_evaluation(conn, repository, exclude_commit=commit)
+    return format_progression(previous, evaluation) if previous else None
+
+
+def import_jsonl(conn, path, promotion=None):
+    """Ajoute les évaluations d'un export JSONL (batch_feedback.py --jsonl, feedback.jsonl)"""
+    count = 0
+    for data in iter_jsonl(path):
+        record_evaluation(conn, Evaluation.from_dict(data), data.get('repository', 'repository'),
+                          commit=data.get('commit'), promotion=data.get('promotion', promotion),
+                          created_at=data.get('created_at'))
+        count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Historique des évaluations (SQLite)")
+    parser.add_argument('database', help='Fichier SQLite (FEEDBACK_HISTORY_DB)')
+    parser.add_argument('--json', action='store_true', help='Sortie JSON')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    timeline_parser = commands.add_parser('timeline', help="Chronologie des évaluations d'un dépôt")
+    timeline_parser.add_argument('repository')
+    timeline_parser.add_argument('--limit', type=int, default=None)
+
+    rules_parser = commands.add_parser('rules', help='Fréquence des règles dans une promotion')
+    rules_parser.add_argument('--promotion', default=None)
+
+    resolved_parser = commands.add_parser('resolved', help='Premier commit où une règle a disparu')
+    resolved_parser.add_argument('repository')
+    resolved_parser.add_argument('rule')
+
+    import_parser = commands.add_parser('import', help='Importer un export JSONL')
+    import_parser.add_argument('jsonl')
+    import_parser.add_argument('--promotion', default=None)
+
+    args = parser.parse_args(argv)
+    conn = connect(args.database)
+
+    if args.command == 'timeline':
+        result = get_timeline(conn, args.repository, args.limit)
+        if not args.json:
+            for entry in result:
+                criteria = ', '.join(f'{name} {score}/{max_score}' for name, (score, max_score) in entry['criteria'].items())
+                print(f"{entry['created_at']} {(entry['commit_sha'] or '-')[:7]:7} {entry['score']:>3}/{entry['max_score']}"
+                      f" {entry['findings']:>4} problème(s) [{entry['source']}]" + (f" {criteria}" if criteria else ''))
+            if not result:
+                print(f"ℹ️ Aucune évaluation pour {args.repository}")
+    elif args.command == 'rules':
+        repositories, frequencies = get_rule_frequencies(conn, args.promotion)
+        result = {'repositories': repositories, 'rules': frequencies}
+        if not args.json:
+            print(f"📊 {repositories} dépôt(s) (dernière évaluation de chacun)")
+            for entry in frequencies:
+                print(f"  {entry['rule']:32} {entry['repositories']:>5} dépôt(s) {entry['hits']:>6} occurrence(s)")
+    elif args.command == 'resolved':
+        result = get_first_resolved(conn, args.repository, args.rule)
+        if not args.json:
+            if result:
+                print(f"✅ `{args.rule}` disparu au commit {(result['commit_sha'] or '-')[:7]} ({result['created_at']},"
+                      f" {result['score']}/{result['max_score']})")
+            else:
+                print(f"ℹ️ `{args.rule}` jamais corrigé dans {args.repository}")
+    else:
+        result = {'imported': import_jsonl(conn, args.jsonl, args.promotion)}
+        if not args.json:
+            print(f"📥 {result['imported']} évaluation(s) importée(s)")
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Analyse HTML incrémentale pour analyze_files_locally.
+
+Le fichier est consommé par blocs via html.parser (événements de balises),
+avec une pile de balises ouvertes : mémoire bornée par la profondeur
+d'imbrication, temps linéaire, et position ligne/colonne exacte pour chaque
+problème détecté.
+"""
+
+from html.parser import HTMLParser
+
+from streaming import read_block
+
+CHUNK_SIZE = 64 * 1024
+
+# Éléments sans balise de fermeture
+VOID_ELEMENTS = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+    'meta', 'param', 'source', 'track', 'wbr',
+})
+
+# Éléments dont la balise de fermeture peut être omise en HTML5
+OPTIONAL_END_TAGS = frozenset({
+    'html', 'head', 'body', 'p', 'li', 'dt', 'dd', 'option', 'optgroup',
+    'tr', 'td', 'th', 'thead', 'tbody', 'tfoot', 'colgroup', 'caption', 'rt', 'rp',
+})
+
+UNCLOSED_TAG_PENALTY = 3
+STRAY_END_TAG_PENALTY = 2
+MISSPELLED_ATTRIBUTE_PENALTY = 2
+INLINE_STYLE_PENALTY = 1
+MISSING_DOCTYPE_PENALTY = 2
+MISSING_LANG_PENALTY = 1
+MISSING_TITLE_PENALTY = 1
+NO_SEMANTIC_TAGS_PENALTY = 1
+
+# Vérifications de document activées par HTML_CRITERIA (profil d'exercice) -> règle
+DOCUMENT_CHECKS = {
+    'doctype': 'html-missing-doctype',
+    'lang': 'html-missing-lang',
+    'title': 'html-missing-title',
+    'semantic_tags': 'html-no-semantic-tags',
+}
+
+SEMANTIC_ELEMENTS = frozenset({
+    'header', 'nav', 'main', 'section', 'article', 'aside', 'footer',
+})
+
+HTML_RULES = frozenset({
+    'html-unclosed-tag', 'html-stray-end-tag', 'html-misspelled-attribute', 'html-inline-style',
+}) | frozenset(DOCUMENT_CHECKS.values())
+
+# Attributs mal orthographiés fréquents -> orthographe correcte
+MISSPELLED_ATTRIBUTES = {
+    'clas': 'class',
+}
+
+
+class HTMLStructureAnalyzer(HTMLParser):
+    """Parseur événementiel qui suit la pile de balises et vérifie les attributs"""
+
+    def __init__(self, file_name, checks=()):
+        super().__init__(convert_charrefs=True)
+        self.file_name = file_name
+        self.stack = []
+        self.findings = []
+        # Vérifications de document (clés de DOCUMENT_CHECKS), évaluées à la fermeture
+        self.checks = frozenset(checks)
+        self.first_tag = None
+        self.doctype_position = None
+        self.html_lang = None
+        self.title_text = None
+        self.semantic_tags = 0
+
+    def _add(self, position, rule, severity, issue, suggestion, penalty):
+        line, offset = position
+        self.findings.append({
+            'file': self.file_name,
+            'line': line,
+            'column': offset + 1,
+            'severity': severity,
+            'issue': issue,
+            'suggestion': suggestion,
+            'rule': rule,
+            'penalty': penalty,
+        })
+
+    def _check_attributes(self, attrs):
+        position = self.getpos()
+        for name, _ in attrs:
+            if name in MISSPELLED_ATTRIBUTES:
+                correct = MISSPELLED_ATTRIBUTES[name]
+                self._add(position, 'html-misspelled-attribute', 'error',
+                          f'Attribut "{name}" incorrect',
+                          f'Remplacez "{name}" par "{correct}"',
+                          MISSPELLED_ATTRIBUTE_PENALTY)
+            elif name == 'style':
+                self._add(position, 'html-inline-style', 'warning',
+                          'Style inline détecté (attribut style)',
+                          'Déplacez ces déclarations dans style.css à l\'aide d\'une classe',
+                          INLINE_STYLE_PENALTY)
+
+    def _report_unclosed(self, tag, position):
+        self._add(position, 'html-unclosed-tag', 'error',
+                  f'Balise {tag} non fermée',
+                  f'Ajoutez la balise de fermeture </{tag}> correspondante',
+                  UNCLOSED_TAG_PENALTY)
+
+    def _track_document(self, tag, attrs):
+        if self.first_tag is None:
+            self.first_tag = self.getpos()
+        if tag == 'html' and self.html_lang is None:
+            self.html_lang = (self.getpos(), dict(attrs).get('lang') or '')
+        elif tag == 'title' and self.title_text is None:
+            self.title_text = ''
+        elif tag in SEMANTIC_ELEMENTS:
+            self.semantic_tags += 1
+
+    def handle_decl(self, decl):
+        if self.doctype_position is None and decl.lower().startswith('doctype'):
+            self.doctype_position = self.getpos()
+
+    def handle_data(self, data):
+        if self.checks and self.stack and self.stack[-1][0] == 'title':
+            self.title_text += data
+
+    def handle_starttag(self, tag, attrs):
+        self._check_attributes(attrs)
+        if self.checks:
+            self._track_document(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.stack.append((tag, self.getpos()))
+
+    def handle_startendtag(self, tag, attrs):
+        # <balise /> : auto-fermante, rien à empiler
+        self._check_attributes(attrs)
+        if self.checks:
+            self._track_document(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag in VOID_ELEMENTS:
+            return
+
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index][0] == tag:
+                break
+        else:
+            self._add(self.getpos(), 'html-stray-end-tag', 'error',
+                      f'Balise fermante </{tag}> sans ouverture correspondante',
+                      f'Supprimez </{tag}> ou ajoutez la balise ouvrante <{tag}> correspondante',
+                      STRAY_END_TAG_PENALTY)
+            return
+
+        # Les éléments ouverts au-dessus de la balise fermée n'ont jamais été fermés
+        for open_tag, position in self.stack[index + 1:]:
+            if open_tag not in OPTIONAL_END_TAGS:
+                self._report_unclosed(open_tag, position)
+        del self.stack[index:]
+
+    def close(self):
+        super().close()
+        for open_tag, position in self.stack:
+            if open_tag not in OPTIONAL_END_TAGS:
+                self._report_unclosed(open_tag, position)
+        self.stack = []
+        if self.checks:
+            self._check_document()
+        self.findings.sort(key=lambda finding: (finding['line'], finding['column']))
+
+    def _check_document(self):
+        start = (1, 0)
+        first_tag = self.first_tag or start
+        if 'doctype' in self.checks and (self.doctype_position is None or self.doctype_position > first_tag):
+            self._add(first_tag, 'html-missing-doctype', 'error',
+                      'DOCTYPE manquant avant la première balise',
+                      'Ajoutez <!DOCTYPE html> en première ligne du fichier',
+                      MISSING_DOCTYPE_PENALTY)
+        if 'lang' in self.checks and not (self.html_lang and self.html_lang[1].strip()):
+            self._add(self.html_lang[0] if self.html_lang else start, 'html-missing-lang', 'warning',
+                      'Langue de la page non déclarée (attribut lang de <html>)',
+                      'Ajoutez lang="fr" à la balise <html> pour l\'accessibilité et le référencement',
+                      MISSING_LANG_PENALTY)
+        if 'title' in self.checks and not (self.title_text or '').strip():
+            self._add(start, 'html-missing-title', 'warning',
+                      'Titre de la page (<title>) manquant ou vide',
+                      'Ajoutez dans <head> un <title> décrivant le contenu de la page',
+                      MISSING_TITLE_PENALTY)
+        if 'semantic_tags' in self.checks and self.first_tag and not self.semantic_tags:
+            self._add(start, 'html-no-semantic-tags', 'warning',
+                      'Aucune balise sémantique (header, nav, main, section, article, aside, footer)',
+                      'Structurez la page avec <header>, <main> et <footer> plutôt qu\'avec des <div> génériques',
+                      NO_SEMANTIC_TAGS_PENALTY)
+
+
+def analyze_html_file(path, file_name=None, chunk_size=CHUNK_SIZE, checks=()):
+    """Analyse un fichier HTML par blocs et retourne la liste des problèmes
+
+    `checks` active des vérifications de document (DOCUMENT_CHECKS) selon le
+    profil d'exercice.
+    """
+    analyzer = HTMLStructureAnalyzer(file_name or path, checks)
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        while True:
+            chunk = read_block(f, chunk_size)
+            if not chunk:
+                break
+            analyzer.feed(chunk)
+    analyzer.close()
+    return analyzer.findings
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Validation HTML hors ligne (remplace l'aller-retour vers validator.w3.org).
+
+Couvre les erreurs de conformité les plus fréquentes dans les exercices :
+DOCTYPE, balises non fermées ou orphelines, imbrications interdites,
+attributs obligatoires, identifiants dupliqués, éléments et attributs
+obsolètes. Le résultat alimente directement HTML_SCORE, ERROR_COUNT et
+HTML_ERRORS : déterministe, sans réseau, en quelques millisecondes.
+
+Seules les erreurs retirent des points. L'absence de lang sur <html> reste
+un avertissement, comme sur validator.w3.org (l'analyse locale la note à
+part via html_analyzer).
+
+Usage :
+    python3 .github/scripts/html_validator.py index.html --max-score 3
+"""
+
+import sys
+import argparse
+
+from github_actions import write_github_output
+from html_analyzer import CHUNK_SIZE, OPTIONAL_END_TAGS, HTMLStructureAnalyzer
+from streaming import read_block
+
+MAX_REPORTED_ERRORS = 5
+
+# Avertissement de validator.w3.org : ne compte pas dans HTML_SCORE
+MISSING_LANG_WARNING_PENALTY = 0
+
+OBSOLETE_ELEMENTS = frozenset({
+    'acronym', 'applet', 'basefont', 'big', 'blink', 'center', 'dir', 'font',
+    'frame', 'frameset', 'isindex', 'listing', 'marquee', 'nobr', 'noframes',
+    'plaintext', 'spacer', 'strike', 'tt', 'xmp',
+})
+
+OBSOLETE_ATTRIBUTES = frozenset({
+    'align', 'bgcolor', 'background', 'border', 'cellpadding', 'cellspacing',
+    'valign', 'hspace', 'vspace', 'link', 'vlink', 'alink', 'text',
+})
+
+# Attributs sans lesquels l'élément n'est pas conforme
+REQUIRED_ATTRIBUTES = {
+    'img': ('src', 'alt'),
+    'link': ('rel', 'href'),
+    'area': ('alt',),
+    'optgroup': ('label',),
+}
+
+# Éléments de type bloc interdits à l'intérieur d'un paragraphe
+BLOCK_ELEMENTS = frozenset({
+    'address', 'article', 'aside', 'blockquote', 'details', 'div', 'dl',
+    'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3',
+    'h4', 'h5', 'h6', 'header', 'hr', 'main', 'menu', 'nav', 'ol', 'p',
+    'pre', 'section', 'table', 'ul',
+})
+
+INTERACTIVE_ELEMENTS = frozenset({'a', 'button'})
+
+# Parents autorisés pour certains éléments
+ALLOWED_PARENTS = {
+    'li': frozenset({'ul', 'ol', 'menu'}),
+    'dt': frozenset({'dl', 'div'}),
+    'dd': frozenset({'dl', 'div'}),
+    'tr': frozenset({'table', 'thead', 'tbody', 'tfoot'}),
+    'td': frozenset({'tr'}),
+    'th': frozenset({'tr'}),
+}
+
+# Balises ouvrantes qui ferment implicitement un élément ouvert (HTML5) :
+# balise -> (éléments fermés, éléments où la recherche s'arrête)
+TABLE_SECTIONS = frozenset({'thead', 'tbody', 'tfoot'})
+IMPLIED_END_TAGS = {
+    'li': (frozenset({'li'}), frozenset({'ul', 'ol', 'menu'})),
+    'dt': (frozenset({'dt', 'dd'}), frozenset({'dl'})),
+    'dd': (frozenset({'dt', 'dd'}), frozenset({'dl'})),
+    'td': (frozenset({'td', 'th'}), frozenset({'tr', 'table'})),
+    'th': (frozenset({'td', 'th'}), frozenset({'tr', 'table'})),
+    'tr': (frozenset({'tr', 'td', 'th'}), TABLE_SECTIONS | {'table'}),
+    'thead': (TABLE_SECTIONS | {'tr', 'td', 'th'}, frozenset({'table'})),
+    'tbody': (TABLE_SECTIONS | {'tr', 'td', 'th'}, frozenset({'table'})),
+    'tfoot': (TABLE_SECTIONS | {'tr', 'td', 'th'}, frozenset({'table'})),
+    'option': (frozenset({'option'}), frozenset({'select', 'datalist', 'optgroup'})),
+    'optgroup': (frozenset({'option', 'optgroup'}), frozenset({'select', 'datalist'})),
+}
+# Un élément de type bloc ferme le paragraphe ouvert
+PARAGRAPH_END = (frozenset({'p'}), frozenset())
+
+
+class HTMLValidator(HTMLStructureAnalyzer):
+    """Validateur de conformité construit sur l'analyse incrémentale des balises"""
+
+    def __init__(self, file_name):
+        super().__init__(file_name)
+        self.seen_doctype = False
+        self.doctype_reported = False
+        self.seen_title = False
+        self.ids = {}
+        # Bloc qui a fermé implicitement un <p> ouvert : (balise, position)
+        self.paragraph_break = None
+
+    def _error(self, rule, message, suggestion, position=None):
+        self._add(position or self.getpos(), rule, 'error', message, suggestion, 1)
+
+    def handle_decl(self, decl):
+        if decl.lower().startswith('doctype'):
+            self.seen_doctype = True
+
+    def _close_implied(self, tag):
+        """Dépile les éléments que la balise ouvrante ferme implicitement (<li>a<li>b, <p>a<p>b)"""
+        closes, limits = IMPLIED_END_TAGS.get(tag) or (PARAGRAPH_END if tag in BLOCK_ELEMENTS else (None, None))
+        if closes is None:
+            return
+        closed_from = None
+        for index in range(len(self.stack) - 1, -1, -1):
+            open_tag = self.stack[index][0]
+            if open_tag in closes:
+                closed_from = index
+            elif open_tag in limits or open_tag not in OPTIONAL_END_TAGS:
+                break
+        if closed_from is not None:
+            del self.stack[closed_from:]
+
+    def _validate_start(self, tag, attrs):
+        # <p> ouvert avant les fermetures implicites : le bloc le ferme (<p>a<div>),
+        # sauf derrière un élément en ligne (<p><span><div>), ce qui est interdit
+        paragraph_open = tag in BLOCK_ELEMENTS and any(open_tag == 'p' for open_tag, _ in self.stack)
+        self._close_implied(tag)
+        if tag == 'p':
+            self.paragraph_break = None
+        elif paragraph_open:
+            self.paragraph_break = (tag, self.getpos())
+        if not self.seen_doctype and not self.doctype_reported:
+            self.doctype_reported = True
+            self._error('html-missing-doctype',
+                        'DOCTYPE manquant avant la première balise',
+                        'Ajoutez <!DOCTYPE html> en première ligne du fichier')
+
+        names = {name for name, _ in attrs}
+
+        if tag in OBSOLETE_ELEMENTS:
+            self._error('html-obsolete-element',
+                        f'L\'élément <{tag}> est obsolète',
+                        'Utilisez un élément sémantique et mettez en forme avec CSS')
+        for name in sorted(names & OBSOLETE_ATTRIBUTES):
+            if name == 'border' and tag == 'table':
+                continue
+            self._error('html-obsolete-attribute',
+                        f'L\'attribut {name} de <{tag}> est obsolète',
+                        'Supprimez cet attribut et utilisez une propriété CSS')
+
+        for required in REQUIRED_ATTRIBUTES.get(tag, ()):
+            if required not in names:
+                self._error('html-missing-attribute',
+                            f'Attribut obligatoire {required} manquant sur <{tag}>',
+                            f'Ajoutez l\'attribut {required} à la balise <{tag}>')
+
+        for name, value in attrs:
+            if name == 'id' and value:
+                if value in self.ids:
+                    first_line = self.ids[value][0]
+                    self._error('html-duplicate-id',
+                                f'Identifiant "{value}" dupliqué (déjà utilisé ligne {first_line})',
+                                'Chaque id doit être unique dans la page : utilisez une classe pour les éléments répétés')
+                else:
+                    self.ids[value] = self.getpos()
+
+        open_tags = [open_tag for open_tag, _ in self.stack]
+        parent = open_tags[-1] if open_tags else None
+
+        if paragraph_open and 'p' in open_tags:
+            self.paragraph_break = None
+            self._paragraph_nesting_error(tag)
+        if tag in INTERACTIVE_ELEMENTS:
+            ancestor = next((t for t in reversed(open_tags) if t in INTERACTIVE_ELEMENTS), None)
+            if ancestor:
+                self._error('html-invalid-nesting',
+                            f'Élément interactif <{tag}> interdit à l\'intérieur de <{ancestor}>',
+                            'Les liens et boutons ne peuvent pas être imbriqués')
+        allowed = ALLOWED_PARENTS.get(tag)
+        if allowed is not None and parent not in allowed:
+            self._error('html-invalid-nesting',
+                        f'Élément <{tag}> interdit comme enfant de <{parent or "document"}>',
+                        f'Placez <{tag}> dans un élément {" / ".join(f"<{p}>" for p in sorted(allowed))}')
+
+        if tag == 'title':
+            self.seen_title = True
+        elif tag == 'html' and 'lang' not in names:
+            self._add(self.getpos(), 'html-missing-lang', 'warning',
+                      'Attribut lang manquant sur <html>',
+                      'Ajoutez lang="fr" à la balise <html> pour l\'accessibilité', MISSING_LANG_WARNING_PENALTY)
+
+    def _paragraph_nesting_error(self, tag, position=None):
+        self._error('html-invalid-nesting',
+                    f'Élément <{tag}> interdit à l\'intérieur de <p>',
+                    f'Fermez le paragraphe avant <{tag}> ou remplacez <p> par <div>',
+                    position)
+
+    def handle_endtag(self, tag):
+        # </p> après un bloc qui a fermé le paragraphe : le bloc devait être dedans
+        if tag == 'p' and self.paragraph_break and all(open_tag != 'p' for open_tag, _ in self.stack):
+            self._paragraph_nesting_error(*self.paragraph_break)
+            self.paragraph_break = None
+            return
+        super().handle_endtag(tag)
+
+    def handle_starttag(self, tag, attrs):
+        self._validate_start(tag, attrs)
+        super().handle_starttag(tag, attrs)
+
+    def handle_startendtag(self, tag, attrs):
+        self._validate_start(tag, attrs)
+        super().handle_startendtag(tag, attrs)
+
+    def close(self):
+        super().close()
+        if not self.seen_title:
+            self._error('html-missing-title',
+                        'Élément <title> manquant dans <head>',
+                        'Ajoutez un <title> décrivant la page dans <head>',
+                        position=(1, 0))
+        self.findings.sort(key=lambda finding: (finding['line'], finding['column']))
+
+
+def validate_html_file(path, file_name=None, chunk_size=CHUNK_SIZE):
+    """Valide un fichier HTML et retourne la liste des messages (erreurs et avertissements)"""
+    validator = HTMLValidator(file_name or path)
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        while True:
+            chunk = read_block(f, chunk_size)
+            if not chunk:
+                break
+            validator.feed(chunk)
+    validator.close()
+    return validator.findings
+
+
+def score_validation(messages, max_score):
+    """Score HTML (max - nombre d'erreurs) et liste des premières erreurs"""
+    errors = [message for message in messages if message['severity'] == 'error']
+    html_errors = '\n'.join(
+        f"❌ Ligne {error['line']}: {error['issue']}" for error in errors[:MAX_REPORTED_ERRORS]
+    )
+    return {
+        'html_score': max(0, max_score - len(errors)),
+        'error_count': len(errors),
+        'html_errors': html_errors,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Validation HTML hors ligne')
+    parser.add_argument('html_file', help='Fichier HTML à valider')
+    parser.add_argument('--max-score', type=int, default=10, help='Score HTML maximum')
+    args = parser.parse_args(argv)
+
+    messages = validate_html_file(args.html_file)
+    result = score_validation(messages, args.max_score)
+
+    write_github_output({
+        'ERROR_COUNT': result['error_count'],
+        'HTML_SCORE': result['html_score'],
+        'HTML_ERRORS': result['html_errors'],
+    })
+
+    for message in messages:
+        icon = '❌' if message['severity'] == 'error' else '⚠️'
+        print(f"{icon} {args.html_file}:{message['line']}:{message['column']} {message['issue']}")
+    print(f"✅ Validation HTML terminée - Score: {result['html_score']}/{args.max_score} (Erreurs: {result['error_count']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
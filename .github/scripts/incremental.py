@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Réévaluation incrémentale à partir du `git diff` depuis la dernière version évaluée.
+
+L'état précédent (instantané git des fichiers évalués + findings) est
+conservé dans un fichier JSON. L'instantané est un arbre git du contenu
+réellement analysé, modifications non commitées et fichiers non suivis
+compris : la réévaluation suivante compare cet arbre à celui du contenu
+actuel, de sorte qu'un changement n'est jamais appliqué deux fois. Seuls
+les fichiers modifiés sont réanalysés :
+  - CSS et JS (règles ligne par ligne) : seules les lignes modifiées sont relues,
+    les findings des lignes intactes sont conservés et décalés ;
+  - HTML (équilibre des balises, non local à une ligne) : le fichier modifié
+    est réanalysé entièrement.
+Les findings de l'index croisé CSS / HTML dépendent de tous les fichiers :
+ils sont recalculés dès qu'un fichier a changé. Un fichier apparu depuis
+l'évaluation précédente (nouvelle page, fichier
+non suivi par git) est analysé entièrement. Le score est ensuite recalculé
+à partir de l'ensemble fusionné.
+
+Usage :
+    python3 .github/scripts/incremental.py [--state .feedback-state.json] [--since COMMIT]
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+from generate_feedback import analyze_file, analyze_files_locally, summarize_local_findings, render_ai_feedback
+from project_files import discover_files
+from exercise_profile import load_profile
+from selector_index import INDEX_RULES, analyze_project_index
+from rules import COMPILED_RULES, apply_rules_to_file
+from streaming import detect_vendored
+import instrumentation
+
+DEFAULT_STATE_FILE = '.feedback-state.json'
+
+HUNK_HEADER_RE = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+
+
+def parse_unified_diff(diff_text):
+    """Extrait les hunks d'un diff unifié : {fichier: [(old_start, old_count, new_start, new_count)]}
+
+    Un fichier supprimé est associé à None.
+    """
+    changes = {}
+    current = None
+    deleted = False
+    in_header = False
+    for line in diff_text.splitlines():
+        if line.startswith('diff --git '):
+            current = None
+            deleted = False
+            in_header = True
+        elif in_header and line.startswith('deleted file mode'):
+            deleted = True
+        elif in_header and line.startswith('--- '):
+            source = line[4:]
+            if deleted:
+                changes[source[2:] if source.startswith('a/') else source] = None
+        elif in_header and line.startswith('+++ '):
+            target = line[4:]
+            if target != '/dev/null':
+                current = target[2:] if target.startswith('b/') else target
+                changes.setdefault(current, [])
+        elif line.startswith('@@') and current is not None:
+            in_header = False
+            match = HUNK_HEADER_RE.match(line)
+            if match:
+                old_start, old_count, new_start, new_count = match.groups()
+                changes[current].append((
+                    int(old_start), 1 if old_count is None else int(old_count),
+                    int(new_start), 1 if new_count is None else int(new_count),
+                ))
+    return changes
+
+
+def git_diff(since, root='.', until=None):
+    """Diff (sans contexte) entre un commit ou arbre et l'arbre de travail (ou `until`)
+
+    Limité au dossier `root`, chemins relatifs à celui-ci (soumission dans un
+    sous-dossier du dépôt).
+    """
+    result = subprocess.run(
+        ['git', 'diff', '-U0', '--no-color', '--no-renames', '--relative',
+         since, *([until] if until else []), '--'],
+        cwd=root, capture_output=True, text=True, check=True,
+    )
+    return result.stdout
+
+
+def git_snapshot(root, file_names):
+    """Arbre git du contenu actuel des fichiers (suivis ou non, modifications comprises)
+
+    Construit dans un index temporaire : ni l'index ni l'historique de la
+    soumission ne sont modifiés.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, GIT_INDEX_FILE=os.path.join(tmp, 'index'))
+        if file_names:
+            subprocess.run(['git', 'add', '--force', '--', *file_names],
+                           cwd=root, env=env, capture_output=True, check=True)
+        result = subprocess.run(['git', 'write-tree'], cwd=root, env=env, capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def shift_line(line, hunks):
+    """Nouvelle position d'une ligne intacte, ou None si elle a été modifiée/supprimée"""
+    delta = 0
+    for old_start, old_count, new_start, new_count in hunks:
+        if old_count == 0:
+            # Insertion après la ligne old_start
+            if line > old_start:
+                delta += new_count
+            continue
+        old_end = old_start + old_count - 1
+        if old_start <= line <= old_end:
+            return None
+        if line > old_end:
+            delta += new_count - old_count
+    return line + delta
+
+
+def changed_lines(hunks):
+    """Numéros (nouvelle version) des lignes ajoutées ou modifiées"""
+    lines = set()
+    for _, _, new_start, new_count in hunks:
+        lines.update(range(new_start, new_start + new_count))
+    return lines
+
+
+def reevaluate(root, previous_findings, changes, known_files=None, files=None, profile=None):
+    """Fusionne les findings précédents avec ceux des zones modifiées et recalcule le score
+
+    known_files liste les fichiers de l'évaluation précédente (None : tous).
+    """
+    profile = profile or load_profile(root)
+    checks = profile['checks']
+    files = discover_files(root, profile['settings']['files_to_analyze']) if files is None else files
+    findings_by_file = {}
+    previous_index_findings = []
+    for finding in previous_findings:
+        if finding.get('rule') in INDEX_RULES:
+            previous_index_findings.append(finding)
+        else:
+            findings_by_file.setdefault(finding.get('file'), []).append(finding)
+
+    technical_details = []
+    for file_name, file_type in files:
+        path = os.path.join(root, file_name)
+        previous = findings_by_file.get(file_name, [])
+
+        if known_files is not None and file_name not in known_files:
+            technical_details.extend(analyze_file(root, file_name, file_type, checks))
+            continue
+
+        if file_name not in changes:
+            technical_details.extend(previous)
+            continue
+
+        hunks = changes[file_name]
+        if hunks is None or not os.path.exists(path):
+            continue
+
+        was_vendored = any(finding.get('rule') == 'vendored-file' for finding in previous)
+        if file_type == 'html' or was_vendored or detect_vendored(path, file_name):
+            technical_details.extend(analyze_file(root, file_name, file_type, checks))
+            continue
+
+        merged = []
+        for finding in previous:
+            new_line = shift_line(finding.get('line', 0), hunks)
+            if new_line is not None:
+                merged.append(dict(finding, line=new_line))
+
+        merged.extend(apply_rules_to_file(COMPILED_RULES, file_type, path, file_name, changed_lines(hunks)))
+        merged.sort(key=lambda finding: finding.get('line', 0))
+        technical_details.extend(merged)
+
+    file_names = {file_name for file_name, _ in files}
+    unchanged = (known_files is not None and known_files == file_names
+                 and not any(file_name in changes for file_name in file_names))
+    if unchanged:
+        technical_details.extend(previous_index_findings)
+    else:
+        technical_details.extend(analyze_project_index(root, files))
+
+    return summarize_local_findings(technical_details, files, profile['weights'])
+
+
+def load_state(path):
+    """Charge l'état de la dernière évaluation, ou None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def save_state(path, snapshot, result, files):
+    """Enregistre l'instantané évalué, les fichiers analysés et leurs findings"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'snapshot': snapshot,
+            'files': [file_name for file_name, _ in files],
+            'findings': result['technicalDetails'],
+        }, f, ensure_ascii=False)
+
+
+def evaluate_incrementally(root='.', state_path=None, since=None):
+    """Évaluation incrémentale si un état précédent existe, complète sinon"""
+    state_path = state_path or os.path.join(root, DEFAULT_STATE_FILE)
+    state = load_state(state_path)
+    since = since or (state or {}).get('snapshot')
+    profile = load_profile(root)
+    files = discover_files(root, profile['settings']['files_to_analyze'])
+    snapshot = git_snapshot(root, [file_name for file_name, _ in files])
+
+    changes = None
+    if state is not None and since:
+        try:
+            changes = parse_unified_diff(git_diff(since, root, snapshot))
+        except subprocess.CalledProcessError:
+            # Instantané introuvable (dépôt recloné, objets supprimés par git gc)
+            print(f"⚠️ Version {since[:7]} introuvable, analyse complète")
+
+    if changes is None:
+        if state is None or not since:
+            print("🔁 Aucun état précédent, analyse complète")
+        result = analyze_files_locally(root, profile=profile)
+    else:
+        touched = [name for name, _ in files if name in changes]
+        print(f"🔁 Réévaluation incrémentale depuis {since[:7]} ({len(touched)} fichier(s) modifié(s))")
+        known_files = state.get('files')
+        result = reevaluate(root, state.get('findings', []), changes,
+                            set(known_files) if known_files is not None else None, files, profile)
+
+    save_state(state_path, snapshot, result, files)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Réévaluation incrémentale depuis la dernière version évaluée')
+    parser.add_argument('--root', default='.', help='Dossier de la soumission (dépôt git)')
+    parser.add_argument('--state', help=f'Fichier d\'état (défaut: {DEFAULT_STATE_FILE})')
+    parser.add_argument('--since', help='Commit de référence (défaut: instantané de l\'état)')
+    args = parser.parse_args(argv)
+
+    result = evaluate_incrementally(args.root, args.state, args.since)
+    settings = load_profile(args.root)['settings']
+    feedback = render_ai_feedback(
+        result,
+        os.environ.get('REPOSITORY', 'repository'),
+        settings['competence'],
+        settings['niveau'],
+    )
+    with open(os.path.join(args.root, 'FEEDBACK.md'), 'w', encoding='utf-8') as f:
+        f.write(feedback)
+    print(f"✅ FEEDBACK.md mis à jour - Note: {result['score']}/20 ({len(result['technicalDetails'])} problème(s))")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(instrumentation.run(main))
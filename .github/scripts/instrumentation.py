@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Instrumentation de l'évaluation : temps par étape et déclenchements par règle.
+
+Désactivée par défaut (coût nul hors d'un test booléen). Elle s'active par
+variables d'environnement :
+    FEEDBACK_METRICS       fichier JSON des métriques
+    FEEDBACK_METRICS_PROM  fichier texte au format Prometheus (textfile collector)
+    FEEDBACK_PROFILE       fichier de statistiques cProfile (pstats)
+
+Étapes mesurées : lecture des fichiers, analyse locale, lecture de la
+réponse IA, calcul des scores, rendu, écriture. Pour chaque règle : nombre
+de déclenchements et coût cumulé (règles CSS : temps d'un parcours dédié à
+la règle seule, l'analyse normale n'exécutant l'expression d'une règle que
+sur les lignes où le préfiltre commun de littéraux l'a désignée).
+"""
+
+import os
+import json
+import time
+import cProfile
+from contextlib import contextmanager
+
+METRICS_PREFIX = 'feedback'
+
+ENABLED = False
+
+_stages = {}
+_rules = {}
+
+
+def configure(env=None):
+    """Active l'instrumentation si l'une des sorties est demandée"""
+    global ENABLED
+    env = os.environ if env is None else env
+    ENABLED = any(env.get(key) for key in ('FEEDBACK_METRICS', 'FEEDBACK_METRICS_PROM', 'FEEDBACK_PROFILE'))
+    return ENABLED
+
+
+def reset():
+    _stages.clear()
+    _rules.clear()
+
+
+def add_stage_time(name, seconds):
+    entry = _stages.setdefault(name, [0, 0.0])
+    entry[0] += 1
+    entry[1] += seconds
+
+
+@contextmanager
+def stage(name):
+    """Mesure le temps passé dans un bloc (cumulé par nom d'étape)"""
+    if not ENABLED:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_stage_time(name, time.perf_counter() - started)
+
+
+def count_rule_hits(findings):
+    """Comptabilise les déclenchements de règles d'une liste de findings"""
+    for finding in findings:
+        entry = _rules.setdefault(finding.get('rule') or 'unknown', [0, 0.0])
+        entry[0] += 1
+
+
+def add_rule_cost(rule_id, seconds):
+    entry = _rules.setdefault(rule_id, [0, 0.0])
+    entry[1] += seconds
+
+
+def snapshot():
+    """Métriques collectées depuis le dernier reset"""
+    return {
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'stages': {
+            name: {'calls': calls, 'seconds': round(seconds, 6)}
+            for name, (calls, seconds) in _stages.items()
+        },
+        'rules': {
+            rule_id: {'hits': hits, 'seconds': round(seconds, 6)}
+            for rule_id, (hits, seconds) in sorted(_rules.items())
+        },
+    }
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def to_prometheus(metrics, labels=None):
+    """Formate les métriques au format texte Prometheus"""
+    base = ''.join(f',{key}="{_escape_label(value)}"' for key, value in sorted((labels or {}).items()))
+    series = (
+        ('stage_calls_total', 'Nombre de passages par étape', 'stage', metrics['stages'], 'calls'),
+        ('stage_seconds_total', 'Temps cumulé par étape (secondes)', 'stage', metrics['stages'], 'seconds'),
+        ('rule_hits_total', 'Déclenchements par règle', 'rule', metrics['rules'], 'hits'),
+        ('rule_seconds_total', 'Coût cumulé par règle (secondes)', 'rule', metrics['rules'], 'seconds'),
+    )
+    lines = []
+    for suffix, description, label, values, field in series:
+        name = f'{METRICS_PREFIX}_{suffix}'
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} counter')
+        for key, value in values.items():
+            lines.append(f'{name}{{{label}="{_escape_label(key)}"{base}}} {value[field]}')
+    return '\n'.join(lines) + '\n'
+
+
+def _write_atomic(path, content):
+    # Le collecteur textfile ne doit jamais lire un fichier à moitié écrit
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def flush(env=None):
+    """Écrit les métriques dans les fichiers demandés"""
+    env = os.environ if env is None else env
+    if not ENABLED:
+        return None
+
+    metrics = snapshot()
+    json_path = env.get('FEEDBACK_METRICS')
+    prom_path = env.get('FEEDBACK_METRICS_PROM')
+    if json_path:
+        _write_atomic(json_path, json.dumps(metrics, ensure_ascii=False, indent=2) + '\n')
+    if prom_path:
+        _write_atomic(prom_path, to_prometheus(metrics, {'repository': env.get('REPOSITORY', 'repository')}))
+
+    details = ', '.join(f"{name} {entry['seconds'] * 1000:.1f} ms" for name, entry in metrics['stages'].items())
+    print(f"⏱️ Instrumentation: {details or 'aucune étape mesurée'}")
+    return metrics
+
+
+def run(main, env=None):
+    """Exécute un point d'entrée avec instrumentation (et profilage cProfile éventuel)"""
+    env = os.environ if env is None else env
+    configure(env)
+    profile_path = env.get('FEEDBACK_PROFILE')
+    profiler = cProfile.Profile() if profile_path else None
+    try:
+        if profiler:
+            return profiler.runcall(main)
+        return main()
+    finally:
+        if profiler:
+            profiler.dump_stats(profile_path)
+            print(f"📈 Profil cProfile écrit dans {profile_path}")
+        flush(env)
+
+
+configure()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Découverte des fichiers de l'exercice à analyser.
+
+La liste est celle du profil d'exercice compilé : FILES_TO_ANALYZE des
+variables, de .evaluation-config ou du profil EXERCISE_PROFILE, sinon les
+fichiers par défaut. Chaque entrée est un nom de fichier ou un motif glob
+relatif à la soumission (`*.html`, `css/*.css`, `pages/**/*.html`). Le type
+de règles appliqué à un fichier dépend de son extension.
+"""
+
+import os
+import glob
+
+from exercise_profile import load_profile
+
+FILE_TYPES = {
+    '.html': 'html',
+    '.htm': 'html',
+    '.css': 'css',
+    '.js': 'js',
+}
+
+# Dossiers jamais parcourus par les motifs (dépendances, sorties, outillage)
+IGNORED_DIRS = frozenset(('node_modules', '.git', '.github', '.feedback-cache', 'dist', 'build', 'vendor'))
+
+
+def file_type_of(file_name):
+    """Type de règles d'un fichier ('html', 'css', 'js') ou None"""
+    return FILE_TYPES.get(os.path.splitext(file_name)[1].lower())
+
+
+def _is_ignored(relative_path):
+    parts = relative_path.split('/')
+    return any(part in IGNORED_DIRS or part.startswith('.') for part in parts[:-1])
+
+
+def discover_files(root='.', patterns=None):
+    """Fichiers analysables de la soumission : [(chemin relatif, type)] sans doublon"""
+    if patterns is None:
+        patterns = load_profile(root)['settings']['files_to_analyze']
+
+    files = []
+    seen = set()
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, root_dir=root, recursive=True))
+        else:
+            matches = [pattern]
+        for match in matches:
+            relative_path = os.path.normpath(match).replace(os.sep, '/')
+            if relative_path in seen or _is_ignored(relative_path):
+                continue
+            file_type = file_type_of(relative_path)
+            if file_type is None or not os.path.isfile(os.path.join(root, relative_path)):
+                continue
+            seen.add(relative_path)
+            files.append((relative_path, file_type))
+    return files
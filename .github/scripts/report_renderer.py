@@ -0,0 +1,595 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Rendu des rapports FEEDBACK.md à partir de gabarits précompilés.
+
+Les gabarits (parcours IA et parcours par critères, déclinés par NIVEAU)
+sont découpés une seule fois en segments littéraux / champs ; un rapport
+est ensuite assemblé par un unique ''.join des segments remplis, sans
+concaténations successives ni reconstruction des tables à chaque appel.
+"""
+
+from datetime import datetime
+from string import Formatter
+
+SEVERITY_ICONS = {'error': '🚫', 'warning': '⚠️', 'info': 'ℹ️'}
+SEVERITY_TEXT = {'error': 'Erreur', 'warning': 'Attention', 'info': 'Info'}
+
+
+def compile_template(text):
+    """Découpe un gabarit str.format en segments (littéral, champ ou None)"""
+    segments = []
+    for literal, field, _, _ in Formatter().parse(text):
+        segments.append((literal, field))
+    return tuple(segments)
+
+
+def partial_fill(segments, values):
+    """Remplace dans un gabarit compilé les champs connus d'avance (fusionnés au littéral)"""
+    merged = []
+    pending = ''
+    for literal, field in segments:
+        pending += literal
+        if field is None:
+            continue
+        if field in values:
+            pending += str(values[field])
+        else:
+            merged.append((pending, field))
+            pending = ''
+    merged.append((pending, None))
+    return tuple(merged)
+
+
+def fill(segments, values):
+    """Assemble un gabarit compilé en une seule jointure"""
+    parts = []
+    append = parts.append
+    for literal, field in segments:
+        append(literal)
+        if field is not None:
+            append(str(values[field]))
+    return ''.join(parts)
+
+
+# Seuils croissants : l'indice de l'emoji ou du niveau est le nombre de seuils atteints
+AI_TIMESTAMP_FORMAT = "%d/%m/%Y à %H:%M"
+
+SCORE_EMOJI_THRESHOLDS = (10, 12, 15, 18)
+SCORE_EMOJIS = ('💪', '📈', '👍', '🥉', '🏆')
+
+
+def get_score_emoji(score):
+    """Retourne un emoji selon le score"""
+    return SCORE_EMOJIS[sum(1 for threshold in SCORE_EMOJI_THRESHOLDS if score >= threshold)]
+
+
+# ----------------------------------------------------------------------------
+# Parcours IA (analyse IA ou analyse locale au même format)
+# ----------------------------------------------------------------------------
+
+AI_HEADER_TEMPLATE = compile_template("""# 📝 Feedback Automatique Avancé
+
+> **Évaluation générée automatiquement le {timestamp}**
+
+## 👤 Informations
+- **Repository:** {repository}
+- **Compétence évaluée:** {competence}
+- **Niveau:** {niveau}
+- **Status:** ✅ Évaluation IA avancée
+
+---
+
+## 📊 Résultat Global
+
+### Note: {score}/20 {score_emoji}
+
+{summary}
+
+---
+
+## ✅ Points Forts
+
+""")
+
+AI_FOOTER_TEMPLATE = compile_template("""
+
+---
+
+## 📚 Ressources Utiles
+
+- 📖 [MDN Web Docs](https://developer.mozilla.org/fr/) - Documentation complète HTML/CSS/JS
+- 🎓 [freeCodeCamp](https://www.freecodecamp.org/) - Cours gratuits et exercices
+- 💻 [W3Schools](https://www.w3schools.com/) - Tutoriels et références
+- 🔧 [Can I Use](https://caniuse.com/) - Compatibilité des propriétés CSS
+- 🎨 [CSS-Tricks](https://css-tricks.com/) - Astuces et techniques CSS
+
+---
+
+## 🤖 À Propos de cette Évaluation
+
+Cette évaluation a été générée par notre système d'IA pédagogique avancé qui analyse votre code ligne par ligne selon les critères définis pour la compétence "{competence}".
+
+### Prochaines Étapes
+1. 📖 Lisez attentivement les détails techniques ci-dessus
+2. 🔄 Corrigez les erreurs identifiées une par une
+3. 💬 Demandez de l'aide à votre formateur si nécessaire
+4. 🚀 Committez vos corrections et relancez l'évaluation
+
+---
+
+*💡 Cette évaluation personnalisée montre que j'ai vraiment analysé votre code. Chaque conseil est spécifique à votre travail !*
+
+---
+
+<sub>🔄 Généré le: {timestamp} | 🤖 Évaluation IA avancée | 🌐 Powered by GitHub Codespaces</sub>
+""")
+
+NO_STRENGTHS = "- 💪 Continue tes efforts, tu es sur la bonne voie !\n"
+NO_IMPROVEMENTS = "- ✨ Excellent travail, peu d'améliorations nécessaires !\n"
+IMPROVEMENTS_HEADING = "\n---\n\n## 🔧 Axes d'Amélioration\n\n"
+DETAILS_HEADING = "\n---\n\n## 🔍 Détails Techniques\n\n"
+DETAILS_INTRO = "J'ai analysé votre code en détail et identifié **{count} point(s)** spécifique(s) à améliorer :\n\n"
+DETAILS_OUTRO = "> 💡 **Conseil de coach :** Ces points d'amélioration sont là pour vous faire progresser. Chaque correction est une occasion d'apprendre quelque chose de nouveau !\n"
+NO_DETAILS = "✅ **Aucun problème technique majeur détecté !**\n\nVotre code respecte les bonnes pratiques de base. C'est un excellent point de départ !\n"
+RECOMMENDATIONS_HEADING = "\n---\n\n## 💡 Recommandations pour Progresser\n\n"
+NO_RECOMMENDATIONS = "- 📚 Continuer à pratiquer régulièrement\n- 💬 N'hésiter pas à demander de l'aide\n"
+
+
+def _render_details(technical_details, parts):
+    append = parts.append
+    append(DETAILS_INTRO.format(count=len(technical_details)))
+
+    # Grouper par fichier
+    files_details = {}
+    for detail in technical_details:
+        files_details.setdefault(detail.get('file', 'Fichier inconnu'), []).append(detail)
+
+    for file_name, details in files_details.items():
+        append(f"### 📄 **{file_name}**\n\n")
+        for i, detail in enumerate(details, 1):
+            severity = detail.get('severity', 'info')
+            line_info = f" **ligne {detail['line']}**" if detail.get('line') else ''
+            append(f"**{i}.** {SEVERITY_ICONS.get(severity, 'ℹ️')} **{SEVERITY_TEXT.get(severity, 'Info')}**{line_info}\n")
+            append(f"- **Problème identifié :** {detail.get('issue') or 'Non spécifié'}\n")
+            append(f"- **Conseil d'amélioration :** {detail.get('suggestion') or 'Voir la documentation'}\n\n")
+
+    append(DETAILS_OUTRO)
+
+
+def render_ai_report(ai_data, repository, competence, niveau, timestamp=None, progression=None):
+    """Construit le FEEDBACK.md du parcours IA à partir des données d'évaluation"""
+    timestamp = timestamp or datetime.now().strftime(AI_TIMESTAMP_FORMAT)
+    score = ai_data.get('score', 0)
+    summary = ai_data.get('summary', 'Évaluation effectuée avec succès.')
+    if progression:
+        summary = f"{summary}\n\n{progression}"
+
+    parts = [fill(AI_HEADER_TEMPLATE, {
+        'timestamp': timestamp,
+        'repository': repository,
+        'competence': competence,
+        'niveau': niveau,
+        'score': score,
+        'score_emoji': get_score_emoji(score),
+        'summary': summary,
+    })]
+    append = parts.append
+
+    strengths = ai_data.get('strengths', [])
+    if strengths:
+        for strength in strengths:
+            append(f"- {strength}\n")
+    else:
+        append(NO_STRENGTHS)
+
+    append(IMPROVEMENTS_HEADING)
+    improvements = ai_data.get('improvements', [])
+    if improvements:
+        for improvement in improvements:
+            append(f"- {improvement}\n")
+    else:
+        append(NO_IMPROVEMENTS)
+
+    append(DETAILS_HEADING)
+    technical_details = ai_data.get('technicalDetails', [])
+    if technical_details:
+        _render_details(technical_details, parts)
+    else:
+        append(NO_DETAILS)
+
+    append(RECOMMENDATIONS_HEADING)
+    recommendations = ai_data.get('recommendations', [])
+    if recommendations:
+        for rec in recommendations:
+            append(f"- {rec}\n")
+    else:
+        append(NO_RECOMMENDATIONS)
+
+    append(fill(AI_FOOTER_TEMPLATE, {'competence': competence, 'timestamp': timestamp}))
+    return ''.join(parts)
+
+
+# ----------------------------------------------------------------------------
+# Parcours par critères du barème (fallback du workflow)
+# ----------------------------------------------------------------------------
+
+CRITERIA_TEMPLATE = compile_template("""# 🎯 Rapport d'Évaluation Pédagogique Contextuelle
+
+> **Analyse automatique contextuelle générée le {generated_at_long}**
+
+## � Contexte de l'Évaluation
+
+- **Repository:** `{repository}`
+- **Compétence évaluée:** {competence}
+- **Niveau de l'étudiant:** **{niveau}**
+- **Fichiers analysés:** `{files}`
+
+---
+
+## 🏆 Résultat Global
+
+### 📊 Note Finale: {total_score}/{total_max_score} points {status_emoji} **{status_message}** ({global_level})
+
+{contextual_message}
+
+---
+
+## 📈 Analyse Détaillée par Critère du Barème
+
+### 🏗️ **Critère 1: Structure et Organisation du CSS**
+{structure_analysis}
+### � **Critère 2: Typographie et Couleurs** 
+{typography_analysis}
+
+
+
+## � Points d'Amélioration Détectés
+
+### **Erreurs Critiques à Corriger**
+
+{html_errors_heading}
+{html_errors}
+
+{css_errors_heading}
+{css_errors}
+
+
+## � Plan d'Action Personnalisé
+
+
+{recommendations}
+
+### **Ressources Ciblées selon votre Profil {niveau}:**
+
+{beginner_heading}
+{beginner_validator}
+{beginner_variables}
+{beginner_units}
+
+{intermediate_heading}
+{intermediate_grid}
+{intermediate_pseudo}
+{intermediate_bem}
+
+{advanced_heading}
+{advanced_architecture}
+{advanced_performance}
+{advanced_houdini}
+
+---
+
+## 📊 Détail du Barème Appliqué
+
+| **Critère d'Évaluation** | **Score Obtenu** | **Score Maximum** | **Niveau Atteint** |
+|---------------------------|------------------|-------------------|-------------------|
+| **Structure et Organisation CSS** | {structure_score}/3 | 3 points | {structure_level} |
+| **Typographie et Couleurs** | {typography_score}/3 | 3 points | {typography_level} |
+| **Bonnes Pratiques CSS** | {practices_score}/3 | 3 points | {practices_level} |
+| **Validation et Tests** | {html_score}/{html_max_score} | {html_max_score} points | {validation_level} |
+| **TOTAL GÉNÉRAL** | **{total_score}/{total_max_score}** | **{total_max_score} points** | **{global_level}** |
+
+---
+
+## 🎨 Code d'Exemple pour Améliorer votre Score
+
+### **Si Structure < 3 points:**
+{structure_example}
+
+### **Si Typographie < 3 points:**
+{typography_example}
+
+### **Si Pratiques < 3 points:**
+{practices_example}
+
+---
+
+## 🎓 Message Pédagogique Final
+
+**Bilan contextuel:** {contextual_message}
+
+**Votre progression:** {progression}
+
+**Prochaine étape:** {next_step}
+
+---
+
+<sub>🤖 **Analyse contextuelle automatisée** | 📊 Barème: Structure(3) + Typo(3) + Pratiques(3) + Validation({html_max_score}) = {total_max_score}pts | 🎯 Niveau: {niveau} | ⚡ Générée le {generated_at_short}</sub>
+""")
+
+# Contextes spécifiques selon le barème
+STRUCTURE_CONTEXT = {
+    'excellent': "Code bien structuré, variables CSS utilisées, commentaires présents",
+    'good': "Structure correcte mais perfectible, quelques optimisations possibles",
+    'basic': "Organisation confuse, sélecteurs redondants, manque de variables",
+    'insufficient': "Styles désorganisés, sélecteurs complexes, aucune variable CSS"
+}
+
+TYPOGRAPHY_CONTEXT = {
+    'excellent': "Unités relatives privilégiées, typographie cohérente, couleurs hexadécimales",
+    'good': "Bonne base typographique, quelques unités fixes à convertir",
+    'basic': "Typographie basique, mélange d'unités, couleurs incohérentes",
+    'insufficient': "Typographie négligée, unités fixes prédominantes, couleurs désorganisées"
+}
+
+PRACTICES_CONTEXT = {
+    'excellent': "Classes réutilisables, pseudo-classes maîtrisées, séparation parfaite",
+    'good': "Bonnes pratiques appliquées, quelques répétitions à optimiser",
+    'basic': "Pratiques basiques, code fonctionnel mais peu maintenable",
+    'insufficient': "Mauvaises pratiques, code difficile à maintenir, styles mélangés"
+}
+
+VALIDATION_CONTEXT = {
+    'excellent': "Code validé W3C sans erreurs, compatible multi-navigateurs",
+    'good': "Validation correcte avec avertissements mineurs seulement",
+    'basic': "Quelques erreurs de validation, problèmes d'affichage possibles",
+    'insufficient': "Nombreuses erreurs, code non testé, incompatibilités"
+}
+
+# Ressources ciblées : seules celles du niveau de l'étudiant sont affichées
+RESOURCE_FIELDS = {
+    'Débutant': {
+        'beginner_heading': "#### 📚 **Pour Débutants:**",
+        'beginner_validator': "- [Validateur W3C HTML](https://validator.w3.org/) - Vérifiez votre code",
+        'beginner_variables': "- [CSS Variables Guide](https://developer.mozilla.org/fr/docs/Web/CSS/Using_CSS_custom_properties) - Organisez vos couleurs",
+        'beginner_units': "- [Unités CSS](https://developer.mozilla.org/fr/docs/Learn/CSS/Building_blocks/Values_and_units) - rem vs px",
+    },
+    'Intermédiaire': {
+        'intermediate_heading': "#### � **Pour Niveau Intermédiaire:**",
+        'intermediate_grid': "- [CSS Grid Generator](https://cssgrid-generator.netlify.app/) - Layouts avancés",
+        'intermediate_pseudo': "- [Pseudo-classes CSS](https://developer.mozilla.org/fr/docs/Web/CSS/Pseudo-classes) - Interactivité",
+        'intermediate_bem': "- [BEM Methodology](https://getbem.com/) - Classes réutilisables",
+    },
+    'Avancé': {
+        'advanced_heading': "#### 🏆 **Pour Niveau Avancé:**",
+        'advanced_architecture': "- [CSS Architecture](https://maintainablecss.com/) - Code professionnel",
+        'advanced_performance': "- [Performance CSS](https://web.dev/fast/#css) - Optimisation",
+        'advanced_houdini': "- [CSS Houdini](https://developer.mozilla.org/fr/docs/Web/Houdini) - Techniques avancées",
+    },
+}
+
+STRUCTURE_EXAMPLE = '''```css
+/* Ajoutez des variables CSS organisées */
+:root {
+  /* Couleurs principales */
+  --primary-color: #667eea;
+  --secondary-color: #764ba2;
+  --text-color: #333333;
+  
+  /* Espacement */
+  --spacing-sm: 0.5rem;
+  --spacing-md: 1rem;
+  --spacing-lg: 2rem;
+}
+
+/* Utilisez vos variables */
+.header {
+  background: var(--primary-color);
+  padding: var(--spacing-md);
+}
+```'''
+
+TYPOGRAPHY_EXAMPLE = '''```css
+/* Utilisez des unités relatives */
+body {
+  font-size: 1rem;        /* Au lieu de 16px */
+  line-height: 1.6;       /* Proportion relative */
+  margin: 2rem auto;      /* Au lieu de 32px */
+}
+
+h1 {
+  font-size: 2.5rem;      /* Au lieu de 40px */
+  margin-bottom: 1.5rem;  /* Au lieu de 24px */
+}
+```'''
+
+PRACTICES_EXAMPLE = '''```css
+/* Classes réutilisables */
+.btn {
+  padding: var(--spacing-sm) var(--spacing-md);
+  border: none;
+  border-radius: 4px;
+  cursor: pointer;
+}
+
+.btn:hover {
+  transform: translateY(-2px);
+  box-shadow: 0 4px 8px rgba(0,0,0,0.2);
+}
+
+.btn--primary { background: var(--primary-color); }
+.btn--secondary { background: var(--secondary-color); }
+```'''
+
+# (excellent, bon, à corriger) selon la position du total par rapport aux seuils
+CONTEXTUAL_MESSAGES = {
+    'Débutant': (
+        "🌟 Remarquable pour un niveau débutant ! Vous maîtrisez déjà les concepts avancés.",
+        "👏 Très bon travail pour un débutant ! Quelques corrections et vous excellerez.",
+        "💪 Bon début ! Concentrez-vous sur les bases: validation W3C et organisation CSS.",
+    ),
+    'Intermédiaire': (
+        "🚀 Excellent niveau intermédiaire ! Prêt pour des défis plus complexes.",
+        "📈 Bonnes bases intermédiaires. Perfectionnez les détails pour exceller.",
+        "🎯 Niveau intermédiaire à consolider. Focalisez sur les bonnes pratiques CSS.",
+    ),
+    'Avancé': (
+        "🏆 Niveau expert confirmé ! Votre code respecte les standards professionnels.",
+        "💼 Bon niveau avancé. Peaufinez les détails pour un code professionnel.",
+        "📚 Niveau avancé à renforcer. Approfondissez l'organisation et les pratiques.",
+    ),
+}
+
+GLOBAL_STATUS = (
+    ("🎉", "Excellent travail !", "Avancé"),
+    ("👍", "Bon travail avec corrections à apporter", "Compétent"),
+    ("⚠️", "Travail à corriger", "Basique"),
+)
+
+PROGRESSION_MESSAGES = (
+    "🔥 Vous excellez dans les critères techniques !",
+    "📈 Vous progressez bien, quelques ajustements suffisent !",
+    "💪 Bon départ, focalisez sur les bases pour progresser rapidement !",
+)
+
+NEXT_STEP_MESSAGES = (
+    "Explorez les techniques CSS avancées (animations, grid layout)",
+    "Perfectionnez l'organisation du code et les bonnes pratiques",
+    "Maîtrisez d'abord la validation W3C et l'organisation de base",
+)
+
+_criteria_templates = {}
+
+
+def get_criteria_template(niveau):
+    """Gabarit du parcours par critères, spécialisé (et mis en cache) pour un niveau"""
+    template = _criteria_templates.get(niveau)
+    if template is None:
+        resources = {field: '' for fields in RESOURCE_FIELDS.values() for field in fields}
+        resources.update(RESOURCE_FIELDS.get(niveau, {}))
+        template = partial_fill(CRITERIA_TEMPLATE, resources)
+        _criteria_templates[niveau] = template
+    return template
+
+
+def set_criteria_template(niveau, template):
+    """Installe un gabarit déjà spécialisé (profil d'exercice compilé)"""
+    _criteria_templates[niveau] = template
+
+
+def get_criterium_analysis(score, max_score, criterium_name, context):
+    """Analyse contextuelle d'un critère selon son pourcentage de réussite"""
+    percentage = (score / max_score * 100) if max_score > 0 else 0
+    if percentage >= 85:
+        return f"✅ **{criterium_name}** ({score}/{max_score}): **Avancé** - {context['excellent']}"
+    elif percentage >= 67:
+        return f"🟡 **{criterium_name}** ({score}/{max_score}): **Compétent** - {context['good']}"
+    elif percentage >= 33:
+        return f"🟠 **{criterium_name}** ({score}/{max_score}): **Basique** - {context['basic']}"
+    else:
+        return f"❌ **{criterium_name}** ({score}/{max_score}): **Insuffisant** - {context['insufficient']}"
+
+
+LEVELS = ("❌ Insuffisant", "⚠️ Basique", "👍 Compétent", "🎉 Avancé")
+CRITERION_LEVEL_SCORES = (1, 2, 3)
+VALIDATION_LEVEL_RATIOS = (0.5, 0.7, 0.9)
+
+
+def get_criterion_level(score):
+    """Niveau atteint pour un critère noté sur 3 points"""
+    return LEVELS[sum(1 for threshold in CRITERION_LEVEL_SCORES if score >= threshold)]
+
+
+def get_validation_level(score, max_score):
+    """Niveau atteint pour le critère de validation (barème variable)"""
+    return LEVELS[sum(1 for ratio in VALIDATION_LEVEL_RATIOS if score >= max_score * ratio)]
+
+
+def get_recommendations(structure_score, typography_score, practices_score, html_score):
+    """Recommandations spécifiques selon les scores"""
+    recommendations = []
+    if structure_score < 3:
+        recommendations.append("🔧 **Structure**: Organisez votre CSS avec des variables (`--primary-color`) et des commentaires sections")
+    if typography_score < 2:
+        recommendations.append("📝 **Typographie**: Utilisez des unités relatives (rem, em, %) plutôt que px")
+    if practices_score < 2:
+        recommendations.append("⚡ **Pratiques**: Créez des classes réutilisables et utilisez les pseudo-classes (:hover, :focus)")
+    if html_score < 2:
+        recommendations.append("🔴 **Validation HTML**: Corrigez les erreurs W3C pour garantir la compatibilité")
+    if not recommendations:
+        recommendations.append("🎯 **Optimisation**: Votre code est solide, explorez les techniques avancées (CSS Grid, animations)")
+    return recommendations
+
+
+def get_threshold_scores(total_max_score, excellent_threshold, good_threshold):
+    """Seuils adaptatifs en points à partir des pourcentages EXCELLENT_THRESHOLD / GOOD_THRESHOLD"""
+    return (total_max_score * excellent_threshold) // 100, (total_max_score * good_threshold) // 100
+
+
+def get_band(total_score, excellent_score, good_score):
+    """Position du total par rapport aux seuils : 0 excellent, 1 bon, 2 à corriger"""
+    if total_score >= excellent_score:
+        return 0
+    elif total_score >= good_score:
+        return 1
+    return 2
+
+
+def render_criteria_report(scores, niveau, repository, competence, files, html_errors='', css_errors='', error_count='0', now=None,
+                           progression=None):
+    """Construit le FEEDBACK.md du parcours par critères
+
+    scores contient html_score, html_max_score, total_score, total_max_score,
+    excellent_score, good_score, structure_score, typography_score et
+    practices_score (entiers).
+    """
+    now = now or datetime.now()
+    structure_score = scores['structure_score']
+    typography_score = scores['typography_score']
+    practices_score = scores['practices_score']
+    html_score = scores['html_score']
+    html_max_score = scores['html_max_score']
+    total_score = scores['total_score']
+
+    band = get_band(total_score, scores['excellent_score'], scores['good_score'])
+    status_emoji, status_message, global_level = GLOBAL_STATUS[band]
+    contextual_message = CONTEXTUAL_MESSAGES.get(niveau, CONTEXTUAL_MESSAGES['Avancé'])[band]
+    if progression:
+        contextual_message = f"{contextual_message}\n\n{progression}"
+    has_html_errors = error_count != '0'
+
+    return fill(get_criteria_template(niveau), {
+        'generated_at_long': now.strftime('%d %B %Y à %H:%M'),
+        'generated_at_short': now.strftime('%d/%m/%Y %H:%M'),
+        'repository': repository,
+        'competence': competence.replace('developement web', 'Développement Web').strip(),
+        'niveau': niveau,
+        'files': files,
+        'total_score': total_score,
+        'total_max_score': scores['total_max_score'],
+        'status_emoji': status_emoji,
+        'status_message': status_message,
+        'global_level': global_level,
+        'contextual_message': contextual_message,
+        'structure_analysis': get_criterium_analysis(structure_score, 3, "Structure et Organisation CSS", STRUCTURE_CONTEXT),
+        'typography_analysis': get_criterium_analysis(typography_score, 3, "Typographie et Couleurs", TYPOGRAPHY_CONTEXT),
+        'html_errors_heading': "#### 🔴 **Validation W3C HTML**" if has_html_errors else "",
+        'html_errors': html_errors if has_html_errors else "✅ **Validation HTML**: Code validé sans erreurs critiques",
+        'css_errors_heading': "#### � **Analyse CSS Contextuelle**" if css_errors else "",
+        'css_errors': css_errors if css_errors else "✅ **Analyse CSS**: Code respectant les critères du barème",
+        'recommendations': '\n'.join(f"- {rec}" for rec in get_recommendations(structure_score, typography_score, practices_score, html_score)),
+        'structure_score': structure_score,
+        'structure_level': get_criterion_level(structure_score),
+        'typography_score': typography_score,
+        'typography_level': get_criterion_level(typography_score),
+        'practices_score': practices_score,
+        'practices_level': get_criterion_level(practices_score),
+        'html_score': html_score,
+        'html_max_score': html_max_score,
+        'validation_level': get_validation_level(html_score, html_max_score),
+        'structure_example': STRUCTURE_EXAMPLE if structure_score < 3 else "✅ **Structure excellente** - Continuez ainsi !",
+        'typography_example': TYPOGRAPHY_EXAMPLE if typography_score < 3 else "✅ **Typographie excellente** - Maîtrise des unités relatives !",
+        'practices_example': PRACTICES_EXAMPLE if practices_score < 3 else "✅ **Pratiques excellentes** - Code maintenable et réutilisable !",
+        'progression': PROGRESSION_MESSAGES[band],
+        'next_step': NEXT_STEP_MESSAGES[band],
+    })
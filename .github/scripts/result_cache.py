@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Cache des résultats d'évaluation adressé par contenu.
+
+La clé est l'empreinte SHA-256 des fichiers évalués, de la configuration de
+notation (scores maximum, seuils, niveau, contenu de .evaluation-config) et
+des scripts d'évaluation eux-mêmes. Une soumission inchangée (commit README,
+commit du bot FEEDBACK.md...) retrouve ainsi son feedback sans aucun appel
+réseau. Les entrées sont évincées par ancienneté d'utilisation (LRU) au-delà
+d'un nombre d'entrées ou d'une taille totale.
+
+Le cache est actif lorsque FEEDBACK_CACHE_DIR est défini.
+
+Usage (workflow) :
+    python3 .github/scripts/result_cache.py lookup
+"""
+
+import os
+import sys
+import json
+import time
+import glob
+import hashlib
+import argparse
+
+from github_actions import write_github_output
+from project_files import discover_files
+from exercise_profile import compute_profile_hash, load_profile
+
+CACHE_FORMAT_VERSION = 2
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Variables de configuration qui influencent la note ou le rendu
+CONFIG_ENV_KEYS = (
+    'HTML_MAX_SCORE', 'CSS_MAX_SCORE', 'TOTAL_MAX_SCORE',
+    'EXCELLENT_THRESHOLD', 'GOOD_THRESHOLD', 'NIVEAU',
+    'COMPETENCE', 'BAREME', 'FILES', 'REPOSITORY', 'CSS_STRICT_METRICS',
+)
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _hash_file(digest, path):
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+    except FileNotFoundError:
+        digest.update(b'<absent>')
+
+
+def compute_cache_key(root='.', env=None, config_path=None):
+    """Calcule la clé de cache d'une soumission (SHA-256 hexadécimal)"""
+    env = os.environ if env is None else env
+    digest = hashlib.sha256()
+    digest.update(f'format:{CACHE_FORMAT_VERSION}\0'.encode())
+
+    # Fichiers désignés par les motifs du profil : une page ajoutée change aussi la clé
+    patterns = load_profile(root, env)['settings']['files_to_analyze']
+    names = {name for name, _ in discover_files(root, patterns)}
+    names.update(pattern for pattern in patterns if not glob.has_magic(pattern))
+    for name in sorted(names):
+        digest.update(f'file:{name}\0'.encode())
+        _hash_file(digest, os.path.join(root, name))
+
+    for key in CONFIG_ENV_KEYS:
+        digest.update(f'env:{key}={env.get(key, "")}\0'.encode())
+
+    digest.update(b'config\0')
+    _hash_file(digest, config_path or os.path.join(root, '.evaluation-config'))
+    # Profil d'exercice : EXERCISE_PROFILE, critères et pondérations des règles
+    digest.update(f'profile:{compute_profile_hash(root, env)}\0'.encode())
+
+    # Toute modification des règles ou des gabarits invalide le cache
+    for name in sorted(os.listdir(SCRIPTS_DIR)):
+        if name.endswith('.py'):
+            digest.update(f'script:{name}\0'.encode())
+            _hash_file(digest, os.path.join(SCRIPTS_DIR, name))
+
+    return digest.hexdigest()
+
+
+def get_cache_dir(env=None):
+    """Dossier du cache, ou None si le cache est désactivé"""
+    env = os.environ if env is None else env
+    return env.get('FEEDBACK_CACHE_DIR') or None
+
+
+def _entry_path(cache_dir, key):
+    return os.path.join(cache_dir, key[:2], f'{key}.json')
+
+
+def lookup(key, cache_dir=None):
+    """Retourne l'entrée en cache pour cette clé, ou None"""
+    cache_dir = cache_dir or get_cache_dir()
+    if not cache_dir:
+        return None
+
+    path = _entry_path(cache_dir, key)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    if entry.get('key') != key:
+        return None
+
+    # Marque l'entrée comme récemment utilisée pour l'éviction LRU
+    os.utime(path, None)
+    return entry
+
+
+def store(key, feedback, findings=None, scores=None, cache_dir=None, max_entries=None, max_bytes=None,
+          evaluation=None, report=None):
+    """Enregistre un résultat d'évaluation puis applique la politique d'éviction
+
+    evaluation (Evaluation.to_dict()) et report (entrées du rendu) permettent
+    de régénérer FEEDBACK.md, de l'exporter et de l'historiser lors d'un succès.
+    """
+    cache_dir = cache_dir or get_cache_dir()
+    if not cache_dir:
+        return None
+
+    entry = {
+        'key': key,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'scores': scores or {},
+        'findings': findings or [],
+        'feedback': feedback,
+        'evaluation': evaluation,
+        'report': report,
+    }
+
+    path = _entry_path(cache_dir, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(entry, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+    evict(cache_dir, max_entries, max_bytes)
+    return path
+
+
+def evict(cache_dir, max_entries=None, max_bytes=None):
+    """Supprime les entrées les moins récemment utilisées au-delà des limites"""
+    if max_entries is None:
+        max_entries = int(os.environ.get('FEEDBACK_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES))
+    if max_bytes is None:
+        max_bytes = int(os.environ.get('FEEDBACK_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+
+    entries = []
+    total_bytes = 0
+    for dirpath, _, filenames in os.walk(cache_dir):
+        for name in filenames:
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(dirpath, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_bytes += stat.st_size
+
+    entries.sort()
+    removed = 0
+    while entries and (len(entries) > max_entries or total_bytes > max_bytes):
+        _, size, path = entries.pop(0)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total_bytes -= size
+        removed += 1
+    return removed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cache des résultats d'évaluation")
+    parser.add_argument('command', choices=['lookup', 'key'], help='lookup: restaure FEEDBACK.md si possible ; key: affiche la clé')
+    parser.add_argument('--root', default='.', help='Dossier de la soumission')
+    args = parser.parse_args(argv)
+
+    key = compute_cache_key(args.root)
+    if args.command == 'key':
+        print(key)
+        return 0
+
+    entry = lookup(key)
+    if entry is None:
+        print(f"🗃️ Aucun résultat en cache ({key[:12]})")
+        write_github_output({'hit': 'false', 'key': key})
+        return 0
+
+    with open(os.path.join(args.root, 'FEEDBACK.md'), 'w', encoding='utf-8') as f:
+        f.write(entry['feedback'])
+
+    outputs = {'hit': 'true', 'key': key}
+    for name, value in entry['scores'].items():
+        outputs[name.upper()] = value
+    write_github_output(outputs)
+    print(f"⚡ Soumission inchangée, feedback restauré depuis le cache ({key[:12]}, {entry['created_at']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Table déclarative des règles de l'analyse locale.
+
+Chaque règle décrit un motif (expression régulière) recherché ligne par
+ligne, le type de fichier concerné, la sévérité, la pénalité et le message
+pédagogique. Les règles sont compilées une seule fois ; pour chacune, les
+chaînes littérales que toute occurrence du motif contient forcément sont
+extraites du motif. Les littéraux de toutes les règles d'un type de fichier
+forment une seule expression, parcourue une fois par ligne quel que soit le
+nombre de règles : elle désigne les règles candidates (celles dont un
+littéral figure sur la ligne), et seules celles-ci sont confirmées par leur
+propre expression, y compris quand plusieurs règles se chevauchent. La
+plupart des lignes sont ainsi écartées par un unique parcours.
+
+Champs d'une règle :
+    id          identifiant stable (utilisé dans les findings)
+    file_type   'html', 'css' ou 'js'
+    pattern     expression régulière
+    exclude     expression optionnelle : si elle est trouvée sur la ligne,
+                la règle ne se déclenche pas
+    severity    'error', 'warning' ou 'info'
+    penalty     points retirés au score (sur 20)
+    issue       problème affiché à l'étudiant
+    suggestion  conseil d'amélioration
+"""
+
+import re
+import time
+
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    # Python < 3.11
+    import sre_parse
+
+from streaming import OVERLAP, SEGMENT_SIZE, iter_line_segments
+
+RULES = [
+    {
+        'id': 'css-excessive-width',
+        'file_type': 'css',
+        'pattern': r'width: 250%',
+        'severity': 'error',
+        'penalty': 4,
+        'issue': 'Largeur excessive (250%) cassant la mise en page',
+        'suggestion': 'Utilisez une largeur raisonnable comme 100% ou max-width',
+    },
+    {
+        'id': 'css-invalid-position-stick',
+        'file_type': 'css',
+        'pattern': r'position: stick',
+        'exclude': r'sticky',
+        'severity': 'error',
+        'penalty': 2,
+        'issue': 'Valeur CSS invalide "stick"',
+        'suggestion': 'Remplacez "position: stick" par "position: sticky"',
+    },
+    {
+        'id': 'css-offscreen-margin',
+        'file_type': 'css',
+        'pattern': r'margin-left: -9999px',
+        'severity': 'error',
+        'penalty': 3,
+        'issue': 'Élément placé hors écran avec margin négatif excessif',
+        'suggestion': 'Retirez cette propriété ou utilisez display: none pour masquer l\'élément',
+    },
+    {
+        'id': 'css-missing-semicolon',
+        'file_type': 'css',
+        'pattern': r'cursor: pointer|height: 400px',
+        'exclude': r'[;{]\s*$',
+        'severity': 'warning',
+        'penalty': 1,
+        'issue': 'Point-virgule manquant en fin de déclaration CSS',
+        'suggestion': 'Ajoutez un point-virgule (;) à la fin de la déclaration',
+    },
+    {
+        'id': 'js-var-declaration',
+        'file_type': 'js',
+        'pattern': r'(^|[;{(\s])var\s+[A-Za-z_$]',
+        'severity': 'warning',
+        'penalty': 1,
+        'issue': 'Déclaration avec "var" (portée de fonction, redéclaration possible)',
+        'suggestion': 'Utilisez const (ou let si la variable est réaffectée)',
+    },
+    {
+        'id': 'js-loose-equality',
+        'file_type': 'js',
+        'pattern': r'[^=!<>]==[^=]|!=[^=]',
+        'severity': 'warning',
+        'penalty': 1,
+        'issue': 'Comparaison non stricte (== ou !=) avec conversion de type implicite',
+        'suggestion': 'Utilisez === et !== pour comparer valeur et type',
+    },
+    {
+        'id': 'js-document-write',
+        'file_type': 'js',
+        'pattern': r'document\.write(ln)?\s*\(',
+        'severity': 'error',
+        'penalty': 2,
+        'issue': 'document.write() réécrit la page et bloque son chargement',
+        'suggestion': 'Modifiez le DOM avec textContent, append() ou insertAdjacentHTML()',
+    },
+    {
+        'id': 'js-console-log',
+        'file_type': 'js',
+        'pattern': r'console\.log\s*\(',
+        'severity': 'info',
+        'penalty': 0,
+        'issue': 'Message de débogage console.log() laissé dans le code',
+        'suggestion': 'Retirez les console.log() avant le rendu final',
+    },
+]
+
+
+def _longest_literal(items):
+    """Plus longue suite de caractères littéraux consécutifs d'une séquence analysée"""
+    longest = current = ''
+    for op, value in items:
+        if op is sre_parse.LITERAL:
+            current += chr(value)
+            longest = max(longest, current, key=len)
+        else:
+            current = ''
+    return longest
+
+
+def required_literals(pattern):
+    """Littéraux dont l'un au moins figure dans toute occurrence du motif (None : aucun)"""
+    parsed = sre_parse.parse(pattern)
+    if parsed.state.flags & re.IGNORECASE:
+        return None
+    items = list(parsed)
+    if len(items) == 1 and items[0][0] is sre_parse.BRANCH:
+        branches = items[0][1][1]
+    else:
+        branches = [items]
+    literals = tuple(_longest_literal(branch) for branch in branches)
+    return literals if all(literals) else None
+
+
+def _trie_pattern(literals):
+    """Alternative des littéraux factorisée en arbre de préfixes (coût indépendant de leur nombre)"""
+    trie = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def emit(node):
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Fin de littéral : le reste est optionnel (gourmand, le plus long l'emporte)
+        return f'(?:{body})?' if '' in node else body
+
+    return emit(trie)
+
+
+def compile_literal_matcher(literals_by_rule):
+    """Expression unique des littéraux et règles candidates associées à chaque littéral trouvé
+
+    L'expression est une anticipation essayée à chaque position : les
+    occurrences qui se chevauchent sont toutes vues. À une position donnée
+    seule l'alternative la plus longue est retenue ; un littéral plus court
+    qui y commence en est un préfixe : chaque littéral désigne donc aussi
+    les règles des littéraux qu'il contient.
+    """
+    literals = sorted({literal for rule_literals in literals_by_rule.values() for literal in rule_literals},
+                      key=lambda literal: (-len(literal), literal))
+    if not literals:
+        return None, {}
+    candidates = {
+        literal: tuple(sorted(index for index, rule_literals in literals_by_rule.items()
+                              if any(other in literal for other in rule_literals)))
+        for literal in literals
+    }
+    matcher = re.compile('(?=(' + _trie_pattern(literals) + '))')
+    return matcher, candidates
+
+
+def compile_rules(rules):
+    """Compile la table de règles : par type de fichier, préfiltre commun et expressions des règles"""
+    by_type = {}
+    for rule in rules:
+        by_type.setdefault(rule['file_type'], []).append(rule)
+
+    compiled = {}
+    for file_type, type_rules in by_type.items():
+        literals_by_rule = {index: required_literals(rule['pattern']) for index, rule in enumerate(type_rules)}
+        matcher, candidates = compile_literal_matcher(
+            {index: literals for index, literals in literals_by_rule.items() if literals is not None})
+        compiled[file_type] = {
+            # (règle, expression) par rang dans la table
+            'checks': [(rule, re.compile(rule['pattern'])) for rule in type_rules],
+            'matcher': matcher,
+            'candidates': candidates,
+            # Règles sans littéral requis : confirmées sur chaque ligne
+            'unfiltered': frozenset(index for index, literals in literals_by_rule.items() if literals is None),
+            'excludes': {
+                rule['id']: re.compile(rule['exclude']) for rule in type_rules if rule.get('exclude')
+            },
+            # Motifs individuels, pour mesurer le coût de chaque règle (instrumentation)
+            'patterns': {rule['id']: re.compile(rule['pattern']) for rule in type_rules},
+        }
+    return compiled
+
+
+def find_rules(compiled_type, text):
+    """(rang, règle) de chaque règle dont le motif est trouvé dans le texte, exclusions non comprises"""
+    candidates = set(compiled_type['unfiltered'])
+    matcher = compiled_type['matcher']
+    if matcher is not None:
+        by_literal = compiled_type['candidates']
+        for match in matcher.finditer(text):
+            candidates.update(by_literal[match.group(1)])
+    if not candidates:
+        return []
+    checks = compiled_type['checks']
+    hits = []
+    for index in sorted(candidates):
+        rule, regex = checks[index]
+        if regex.search(text):
+            hits.append((index, rule))
+    return hits
+
+
+def match_line(compiled_type, line):
+    """Retourne les règles déclenchées par une ligne, une seule fois chacune, dans l'ordre de la table"""
+    excludes = compiled_type['excludes']
+    matched = []
+    for _, rule in find_rules(compiled_type, line):
+        exclude = excludes.get(rule['id'])
+        if exclude is None or not exclude.search(line):
+            matched.append(rule)
+    return matched
+
+
+def match_segments(compiled_type, hits, excluded, window, last):
+    """Accumule les règles déclenchées par un segment de ligne découpée
+
+    window contient la fin du segment précédent (OVERLAP) suivie du segment :
+    une occurrence à cheval sur la coupure est ainsi retrouvée. Les
+    exclusions ancrées en fin de ligne ($) ne s'appliquent qu'au dernier
+    segment : les autres sont suivis d'un caractère sentinelle.
+    """
+    for index, rule in find_rules(compiled_type, window):
+        hits.setdefault(index, rule)
+
+    probe = window if last else window + '\0'
+    for rule_id, exclude in compiled_type['excludes'].items():
+        if rule_id not in excluded and exclude.search(probe):
+            excluded.add(rule_id)
+
+
+def _make_finding(rule, file_name, line_number):
+    return {
+        'file': file_name,
+        'line': line_number,
+        'severity': rule['severity'],
+        'issue': rule['issue'],
+        'suggestion': rule['suggestion'],
+        'rule': rule['id'],
+        'penalty': rule['penalty'],
+    }
+
+
+def apply_rules(compiled, file_type, lines, file_name):
+    """Applique les règles compilées à une suite de lignes et retourne les findings"""
+    return apply_rules_numbered(compiled, file_type, enumerate(lines, 1), file_name)
+
+
+def apply_rules_numbered(compiled, file_type, numbered_lines, file_name):
+    """Comme apply_rules, pour des couples (numéro de ligne, ligne) éventuellement non contigus"""
+    compiled_type = compiled.get(file_type)
+    if compiled_type is None:
+        return []
+
+    findings = []
+    for line_number, line in numbered_lines:
+        for rule in match_line(compiled_type, line.rstrip('\n')):
+            findings.append(_make_finding(rule, file_name, line_number))
+    return findings
+
+
+def apply_rules_to_file(compiled, file_type, path, file_name, wanted_lines=None, segment_size=SEGMENT_SIZE):
+    """Applique les règles à un fichier lu en flux (mémoire bornée, lignes géantes découpées)
+
+    wanted_lines restreint l'analyse à certains numéros de ligne.
+    """
+    compiled_type = compiled.get(file_type)
+    if compiled_type is None:
+        return []
+
+    if wanted_lines is not None and not wanted_lines:
+        return []
+
+    last_wanted = max(wanted_lines) if wanted_lines else None
+    findings = []
+    hits = {}
+    excluded = set()
+    carry = ''
+    for line_number, segment, last in iter_line_segments(path, segment_size):
+        if last_wanted is not None:
+            if line_number > last_wanted:
+                break
+            if line_number not in wanted_lines:
+                continue
+
+        if last and not carry:
+            # Cas courant : ligne entière en un seul segment
+            for rule in match_line(compiled_type, segment):
+                findings.append(_make_finding(rule, file_name, line_number))
+            continue
+
+        window = carry + segment
+        match_segments(compiled_type, hits, excluded, window, last)
+        if not last:
+            carry = window[-OVERLAP:]
+            continue
+
+        for index in sorted(hits):
+            rule = hits[index]
+            if rule['id'] not in excluded:
+                findings.append(_make_finding(rule, file_name, line_number))
+        hits = {}
+        excluded = set()
+        carry = ''
+    return findings
+
+
+def profile_rules(compiled, file_type, path):
+    """Coût de chaque règle sur un fichier, chacune évaluée seule (diagnostic)"""
+    compiled_type = compiled.get(file_type)
+    if compiled_type is None:
+        return {}
+
+    patterns = compiled_type['patterns']
+    excludes = compiled_type['excludes']
+    costs = dict.fromkeys(patterns, 0.0)
+    perf_counter = time.perf_counter
+    for _, segment, _ in iter_line_segments(path):
+        for rule_id, pattern in patterns.items():
+            started = perf_counter()
+            if pattern.search(segment):
+                exclude = excludes.get(rule_id)
+                if exclude is not None:
+                    exclude.search(segment)
+            costs[rule_id] += perf_counter() - started
+    return costs
+
+
+COMPILED_RULES = compile_rules(RULES)
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Index croisé sélecteurs CSS / classes et id du HTML.
+
+Chaque fichier est lu une seule fois et résumé en un petit index :
+  - CSS  : sélecteurs (ligne, texte, classes et id requis, spécificité) ;
+  - HTML : classes et id utilisés (première occurrence), ancres href="#id",
+           feuilles de style externes (CDN) ;
+  - JS   : mots des chaînes littérales (classes ajoutées dynamiquement).
+Les index sont ensuite fusionnés en ensembles : une règle CSS dont une
+classe n'apparaît dans aucune page, une classe du HTML qu'aucune feuille de
+style ne définit ou une ancre vers un id absent se détectent par simple
+appartenance à un ensemble. Le coût est linéaire en taille du projet (et non
+proportionnel au produit sélecteurs × éléments).
+
+Une bibliothèque copiée ou une feuille minifiée (streaming.detect_vendored)
+n'est pas analysée règle par règle : seuls les noms de classes qu'elle
+définit sont relevés, pour ne pas signaler comme indéfinies les classes
+qu'elle fournit au HTML.
+
+Les résultats sont des findings informatifs (sans pénalité).
+"""
+
+import os
+import re
+from html.parser import HTMLParser
+
+from streaming import detect_vendored, iter_line_segments, read_block
+
+CHUNK_SIZE = 64 * 1024
+
+# Identifiants de règles produits par l'index (recalculés dès qu'un fichier change)
+INDEX_RULES = frozenset((
+    'css-unused-selector', 'css-specificity-hotspot', 'html-undefined-class', 'html-undefined-id',
+))
+
+# At-rules dont le bloc contient des règles (les autres contiennent des déclarations ou des keyframes)
+CONDITIONAL_AT_RULES = frozenset(('media', 'supports', 'layer', 'container', 'document', 'scope'))
+
+MAX_PRELUDE_SIZE = 4096
+
+# Sélecteur signalé : id combiné à d'autres sélecteurs, 4 classes ou plus, ou 4 niveaux d'imbrication
+HOT_SPOT_SPECIFICITY = (1, 1, 0)
+HOT_SPOT_CLASSES = 4
+HOT_SPOT_DEPTH = 4
+
+# Au-delà, les findings d'une même règle dans un fichier sont résumés en un seul
+MAX_FINDINGS_PER_RULE = 10
+
+# Ancres gérées par le navigateur sans id correspondant
+IMPLICIT_FRAGMENTS = frozenset(('', 'top'))
+
+CSS_TOKEN_RE = re.compile(r'/\*|\*/|[{};]')
+IDENT = r'-?[_a-zA-Z\u00a0-\uffff][\w-]*'
+CLASS_SELECTOR_RE = re.compile(r'\.(' + IDENT + ')')
+ID_SELECTOR_RE = re.compile(r'#(' + IDENT + ')')
+ATTRIBUTE_SELECTOR_RE = re.compile(r'\[[^\]]*\]')
+WHERE_RE = re.compile(r':where\([^()]*\)')
+# Pseudo-classes dont l'argument est une liste de sélecteurs (comptée dans la spécificité)
+SELECTOR_ARGUMENT_RE = re.compile(r':(?:not|is|has|matches|-webkit-any)\(')
+PARENTHESES_RE = re.compile(r'\([^()]*\)')
+PSEUDO_ELEMENT_RE = re.compile(r'::[\w-]+|:(?:before|after|first-line|first-letter)\b')
+PSEUDO_CLASS_RE = re.compile(r':[\w-]+')
+TYPE_SELECTOR_RE = re.compile(r'(?:^|[\s>+~(,])([a-zA-Z][\w-]*)')
+COMBINATOR_RE = re.compile(r'\s*[>+~]\s*|\s+')
+JS_STRING_RE = re.compile(r'[\'"`]([^\'"`\n]{1,200})[\'"`]')
+JS_WORD_RE = re.compile(IDENT)
+
+
+def split_selector_list(prelude):
+    """Sépare une liste de sélecteurs sur les virgules de premier niveau"""
+    selectors = []
+    depth = 0
+    start = 0
+    for index, char in enumerate(prelude):
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth = max(0, depth - 1)
+        elif char == ',' and depth == 0:
+            selectors.append(prelude[start:index].strip())
+            start = index + 1
+    selectors.append(prelude[start:].strip())
+    return [selector for selector in selectors if selector]
+
+
+def compute_specificity(selector):
+    """Spécificité (id, classes/attributs/pseudo-classes, types/pseudo-éléments), approchée
+
+    L'argument de :not()/:is()/:has() est compté en entier (la norme retient
+    l'alternative la plus spécifique) ; :where() ne compte pas.
+    """
+    text = ATTRIBUTE_SELECTOR_RE.sub('[]', selector)
+    attributes = text.count('[]')
+    text = WHERE_RE.sub('', text)
+    text = SELECTOR_ARGUMENT_RE.sub(' (', text)
+    pseudo_elements = len(PSEUDO_ELEMENT_RE.findall(text))
+    text = PSEUDO_ELEMENT_RE.sub('', text)
+    # Argument des autres pseudo-classes (:nth-child(2n+1)...) : sans sélecteur
+    text = re.sub(r'(:[\w-]+)\([^()]*\)', r'\1', text)
+    ids = len(ID_SELECTOR_RE.findall(text))
+    classes = len(CLASS_SELECTOR_RE.findall(text)) + attributes + len(PSEUDO_CLASS_RE.findall(text))
+    types = len(TYPE_SELECTOR_RE.findall(text)) + pseudo_elements
+    return (ids, classes, types)
+
+
+def parse_selector(selector):
+    """Classes et id qu'un élément doit porter pour que le sélecteur s'applique"""
+    text = ATTRIBUTE_SELECTOR_RE.sub('', selector)
+    # Les arguments de :not(), :is()... ne sont pas requis
+    while '(' in text:
+        stripped = PARENTHESES_RE.sub('', text)
+        if stripped == text:
+            break
+        text = stripped
+    return (
+        frozenset(CLASS_SELECTOR_RE.findall(text)),
+        frozenset(ID_SELECTOR_RE.findall(text)),
+        len(COMBINATOR_RE.split(text.strip())),
+    )
+
+
+def index_vendored_css_file(path, file_name):
+    """Classes définies par une feuille de style tierce (sans analyse des règles)"""
+    classes = set()
+    for _, segment, _ in iter_line_segments(path):
+        if '.' in segment:
+            classes.update(CLASS_SELECTOR_RE.findall(segment))
+    return {'type': 'css', 'file': file_name, 'vendored': True, 'selectors': [], 'classes': classes}
+
+
+def index_css_file(path, file_name):
+    """Sélecteurs d'une feuille de style : [(ligne, sélecteur, classes, id, spécificité, profondeur)]"""
+    if detect_vendored(path, file_name):
+        return index_vendored_css_file(path, file_name)
+
+    selectors = []
+    stack = []
+    buffer = []
+    buffer_size = 0
+    prelude_line = None
+    in_comment = False
+
+    for line_number, segment, last in iter_line_segments(path):
+        text = segment + '\n' if last else segment
+        position = 0
+        while position < len(text):
+            if in_comment:
+                end = text.find('*/', position)
+                if end < 0:
+                    break
+                in_comment = False
+                position = end + 2
+                continue
+
+            match = CSS_TOKEN_RE.search(text, position)
+            chunk = text[position:match.start() if match else len(text)]
+            if chunk and buffer_size < MAX_PRELUDE_SIZE:
+                if prelude_line is None and not chunk.isspace():
+                    prelude_line = line_number
+                buffer.append(chunk)
+                buffer_size += len(chunk)
+            if match is None:
+                break
+            position = match.end()
+            token = match.group()
+
+            if token == '/*':
+                in_comment = True
+                continue
+            if token == '*/':
+                continue
+
+            if token == '{':
+                prelude = ''.join(buffer).strip()
+                context = stack[-1] if stack else 'rules'
+                if context == 'skip':
+                    stack.append('skip')
+                elif prelude.startswith('@'):
+                    name = prelude[1:].split(None, 1)[0].lower() if len(prelude) > 1 else ''
+                    stack.append('rules' if name in CONDITIONAL_AT_RULES else 'skip')
+                else:
+                    # Règle (éventuellement imbriquée dans une autre : CSS nesting)
+                    for selector in split_selector_list(prelude):
+                        classes, ids, depth = parse_selector(selector)
+                        selectors.append((prelude_line or line_number, selector, classes, ids,
+                                          compute_specificity(selector), depth))
+                    stack.append('declarations')
+            elif token == '}' and stack:
+                stack.pop()
+
+            buffer = []
+            buffer_size = 0
+            prelude_line = None
+
+    return {
+        'type': 'css',
+        'file': file_name,
+        'vendored': False,
+        'selectors': selectors,
+        'classes': {name for _, _, classes, _, _, _ in selectors for name in classes},
+    }
+
+
+class HTMLUsageIndexer(HTMLParser):
+    """Classes, id et ancres d'une page HTML (première occurrence de chacun)"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.classes = {}
+        self.ids = {}
+        self.fragments = {}
+        self.external_stylesheets = False
+
+    def handle_starttag(self, tag, attrs):
+        position = None
+        for name, value in attrs:
+            if not value:
+                continue
+            if name == 'class':
+                position = position or self.getpos()
+                for class_name in value.split():
+                    self.classes.setdefault(class_name, position)
+            elif name == 'id':
+                self.ids.setdefault(value.strip(), self.getpos())
+            elif name == 'href' and value.startswith('#'):
+                self.fragments.setdefault(value[1:], self.getpos())
+        if tag == 'link':
+            values = dict(attrs)
+            href = values.get('href') or ''
+            if 'stylesheet' in (values.get('rel') or '').lower() and (href.startswith(('http:', 'https:', '//'))):
+                self.external_stylesheets = True
+
+    handle_startendtag = handle_starttag
+
+
+def index_html_file(path, file_name):
+    """Classes, id et ancres utilisés par une page HTML"""
+    indexer = HTMLUsageIndexer()
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        while True:
+            chunk = read_block(f, CHUNK_SIZE)
+            if not chunk:
+                break
+            indexer.feed(chunk)
+    indexer.close()
+    return {
+        'type': 'html',
+        'file': file_name,
+        'classes': indexer.classes,
+        'ids': indexer.ids,
+        'fragments': indexer.fragments,
+        'external_stylesheets': indexer.external_stylesheets,
+    }
+
+
+def index_js_file(path, file_name):
+    """Mots des chaînes littérales d'un script (classList.add('ouvert'), querySelector('.menu')...)"""
+    words = set()
+    for _, segment, _ in iter_line_segments(path):
+        for literal in JS_STRING_RE.findall(segment):
+            words.update(JS_WORD_RE.findall(literal))
+    return {'type': 'js', 'file': file_name, 'words': words}
+
+
+INDEXERS = {
+    'css': index_css_file,
+    'html': index_html_file,
+    'js': index_js_file,
+}
+
+
+def index_file(root, file_name, file_type):
+    """Index d'un fichier du projet, ou None pour un type non indexé"""
+    indexer = INDEXERS.get(file_type)
+    return indexer(os.path.join(root, file_name), file_name) if indexer else None
+
+
+def index_project(root, files):
+    """Index de chaque fichier : {nom: index}"""
+    indexes = {}
+    for file_name, file_type in files:
+        index = index_file(root, file_name, file_type)
+        if index is not None:
+            indexes[file_name] = index
+    return indexes
+
+
+def _finding(file_name, line, severity, issue, suggestion, rule, column=None):
+    finding = {'file': file_name, 'line': line}
+    if column is not None:
+        finding['column'] = column
+    finding.update({
+        'severity': severity,
+        'issue': issue,
+        'suggestion': suggestion,
+        'rule': rule,
+        'penalty': 0,
+    })
+    return finding
+
+
+def limit_findings(findings, limit=MAX_FINDINGS_PER_RULE):
+    """Garde les premiers findings de chaque règle par fichier et résume les suivants"""
+    kept = []
+    extra = {}
+    counts = {}
+    for finding in findings:
+        key = (finding['file'], finding['rule'])
+        counts[key] = counts.get(key, 0) + 1
+        if counts[key] <= limit:
+            kept.append(finding)
+        else:
+            extra.setdefault(key, finding['line'])
+    for (file_name, rule), line in extra.items():
+        kept.append(_finding(
+            file_name, line, 'info',
+            f'{counts[(file_name, rule)] - limit} autre(s) signalement(s) du même type dans ce fichier',
+            'Corrigez d\'abord les cas listés ci-dessus, puis relancez l\'évaluation',
+            rule,
+        ))
+    return kept
+
+
+def is_hot_spot(specificity, depth):
+    return (specificity >= HOT_SPOT_SPECIFICITY or specificity[1] >= HOT_SPOT_CLASSES
+            or depth >= HOT_SPOT_DEPTH)
+
+
+def cross_file_findings(indexes):
+    """Règles inutilisées, références indéfinies et sélecteurs trop spécifiques"""
+    pages = [index for index in indexes.values() if index['type'] == 'html']
+    stylesheets = [index for index in indexes.values() if index['type'] == 'css']
+
+    used_classes = set()
+    used_ids = set()
+    for page in pages:
+        used_classes.update(page['classes'])
+        used_ids.update(page['ids'])
+    dynamic_words = set()
+    for index in indexes.values():
+        if index['type'] == 'js':
+            dynamic_words.update(index['words'])
+
+    defined_classes = set()
+    for stylesheet in stylesheets:
+        defined_classes.update(stylesheet['classes'])
+
+    findings = []
+    for stylesheet in stylesheets:
+        if stylesheet['vendored']:
+            continue
+        for line, selector, classes, ids, specificity, depth in stylesheet['selectors']:
+            if pages:
+                missing = sorted(f'.{name}' for name in classes - used_classes - dynamic_words)
+                missing += sorted(f'#{name}' for name in ids - used_ids - dynamic_words)
+                if missing:
+                    findings.append(_finding(
+                        stylesheet['file'], line, 'info',
+                        f'Sélecteur « {selector} » sans élément correspondant dans le HTML',
+                        f'Aucun élément n\'utilise {", ".join(missing)} : supprimez la règle ou ajoutez cet attribut dans le HTML',
+                        'css-unused-selector',
+                    ))
+            if is_hot_spot(specificity, depth):
+                findings.append(_finding(
+                    stylesheet['file'], line, 'info',
+                    f'Sélecteur « {selector} » très spécifique ({specificity[0]},{specificity[1]},{specificity[2]})',
+                    'Préférez une classe dédiée à la combinaison d\'id et de sélecteurs imbriqués : '
+                    'le style sera plus facile à surcharger et à réutiliser',
+                    'css-specificity-hotspot',
+                ))
+
+    # Classes fournies par une feuille de style externe (CDN) : impossible de savoir lesquelles sont définies
+    check_classes = bool(stylesheets) and not any(page['external_stylesheets'] for page in pages)
+    for page in pages:
+        if check_classes:
+            for class_name, (line, offset) in page['classes'].items():
+                if class_name not in defined_classes and class_name not in dynamic_words:
+                    findings.append(_finding(
+                        page['file'], line, 'info',
+                        f'Classe "{class_name}" définie dans aucune feuille de style',
+                        f'Ajoutez une règle .{class_name} dans le CSS ou retirez cette classe',
+                        'html-undefined-class', offset + 1,
+                    ))
+        for fragment, (line, offset) in page['fragments'].items():
+            if fragment not in page['ids'] and fragment not in IMPLICIT_FRAGMENTS:
+                findings.append(_finding(
+                    page['file'], line, 'info',
+                    f'Lien vers l\'ancre "#{fragment}" absente de la page',
+                    f'Ajoutez id="{fragment}" à l\'élément ciblé ou corrigez le lien',
+                    'html-undefined-id', offset + 1,
+                ))
+    return limit_findings(findings)
+
+
+def analyze_project_index(root, files):
+    """Findings de l'index croisé d'un projet"""
+    return cross_file_findings(index_project(root, files))
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Détection des soumissions quasi identiques dans une ou plusieurs promotions.
+
+Chaque soumission est réduite à un ensemble de shingles (suites de
+NGRAM_SIZE jetons) extraits de son HTML, de son CSS et de son JS normalisés :
+commentaires et blancs retirés, noms de classes, d'id et de variables CSS
+remplacés par leur rang d'apparition (renommer les classes ne masque donc
+pas une copie). L'ensemble est résumé par une signature MinHash de NUM_PERM
+valeurs, dont la proportion de valeurs communes estime la similarité de
+Jaccard entre deux soumissions.
+
+Les signatures sont découpées en BANDS bandes de ROWS valeurs : deux
+soumissions ne sont comparées que si elles partagent au moins une bande
+identique (LSH), ce qui évite de comparer toutes les paires. Les paires au-
+dessus du seuil sont regroupées en clusters.
+
+Les signatures sont conservées dans un fichier JSON (--store) : une
+soumission inchangée n'est pas retraitée et les nouvelles soumissions sont
+comparées à celles des promotions précédentes.
+
+Usage :
+    python3 .github/scripts/similarity.py SOUMISSIONS/ [--store signatures.json] [--promotion 2025]
+    python3 .github/scripts/similarity.py --manifest manifest.json --template starter/
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import zlib
+import random
+import hashlib
+import argparse
+from html.parser import HTMLParser
+from concurrent.futures import ProcessPoolExecutor
+
+from project_files import discover_files
+from streaming import detect_vendored
+from batch_feedback import discover_submissions, load_manifest
+
+STORE_FORMAT_VERSION = 1
+
+NGRAM_SIZE = 5
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+PERMUTATION_SEED = 1
+DEFAULT_THRESHOLD = 0.8
+
+# En dessous, une soumission (fichiers vides, exercice à peine commencé) n'est pas comparée
+MIN_SHINGLES = 20
+
+MERSENNE_PRIME = (1 << 61) - 1
+
+CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+JS_COMMENT_RE = re.compile(r'/\*.*?\*/|(?<![:\'"])//[^\n]*', re.S)
+CSS_TOKEN_RE = re.compile(r'--[\w-]+|[.#]-?[_a-zA-Z][\w-]*|[\w.%-]+|[^\s\w]')
+JS_TOKEN_RE = re.compile(r'[A-Za-z_$][\w$-]*|\d[\w.]*|[^\s\w]')
+HEX_COLOR_RE = re.compile(r'#(?:[0-9a-fA-F]{3,4}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})$')
+WORD_RE = re.compile(r'\w+')
+
+
+class Renamer:
+    """Remplace des noms (classes, id, variables) par leur rang d'apparition"""
+
+    def __init__(self):
+        self.names = {}
+
+    def __call__(self, kind, name):
+        key = (kind, name)
+        if key not in self.names:
+            self.names[key] = f'{kind}{len(self.names)}'
+        return self.names[key]
+
+
+class HTMLTokenizer(HTMLParser):
+    """Jetons d'une page : balises, attributs, classes/id renommés, mots du texte"""
+
+    def __init__(self, rename):
+        super().__init__(convert_charrefs=True)
+        self.rename = rename
+        self.tokens = []
+
+    def handle_starttag(self, tag, attrs):
+        tokens = self.tokens
+        tokens.append(f'<{tag}')
+        for name, value in attrs:
+            tokens.append(name)
+            if value is None:
+                continue
+            if name == 'class':
+                tokens.extend(self.rename('c', class_name) for class_name in value.split())
+            elif name == 'id':
+                tokens.append(self.rename('i', value.strip()))
+            else:
+                tokens.append(' '.join(value.lower().split()))
+
+    handle_startendtag = handle_starttag
+
+    def handle_endtag(self, tag):
+        self.tokens.append(f'</{tag}')
+
+    def handle_data(self, data):
+        self.tokens.extend(WORD_RE.findall(data.lower()))
+
+
+def tokenize_html(text, rename):
+    tokenizer = HTMLTokenizer(rename)
+    tokenizer.feed(text)
+    tokenizer.close()
+    return tokenizer.tokens
+
+
+def tokenize_css(text, rename):
+    tokens = []
+    for token in CSS_TOKEN_RE.findall(CSS_COMMENT_RE.sub(' ', text)):
+        if token.startswith('--'):
+            tokens.append(rename('v', token))
+        elif token.startswith('.') and not token[1:2].isdigit():
+            tokens.append(rename('c', token[1:]))
+        elif token.startswith('#') and not HEX_COLOR_RE.match(token):
+            tokens.append(rename('i', token[1:]))
+        else:
+            tokens.append(token.lower())
+    return tokens
+
+
+def tokenize_js(text, rename):
+    tokens = []
+    for token in JS_TOKEN_RE.findall(JS_COMMENT_RE.sub(' ', text)):
+        # Classe ou id déjà rencontrés dans le HTML ou le CSS (querySelector, classList...)
+        renamed = rename.names.get(('c', token)) or rename.names.get(('i', token))
+        tokens.append(renamed or token)
+    return tokens
+
+
+TOKENIZERS = {
+    'html': tokenize_html,
+    'css': tokenize_css,
+    'js': tokenize_js,
+}
+
+# HTML d'abord : les classes prennent leur rang dans l'ordre du document
+TYPE_ORDER = {'html': 0, 'css': 1, 'js': 2}
+
+
+def shingle_hashes(tokens, size=NGRAM_SIZE):
+    """Empreintes 32 bits des suites de `size` jetons consécutifs"""
+    if len(tokens) < size:
+        return {zlib.crc32('\x1f'.join(tokens).encode('utf-8'))} if tokens else set()
+    return {
+        zlib.crc32('\x1f'.join(tokens[index:index + size]).encode('utf-8'))
+        for index in range(len(tokens) - size + 1)
+    }
+
+
+def submission_shingles(path):
+    """Shingles de tous les fichiers d'une soumission (bibliothèques tierces exclues)"""
+    rename = Renamer()
+    shingles = set()
+    files = sorted(discover_files(path), key=lambda entry: (TYPE_ORDER[entry[1]], entry[0]))
+    for file_name, file_type in files:
+        file_path = os.path.join(path, file_name)
+        if detect_vendored(file_path, file_name):
+            continue
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read()
+        shingles |= shingle_hashes(TOKENIZERS[file_type](text, rename))
+    return shingles
+
+
+def content_digest(path):
+    """Empreinte du contenu évalué d'une soumission (signature à recalculer si elle change)"""
+    digest = hashlib.sha256(f'format:{STORE_FORMAT_VERSION}:{NGRAM_SIZE}:{NUM_PERM}\0'.encode())
+    for file_name, _ in discover_files(path):
+        digest.update(f'{file_name}\0'.encode())
+        with open(os.path.join(path, file_name), 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def make_permutations(num_perm=NUM_PERM, seed=PERMUTATION_SEED):
+    """Fonctions de hachage (a·x + b) mod p, identiques d'une exécution à l'autre"""
+    rng = random.Random(seed)
+    return [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME)) for _ in range(num_perm)]
+
+
+PERMUTATIONS = make_permutations()
+
+
+def minhash(shingles, permutations=PERMUTATIONS):
+    """Signature MinHash d'un ensemble de shingles"""
+    values = list(shingles)
+    return [min((a * x + b) % MERSENNE_PRIME for x in values) for a, b in permutations]
+
+
+def estimate_similarity(signature_a, signature_b):
+    """Similarité de Jaccard estimée : proportion de valeurs égales"""
+    return sum(1 for a, b in zip(signature_a, signature_b) if a == b) / len(signature_a)
+
+
+def lsh_candidates(signatures, bands=BANDS, rows=ROWS):
+    """Paires partageant au moins une bande de signature identique"""
+    candidates = set()
+    for band in range(bands):
+        start = band * rows
+        buckets = {}
+        for entry_id, signature in signatures.items():
+            buckets.setdefault(tuple(signature[start:start + rows]), []).append(entry_id)
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            members.sort()
+            for index, first in enumerate(members):
+                for second in members[index + 1:]:
+                    candidates.add((first, second))
+    return candidates
+
+
+def find_similar_pairs(signatures, threshold=DEFAULT_THRESHOLD):
+    """Paires candidates (LSH) dont la similarité estimée atteint le seuil"""
+    pairs = []
+    for first, second in lsh_candidates(signatures):
+        similarity = estimate_similarity(signatures[first], signatures[second])
+        if similarity >= threshold:
+            pairs.append((first, second, similarity))
+    pairs.sort(key=lambda pair: (-pair[2], pair[0], pair[1]))
+    return pairs
+
+
+def build_clusters(pairs):
+    """Regroupe les paires similaires en clusters (union-find)"""
+    parent = {}
+
+    def find(item):
+        parent.setdefault(item, item)
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    for first, second, _ in pairs:
+        root_first, root_second = find(first), find(second)
+        if root_first != root_second:
+            parent[max(root_first, root_second)] = min(root_first, root_second)
+
+    clusters = {}
+    for first, second, similarity in pairs:
+        cluster = clusters.setdefault(find(first), {'members': set(), 'pairs': []})
+        cluster['members'].update((first, second))
+        cluster['pairs'].append({'a': first, 'b': second, 'similarity': round(similarity, 3)})
+
+    result = []
+    for cluster in clusters.values():
+        result.append({
+            'members': sorted(cluster['members']),
+            'similarity': max(pair['similarity'] for pair in cluster['pairs']),
+            'pairs': cluster['pairs'],
+        })
+    result.sort(key=lambda cluster: (-cluster['similarity'], cluster['members']))
+    return result
+
+
+def load_store(path):
+    """Signatures conservées, ou un magasin vide (format ou paramètres différents)"""
+    empty = {'version': STORE_FORMAT_VERSION, 'num_perm': NUM_PERM, 'ngram': NGRAM_SIZE, 'entries': {}}
+    if not path:
+        return empty
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            store = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return empty
+    if (store.get('version'), store.get('num_perm'), store.get('ngram')) != (STORE_FORMAT_VERSION, NUM_PERM, NGRAM_SIZE):
+        print("⚠️ Signatures enregistrées avec d'autres paramètres, recalcul complet")
+        return empty
+    return store
+
+
+def save_store(path, store):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(store, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def compute_signature(task):
+    """Signature d'une soumission (exécuté dans un processus du pool)"""
+    shingles = submission_shingles(task['path'])
+    shingles -= task['template']
+    if len(shingles) < MIN_SHINGLES:
+        return task['id'], None, len(shingles)
+    return task['id'], minhash(shingles), len(shingles)
+
+
+def update_signatures(submissions, store, promotion=None, template=None, workers=None):
+    """Calcule les signatures manquantes ou périmées ; retourne les identifiants de ce lot"""
+    template_shingles = submission_shingles(template) if template else set()
+    entries = store['entries']
+    current = []
+    tasks = []
+    for submission in submissions:
+        entry_id = f"{promotion}/{submission['repository']}" if promotion else submission['repository']
+        digest = content_digest(submission['path'])
+        current.append(entry_id)
+        entry = entries.get(entry_id)
+        if entry and entry.get('digest') == digest and entry.get('template') == bool(template):
+            continue
+        entries[entry_id] = {'digest': digest, 'template': bool(template), 'promotion': promotion}
+        tasks.append({'id': entry_id, 'path': submission['path'], 'template': template_shingles})
+
+    if tasks:
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(compute_signature, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+        else:
+            results = [compute_signature(task) for task in tasks]
+        for entry_id, signature, shingle_count in results:
+            entries[entry_id].update({'signature': signature, 'shingles': shingle_count,
+                                      'updated_at': time.strftime('%Y-%m-%dT%H:%M:%S')})
+    return current, len(tasks)
+
+
+def detect_near_duplicates(store, current=None, threshold=DEFAULT_THRESHOLD):
+    """Clusters de soumissions similaires ; avec `current`, seuls ceux qui en contiennent une"""
+    signatures = {entry_id: entry['signature'] for entry_id, entry in store['entries'].items()
+                  if entry.get('signature')}
+    clusters = build_clusters(find_similar_pairs(signatures, threshold))
+    if current is not None:
+        current = set(current)
+        clusters = [cluster for cluster in clusters if current.intersection(cluster['members'])]
+    return clusters
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Détection des soumissions quasi identiques (MinHash/LSH)')
+    parser.add_argument('submissions_dir', nargs='?', help='Dossier contenant un sous-dossier par soumission')
+    parser.add_argument('--manifest', help='Manifeste JSON ou texte listant les soumissions')
+    parser.add_argument('--store', help='Fichier JSON des signatures (réutilisées et complétées)')
+    parser.add_argument('--promotion', help='Nom de la promotion (préfixe des identifiants dans --store)')
+    parser.add_argument('--template', help='Dossier du code de départ fourni aux étudiants (ignoré dans la comparaison)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Similarité minimale signalée (défaut: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--workers', type=int, default=None, help='Nombre de processus (défaut: nombre de CPU)')
+    parser.add_argument('--output', help='Chemin du rapport JSON (défaut: similarity-report.json)')
+    args = parser.parse_args(argv)
+
+    if args.manifest:
+        submissions = load_manifest(args.manifest)
+    elif args.submissions_dir:
+        submissions = discover_submissions(args.submissions_dir)
+    else:
+        parser.error('indiquez un dossier de soumissions ou --manifest')
+
+    started = time.perf_counter()
+    store = load_store(args.store)
+    current, computed = update_signatures(submissions, store, args.promotion, args.template, args.workers)
+    clusters = detect_near_duplicates(store, current, args.threshold)
+    if args.store:
+        save_store(args.store, store)
+
+    report = {
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'threshold': args.threshold,
+        'submissions': len(current),
+        'compared': sum(1 for entry in store['entries'].values() if entry.get('signature')),
+        'signatures_computed': computed,
+        'duration_s': round(time.perf_counter() - started, 3),
+        'clusters': clusters,
+    }
+    output_path = args.output or os.path.join(args.submissions_dir or '.', 'similarity-report.json')
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"🔎 {len(current)} soumission(s), {computed} signature(s) calculée(s), "
+          f"{report['compared']} comparée(s) en {report['duration_s']}s")
+    for cluster in clusters:
+        print(f"👥 {', '.join(cluster['members'])} (similarité {cluster['similarity']:.0%})")
+    if not clusters:
+        print("✅ Aucune soumission quasi identique")
+    print(f"📄 Rapport écrit dans {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Lecture en flux des fichiers de la soumission, à mémoire bornée.
+
+Les fichiers sont lus par blocs de taille fixe ; une ligne plus longue
+qu'un bloc (CSS minifié, bundle copié dans style.css) est découpée en
+segments, de préférence juste après un séparateur CSS (`;`, `}`, `{`, `,`
+ou un blanc) pour ne pas couper une déclaration. Les consommateurs qui
+recherchent des motifs contenant ces séparateurs conservent les derniers
+caractères du segment précédent (OVERLAP) pour détecter une occurrence à
+cheval sur deux segments. La mémoire utilisée reste de l'ordre de
+SEGMENT_SIZE quelle que soit la taille du fichier.
+
+Les fichiers tiers (Bootstrap, normalize.css, fichiers *.min.css...) sont
+reconnus pour ne pas pénaliser l'étudiant sur du code qu'il n'a pas écrit.
+"""
+
+import os
+import re
+import time
+
+import instrumentation
+
+SEGMENT_SIZE = 64 * 1024
+OVERLAP = 256
+
+# Coupure préférée d'une ligne trop longue : juste après l'un de ces caractères
+SEGMENT_BREAK_CHARS = frozenset(';{},')
+SEGMENT_BREAK_LOOKBACK = 4096
+
+VENDORED_NAME_RE = re.compile(r'\.min\.(css|js)$|(^|/)(bootstrap|normalize|tailwind|bulma|foundation|fontawesome|font-awesome|animate|jquery)[.-]', re.I)
+VENDORED_BANNER_RE = re.compile(
+    r'Bootstrap v\d|normalize\.css v\d|Font Awesome|jQuery v\d|tailwindcss v\d|Bulma v\d'
+    r'|Foundation for Sites|animate\.css|@license|\(c\) \d{4}.*(Twitter|MIT)',
+    re.I,
+)
+VENDORED_HEADER_SIZE = 2048
+MINIFIED_MIN_SIZE = 20 * 1024
+MINIFIED_MIN_AVERAGE_LINE = 500
+
+
+def _split_long(pending, segment_size):
+    """Position de coupure d'un segment de ligne trop longue"""
+    for index in range(segment_size - 1, max(0, segment_size - SEGMENT_BREAK_LOOKBACK), -1):
+        char = pending[index]
+        if char in SEGMENT_BREAK_CHARS or char.isspace():
+            return index + 1
+    return segment_size
+
+
+def read_block(f, size):
+    """Lit un bloc du fichier (temps de lecture comptabilisé si l'instrumentation est active)"""
+    if not instrumentation.ENABLED:
+        return f.read(size)
+    started = time.perf_counter()
+    block = f.read(size)
+    instrumentation.add_stage_time('file_read', time.perf_counter() - started)
+    return block
+
+
+def iter_line_segments(path, segment_size=SEGMENT_SIZE, newline=None):
+    """Parcourt un fichier en (numéro de ligne, segment, dernier segment de la ligne ?)
+
+    newline=None : fins de ligne universelles (comme `for line in f`) ;
+    newline=''   : seul '\\n' sépare les lignes (comme grep).
+    """
+    line_number = 1
+    pending = ''
+    open_line = False
+    with open(path, 'r', encoding='utf-8', errors='replace', newline=newline) as f:
+        while True:
+            block = read_block(f, segment_size)
+            pending += block
+            start = 0
+            while True:
+                end = pending.find('\n', start)
+                if end < 0:
+                    break
+                yield line_number, pending[start:end], True
+                line_number += 1
+                start = end + 1
+                open_line = False
+            pending = pending[start:]
+
+            while len(pending) >= segment_size:
+                cut = _split_long(pending, segment_size)
+                yield line_number, pending[:cut], False
+                pending = pending[cut:]
+                open_line = True
+
+            if not block:
+                break
+
+    if pending or open_line:
+        yield line_number, pending, True
+
+
+def detect_vendored(path, name=None):
+    """Raison pour laquelle le fichier semble être une bibliothèque tierce, ou None"""
+    if os.environ.get('ANALYZE_VENDORED', 'false').lower() == 'true':
+        return None
+
+    name = name or os.path.basename(path)
+    if VENDORED_NAME_RE.search(name):
+        return f'fichier de bibliothèque {os.path.basename(name)}'
+
+    try:
+        size = os.path.getsize(path)
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            header = f.read(VENDORED_HEADER_SIZE)
+    except OSError:
+        return None
+
+    banner = VENDORED_BANNER_RE.search(header)
+    if banner:
+        return f'bannière « {banner.group(0)} »'
+
+    if size >= MINIFIED_MIN_SIZE:
+        newlines = 0
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(SEGMENT_SIZE), b''):
+                newlines += block.count(b'\n')
+        average = size / (newlines + 1)
+        if average >= MINIFIED_MIN_AVERAGE_LINE:
+            return f'code minifié, {int(average)} caractères par ligne en moyenne'
+
+    return None
+
+
+def vendored_finding(file_name, reason):
+    """Finding informatif signalant un fichier tiers ignoré"""
+    return {
+        'file': file_name,
+        'line': 0,
+        'severity': 'info',
+        'issue': f'Fichier tiers détecté ({reason}) : non pris en compte dans la note',
+        'suggestion': 'Liez la bibliothèque dans un fichier séparé (ou via un CDN) et écrivez vos propres styles dans ce fichier',
+        'rule': 'vendored-file',
+        'penalty': 0,
+    }
@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+
+"""Configuration pytest : les scripts s'importent entre eux par leur nom de module."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+import time
+import asyncio
+
+import pytest
+
+import generate_feedback
+from ai_client import AIClient, TransientError, evaluate_with_deadline
+
+
+class InstantClient:
+    async def evaluate(self, payload):
+        return {'score': 17, 'source': 'ai'}
+
+
+def slow_analysis(*args, **kwargs):
+    time.sleep(30)
+
+
+def test_negative_retries_make_a_single_attempt():
+    client = AIClient('http://127.0.0.1:1/evaluate', timeout=1, retries=-1)
+    assert client.retries == 0
+
+    async def post():
+        async with client:
+            await client.post_json({})
+
+    with pytest.raises(TransientError):
+        asyncio.run(post())
+
+
+def test_local_analysis_is_stopped_when_ai_wins(tmp_path, monkeypatch):
+    (tmp_path / 'index.html').write_text('<p>x</p>\n', encoding='utf-8')
+    monkeypatch.setenv('ANALYSIS_WALL_SECONDS', '0')
+    monkeypatch.setenv('ANALYSIS_CPU_SECONDS', '0')
+    monkeypatch.setenv('ANALYSIS_MEMORY_MB', '0')
+    # Le processus d'analyse (fork) hérite de cette analyse sans fin
+    monkeypatch.setattr(generate_feedback, 'analyze_files_locally', slow_analysis)
+
+    started = time.monotonic()
+    ai_data, source = asyncio.run(evaluate_with_deadline(InstantClient(), {}, str(tmp_path), deadline=5))
+    assert (ai_data['score'], source) == (17, 'ai')
+    assert time.monotonic() - started < 5
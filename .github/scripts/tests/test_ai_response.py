@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+import io
+import json
+
+import pytest
+
+from ai_response import AIResponseError, parse_ai_response, read_ai_response, write_ai_response
+
+AI_DATA = {
+    'score': 17,
+    'summary': 'Page bien structurée — quelques détails à corriger.',
+    'strengths': ['Balises sémantiques'],
+    'technicalDetails': [
+        {'file': 'index.html', 'line': 12, 'severity': 'error', 'issue': 'Image sans alt', 'penalty': 2},
+        {'file': 'style.css', 'line': '4', 'severity': 'warning', 'issue': 'Unité absolue'},
+    ],
+}
+
+
+def summary(evaluation):
+    return (evaluation.score, evaluation.summary, [(f.file, f.line, f.rule) for f in evaluation.findings])
+
+
+EXPECTED = (17, AI_DATA['summary'], [('index.html', 12, 'ai-review'), ('style.css', 4, 'ai-review')])
+
+
+def test_response_file(tmp_path):
+    path = write_ai_response(str(tmp_path / 'ai' / 'response.json'), AI_DATA)
+    assert summary(read_ai_response({'AI_RESPONSE_FILE': path})) == EXPECTED
+
+    with pytest.raises(AIResponseError, match='lecture de'):
+        read_ai_response({'AI_RESPONSE_FILE': str(tmp_path / 'absent.json')})
+
+
+def test_response_from_stdin_in_small_blocks():
+    stdin = io.BytesIO(json.dumps(AI_DATA, ensure_ascii=False).encode('utf-8'))
+    assert summary(read_ai_response({'AI_RESPONSE_FILE': '-'}, stdin=stdin)) == EXPECTED
+
+    # Blocs de 7 octets : caractères multi-octets et nombres coupés entre deux lectures
+    stream = io.BytesIO(json.dumps(AI_DATA, ensure_ascii=False).encode('utf-8'))
+    assert summary(parse_ai_response(stream, block_size=7)) == EXPECTED
+
+
+def test_raw_api_response_and_legacy_variable():
+    raw = {'success': True, 'data': {'score': 15, 'analysis': {'summary': 'ok', 'technicalDetails': []}}}
+    assert read_ai_response({'AI_RESPONSE': json.dumps(raw)}).score == 15
+
+    with pytest.raises(AIResponseError):
+        read_ai_response({'AI_RESPONSE': json.dumps({'success': False, 'error': 'quota'})})
+
+
+@pytest.mark.parametrize('score, expected', [(19.5, 20), (12.4, 12), ('17.5', 18), (0.49, 0), (20.0, 20)])
+def test_fractional_score_is_rounded(score, expected):
+    assert parse_ai_response(io.StringIO(json.dumps({'score': score}))).score == expected
+
+
+@pytest.mark.parametrize('score', [20.5, -1, 'vingt', None, True])
+def test_invalid_score_is_rejected(score):
+    with pytest.raises(AIResponseError):
+        parse_ai_response(io.StringIO(json.dumps({'score': score})))
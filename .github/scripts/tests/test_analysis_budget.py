@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+import pytest
+
+import generate_feedback
+from analysis_budget import get_budget
+from exercise_profile import load_profile
+from generate_feedback import (
+    INDEX_STAGE, analyze_files_locally, analyze_files_with_budget, summarize_truncated_analysis,
+)
+
+HTML = '<!DOCTYPE html>\n<html lang="fr"><head><title>Page</title></head><body><main>x</main></body></html>\n'
+FAULTY_CSS = '.a { width: 250%; }\n.b { position: stick; }\n.c { margin-left: -9999px; }\n'
+FILES = [('index.html', 'html'), ('style.css', 'css')]
+BUDGET = {'cpu_seconds': 0, 'wall_seconds': 1, 'memory_mb': 0}
+
+
+@pytest.fixture
+def submission(tmp_path, monkeypatch):
+    monkeypatch.setenv('FILES_TO_ANALYZE', 'index.html,style.css')
+    (tmp_path / 'index.html').write_text(HTML, encoding='utf-8')
+    (tmp_path / 'style.css').write_text(FAULTY_CSS, encoding='utf-8')
+    return tmp_path
+
+
+def test_unanalysed_file_earns_no_points(submission):
+    honest = analyze_files_locally(str(submission), workers=1)
+    html_findings = [f for f in honest['technicalDetails'] if f['file'] == 'index.html']
+    truncated = summarize_truncated_analysis([('index.html', html_findings)], ['style.css'], 'wall', BUDGET,
+                                             files=FILES)
+    assert truncated['score'] <= honest['score']
+    assert truncated['truncated'] == 'wall'
+    [marker] = [f for f in truncated['technicalDetails'] if f['rule'] == 'analysis-truncated']
+    assert marker['file'] == 'style.css' and marker['severity'] == 'error'
+    assert 'pendant l\'analyse de style.css' in truncated['summary']
+
+
+def test_files_never_started_are_penalised():
+    # Arrêt avant le premier message (chemin parallèle, démarrage lent) : rien n'est noté
+    truncated = summarize_truncated_analysis([], [], 'cpu', BUDGET, files=FILES)
+    assert truncated['score'] == 0
+    assert {f['file'] for f in truncated['technicalDetails']} == {'index.html', 'style.css'}
+
+
+def test_several_pending_files_in_parallel():
+    truncated = summarize_truncated_analysis([('index.html', [])], ['style.css', 'theme.css'], 'wall', BUDGET,
+                                             files=FILES + [('theme.css', 'css')])
+    assert 'style.css, theme.css' in truncated['summary']
+    assert sum(f['penalty'] for f in truncated['technicalDetails']) == 40
+
+
+def test_index_stage_interruption_is_not_graded():
+    truncated = summarize_truncated_analysis([('index.html', []), ('style.css', [])], [INDEX_STAGE], 'wall',
+                                             BUDGET, files=FILES)
+    assert truncated['score'] == 0
+    assert 'index croisé' in truncated['summary']
+    [marker] = [f for f in truncated['technicalDetails'] if f['rule'] == 'analysis-truncated']
+    assert marker['severity'] == 'error' and 'note non attribuée' in marker['issue']
+
+
+def test_interruption_after_every_stage_keeps_the_score():
+    truncated = summarize_truncated_analysis([('index.html', []), ('style.css', []), (INDEX_STAGE, [])], [],
+                                             'wall', BUDGET, files=FILES)
+    assert truncated['score'] == 20
+
+
+def test_slow_index_stage_cannot_be_skipped_for_free(submission, monkeypatch):
+    def slow_index(root, files):
+        time.sleep(30)
+
+    # Le processus d'analyse (fork) hérite de cet index croisé sans fin
+    monkeypatch.setattr(generate_feedback, 'analyze_project_index', slow_index)
+    profile = load_profile(str(submission))
+    result = analyze_files_with_budget(str(submission), get_budget({}, wall_seconds=0.5), 1, profile)
+    assert result.get('truncated') == 'wall'
+    assert result['score'] == 0
+
+
+def test_bloated_file_cannot_raise_the_grade(submission):
+    honest = analyze_files_locally(str(submission), workers=1)
+    # Fichier fautif gonflé pour dépasser le budget de durée
+    with open(submission / 'style.css', 'a', encoding='utf-8') as f:
+        f.write('.x { color: red; }\n' * 600_000)
+    profile = load_profile(str(submission))
+    result = analyze_files_with_budget(str(submission), get_budget({}, wall_seconds=0.2), 1, profile)
+    assert result.get('truncated') == 'wall'
+    assert result['score'] <= honest['score']
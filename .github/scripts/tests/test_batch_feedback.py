@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+
+from batch_feedback import discover_submissions, load_manifest, main
+from findings import iter_jsonl
+from generate_feedback import analyze_files_locally
+
+HTML = '<!DOCTYPE html>\n<html lang="fr"><head><title>Page</title></head>\n<body><main class="box">Bonjour</main></body></html>\n'
+CSS = '.box {\n  width: 250%;\n  position: stick;\n}\n'
+
+
+@pytest.fixture
+def promotion(tmp_path, monkeypatch):
+    for name in ('FILES', 'FILES_TO_ANALYZE', 'EXERCISE_PROFILE'):
+        monkeypatch.delenv(name, raising=False)
+    for name, css in (('alice', CSS), ('bob', '.box { color: red; }\n')):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / 'index.html').write_text(HTML, encoding='utf-8')
+        (tmp_path / name / 'style.css').write_text(css, encoding='utf-8')
+    (tmp_path / '.git').mkdir()
+    (tmp_path / 'notes.txt').write_text('x\n', encoding='utf-8')
+    return tmp_path
+
+
+def test_discovery_and_manifests(promotion):
+    assert [s['repository'] for s in discover_submissions(str(promotion))] == ['alice', 'bob']
+
+    (promotion / 'manifest.json').write_text(json.dumps([{'path': 'alice', 'repository': 'promo/alice'},
+                                                         {'path': str(promotion / 'bob')}]), encoding='utf-8')
+    (promotion / 'manifest.txt').write_text('# promotion 2025\nalice\n\nbob/\n', encoding='utf-8')
+    assert load_manifest(str(promotion / 'manifest.json')) == [
+        {'path': str(promotion / 'alice'), 'repository': 'promo/alice'},
+        {'path': str(promotion / 'bob'), 'repository': 'bob'},
+    ]
+    assert [(s['path'], s['repository']) for s in load_manifest(str(promotion / 'manifest.txt'))] == [
+        (str(promotion / 'alice'), 'alice'), (f'{promotion}/bob/', 'bob'),
+    ]
+
+
+def test_batch_writes_feedback_summary_and_jsonl(promotion, tmp_path_factory):
+    output = tmp_path_factory.mktemp('sortie')
+    jsonl = output / 'promotion.jsonl'
+    assert main([str(promotion), '--workers', '1', '--output-dir', str(output), '--jsonl', str(jsonl)]) == 0
+
+    summary = json.loads((output / 'batch-summary.json').read_text(encoding='utf-8'))
+    assert (summary['submissions'], summary['graded'], summary['failed']) == (2, 2, 0)
+    scores = {result['repository']: result['score'] for result in summary['results']}
+    for name in ('alice', 'bob'):
+        assert scores[name] == analyze_files_locally(str(promotion / name), workers=1)['score']
+        assert '/20' in (output / name / 'FEEDBACK.md').read_text(encoding='utf-8')
+        assert not (promotion / name / 'FEEDBACK.md').exists()
+    assert scores['alice'] < scores['bob'] == 20
+    assert {line['repository']: line['score'] for line in iter_jsonl(str(jsonl))} == scores
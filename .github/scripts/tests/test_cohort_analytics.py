@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+import random
+import statistics
+from collections import Counter
+
+import pytest
+
+import cohort_analytics
+from cohort_analytics import analyze_cohort
+from report_renderer import (
+    GLOBAL_STATUS, LEVELS, SCORE_EMOJIS, get_band, get_criterion_level, get_score_emoji, get_threshold_scores,
+    get_validation_level,
+)
+
+WHAT_IF = [(90, 70), (75, 60), (83, 67)]
+
+
+def make_rows(count, seed=7, mixed=True):
+    rng = random.Random(seed)
+    rows = []
+    for index in range(count):
+        max_score = rng.choice((12, 20)) if mixed else 20
+        validation_max = rng.choice((3, 10))
+        criteria = {name: (rng.randint(0, 3), 3) for name in ('structure', 'typography', 'practices')}
+        criteria['validation'] = (rng.randint(0, validation_max), validation_max)
+        if rng.random() < 0.2:
+            del criteria['practices']
+        rows.append({'repository': f'etudiant-{index}', 'score': rng.randint(0, max_score),
+                     'max_score': max_score, 'criteria': criteria})
+    return rows
+
+
+def comparable(stats):
+    return {key: value for key, value in stats.items() if key not in ('generated_at', 'backend')}
+
+
+@pytest.fixture
+def pure_python(monkeypatch):
+    monkeypatch.setattr(cohort_analytics, 'np', None)
+
+
+def test_python_fallback_matches_per_student_report(pure_python):
+    rows = make_rows(200)
+    stats = analyze_cohort(rows, what_if=WHAT_IF)
+    assert stats['backend'] == 'python'
+
+    for name, criterion in stats['criteria'].items():
+        pairs = [row['criteria'][name] for row in rows if name in row['criteria']]
+        levels = Counter(get_validation_level(score, top) if name == 'validation' else get_criterion_level(score)
+                         for score, top in pairs)
+        assert criterion['levels'] == {level: levels[level] for level in LEVELS}
+        assert criterion['students'] == len(pairs)
+
+    for simulation in stats['what_if']:
+        bands = Counter(get_band(row['score'], *get_threshold_scores(row['max_score'], simulation['excellent_threshold'],
+                                                                     simulation['good_threshold']))
+                        for row in rows)
+        assert simulation['bands'] == [bands[0], bands[1], bands[2]]
+    assert list(stats['bands'].values()) == next(s['bands'] for s in stats['what_if']
+                                                  if (s['excellent_threshold'], s['good_threshold']) == (83, 67))
+    assert list(stats['bands']) == [status[2] for status in GLOBAL_STATUS]
+
+    emojis = Counter(get_score_emoji(row['score']) for row in rows if row['max_score'] == 20)
+    assert stats['emojis'] == {emoji: emojis[emoji] for emoji in SCORE_EMOJIS}
+
+    # Barèmes mélangés : percentiles en pourcentage, interpolation linéaire
+    values = [row['score'] * 100 / row['max_score'] for row in rows]
+    cuts = statistics.quantiles(values, n=100, method='inclusive')
+    assert stats['percentiles'] == {str(point): round(cuts[point - 1], 2) for point in cohort_analytics.PERCENTILES}
+
+
+def test_python_fallback_histogram_for_a_single_scale(pure_python):
+    rows = make_rows(50, seed=3, mixed=False)
+    stats = analyze_cohort(rows)
+    assert stats['max_score'] == 20
+    assert stats['histogram'] == [sum(1 for row in rows if row['score'] == score) for score in range(21)]
+    assert analyze_cohort([])['students'] == 0
+
+
+@pytest.mark.parametrize('mixed', [True, False])
+def test_numpy_and_python_give_the_same_statistics(monkeypatch, mixed):
+    numpy = pytest.importorskip('numpy')
+    rows = make_rows(300, seed=11, mixed=mixed)
+    monkeypatch.setattr(cohort_analytics, 'np', numpy)
+    vectorized = analyze_cohort(rows, what_if=WHAT_IF)
+    monkeypatch.setattr(cohort_analytics, 'np', None)
+    fallback = analyze_cohort(rows, what_if=WHAT_IF)
+    assert (vectorized['backend'], fallback['backend']) == ('numpy', 'python')
+    assert comparable(vectorized) == comparable(fallback)
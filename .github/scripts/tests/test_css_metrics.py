@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from css_metrics import evaluate_css
+
+SAMPLE_CSS = (
+    '/* a */ /* b */\n/* c */\n:root {\n  --c: #fff;\n}\n.a .b .c .d {\n'
+    ' font-size: 12px; line-height: 1.2; letter-spacing: 1px; color: #000; }\n'
+    '.x:hover, .y:focus, .z:active {}\n.e{}.f{}.g{}\n'
+)
+VENDORED_CSS = '/*! Bootstrap v5.3.0 */\n:root { --x: 1; }\n.a:hover{font-size:1rem}\n'
+
+
+def scores(result):
+    return (result['structure_score'], result['typography_score'], result['practices_score'], result['css_score'])
+
+
+@pytest.mark.parametrize('css, html, expected', [
+    # Scores relevés avec l'ancien calcul grep du workflow
+    (SAMPLE_CSS, None, (2, 1, 2, 5)),
+    (SAMPLE_CSS, '<p style="color: red">a</p>\n', (2, 1, 1, 4)),
+    ('', None, (3, 2, 2, 7)),
+    ('a { color: red }\n', None, (3, 2, 2, 7)),
+    (VENDORED_CSS, None, (2, 1, 1, 4)),
+])
+def test_scores_match_grep_pipeline(tmp_path, css, html, expected):
+    css_path = tmp_path / 'style.css'
+    css_path.write_text(css, encoding='utf-8')
+    html_path = tmp_path / 'index.html'
+    if html is not None:
+        html_path.write_text(html, encoding='utf-8')
+    assert scores(evaluate_css(str(css_path), str(html_path) if html else '', strict=False)) == expected
+
+
+def test_strict_metrics_penalise_missing_counts_and_vendored_files(tmp_path):
+    css_path = tmp_path / 'style.css'
+    css_path.write_text('a { color: red }\n', encoding='utf-8')
+    assert scores(evaluate_css(str(css_path), '', strict=True)) == (1, 1, 1, 3)
+
+    css_path.write_text(VENDORED_CSS, encoding='utf-8')
+    result = evaluate_css(str(css_path), '', strict=True)
+    assert result['metrics']['vendored']
+    assert scores(result) == (1, 1, 1, 3)
+    assert 'Fichier tiers détecté' in result['errors'][-1]
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from evaluation_server import EvaluationService, get_clone_token, is_authorized
+
+PAYLOAD = {
+    'repositoryUrl': 'https://github.com/ecole/exercice-alice',
+    'competence': 'CSS',
+    'bareme': 'Structure HTML (3pts), Styles CSS (9pts)',
+    'filesToAnalyze': ['index.html', 'style.css'],
+    'files': {
+        'index.html': '<!DOCTYPE html>\n<html lang="fr"><head><title>t</title></head><body><main>x</main></body></html>\n',
+        'style.css': 'main { width: 250%; }\n',
+    },
+}
+
+
+def test_clone_token_only_for_listed_owners():
+    env = {'EVALUATION_GITHUB_TOKEN': 'secret'}
+    assert get_clone_token('https://github.com/ecole/exercice', ('ecole',), env) == 'secret'
+    assert get_clone_token('https://github.com/Ecole/exercice', ('ecole',), env) == 'secret'
+    assert get_clone_token('https://github.com/autre/exercice', ('ecole',), env) is None
+    assert get_clone_token('https://github.com/ecole/exercice', (), env) is None
+
+
+def test_api_key_is_checked():
+    assert is_authorized({}, None)
+    assert is_authorized({'authorization': 'Bearer cle'}, 'cle')
+    assert not is_authorized({}, 'cle')
+    assert not is_authorized({'authorization': 'Bearer autre'}, 'cle')
+    assert not is_authorized({'authorization': 'Basic cle'}, 'cle')
+
+
+def test_evaluate_requires_api_key():
+    service = EvaluationService(workers=1, api_key='cle')
+    body = json.dumps(PAYLOAD).encode()
+    status, payload, headers = asyncio.run(service.dispatch('POST', '/evaluate', {}, body))
+    assert status == 401 and payload['success'] is False and headers == {'WWW-Authenticate': 'Bearer'}
+    assert asyncio.run(service.dispatch('GET', '/health', {}, b''))[0] == 200
+
+
+def test_evaluate_inline_files():
+    service = EvaluationService(workers=1, api_key='cle', budget={})
+    service.start()
+    try:
+        body = json.dumps(PAYLOAD).encode()
+        status, payload, _ = asyncio.run(service.dispatch('POST', '/evaluate', {'authorization': 'Bearer cle'}, body))
+    finally:
+        service.close()
+    assert status == 200 and payload['success'] is True
+    analysis = payload['data']['analysis']
+    assert payload['data']['score'] == analysis['score']
+    assert {'summary', 'strengths', 'improvements', 'technicalDetails'} <= set(analysis)
+    assert 'css-excessive-width' in {finding['rule'] for finding in analysis['technicalDetails']}
+
+
+def test_broken_pool_is_rebuilt_once():
+    service = EvaluationService(workers=2, budget={})
+    service.start()
+
+    async def scenario():
+        # Un processus du pool meurt : toutes les évaluations suivantes voient un pool cassé
+        crash = asyncio.get_running_loop().run_in_executor(service.executor, os._exit, 1)
+        with pytest.raises(BrokenProcessPool):
+            await crash
+        requests = [dict(PAYLOAD, repositoryUrl=f'https://github.com/ecole/exercice-{index}') for index in range(6)]
+        return await asyncio.gather(*(
+            service.dispatch('POST', '/evaluate', {}, json.dumps(request).encode()) for request in requests
+        ))
+
+    try:
+        responses = asyncio.run(scenario())
+        assert [status for status, _, _ in responses] == [200] * 6
+        assert service.generation == 1
+    finally:
+        service.close()
+
+
+def test_cancelled_evaluation_is_503():
+    service = EvaluationService(workers=1, budget={})
+
+    async def scenario():
+        never = asyncio.get_running_loop().create_future()
+
+        async def cancelled_run(key, payload):
+            try:
+                await never
+            finally:
+                del service.inflight[key]
+
+        service._run = cancelled_run
+        response = asyncio.ensure_future(service.dispatch('POST', '/evaluate', {}, json.dumps(PAYLOAD).encode()))
+        await asyncio.sleep(0)
+        for task in service.inflight.values():
+            task.cancel()
+        return await response
+
+    status, payload, headers = asyncio.run(scenario())
+    assert status == 503 and payload['success'] is False and headers == {'Retry-After': '1'}
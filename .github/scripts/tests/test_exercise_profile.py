@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+
+from exercise_profile import load_profile, parse_config
+from generate_feedback import analyze_files_locally
+
+CSS = '.box {\n  width: 250%;\n}\n'
+
+
+def test_parse_config_ignores_commented_examples():
+    values = parse_config('# NIVEAU="avance"\nNIVEAU="debutant"\nRULE_WEIGHTS=\'css-excessive-width=0\'\n')
+    assert values == {'NIVEAU': 'debutant', 'RULE_WEIGHTS': 'css-excessive-width=0'}
+
+
+def test_rule_weights_change_the_local_score(tmp_path):
+    (tmp_path / 'style.css').write_text(CSS, encoding='utf-8')
+    env = {'FILES_TO_ANALYZE': 'style.css'}
+    default = analyze_files_locally(str(tmp_path), 1, load_profile(str(tmp_path), env))
+    [finding] = [f for f in default['technicalDetails'] if f['rule'] == 'css-excessive-width']
+
+    weighted_profile = load_profile(str(tmp_path), dict(env, RULE_WEIGHTS='css-excessive-width=5'))
+    assert weighted_profile['weights'] == {'css-excessive-width': 5}
+    weighted = analyze_files_locally(str(tmp_path), 1, weighted_profile)
+    assert weighted['score'] == default['score'] + finding['penalty'] - 5
+
+    (tmp_path / '.evaluation-config').write_text('RULE_WEIGHTS="css-excessive-width=0"\n', encoding='utf-8')
+    ignored = analyze_files_locally(str(tmp_path), 1, load_profile(str(tmp_path), env))
+    assert ignored['score'] == default['score'] + finding['penalty']
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+
+from findings import (
+    Evaluation, Finding, get_export_formats, iter_jsonl, parse_criteria_errors, to_sarif, write_exports,
+)
+from generate_feedback import analyze_files_locally
+from report_renderer import render_ai_report
+
+HTML = '<html><head><title>Page</title></head>\n<body><center>Bonjour</center>\n<img src="a.png">\n</body></html>\n'
+CSS = '.box {\n  width: 250%;\n  position: stick;\n}\n'
+
+CRITERIA_SCORES = {
+    'html_score': 2, 'html_max_score': 3, 'total_score': 7, 'total_max_score': 12,
+    'structure_score': 2, 'typography_score': 1, 'practices_score': 2,
+}
+
+
+@pytest.fixture
+def local_result(tmp_path, monkeypatch):
+    monkeypatch.setenv('FILES_TO_ANALYZE', 'index.html,style.css')
+    (tmp_path / 'index.html').write_text(HTML, encoding='utf-8')
+    (tmp_path / 'style.css').write_text(CSS, encoding='utf-8')
+    return analyze_files_locally(str(tmp_path), workers=1)
+
+
+def render(ai_data):
+    return render_ai_report(ai_data, 'r/x', 'HTML/CSS', 'Débutant', '01/01/2026 à 10:00')
+
+
+def test_finding_from_dict_normalises_fields():
+    finding = Finding.from_dict({'file': 'a.css', 'line': '12', 'severity': 'fatal', 'penalty': 'x'}, 'ai-review')
+    assert (finding.line, finding.severity, finding.rule, finding.penalty) == (12, 'info', 'ai-review', 0)
+    assert 'column' not in finding.to_dict()
+
+
+def test_local_evaluation_keeps_score_and_report(local_result):
+    assert local_result['technicalDetails']
+    evaluation = Evaluation.from_ai_data(local_result, 'local')
+    assert evaluation.score == local_result['score']
+    assert evaluation.to_ai_data()['technicalDetails'] == local_result['technicalDetails']
+
+    # Le rapport rendu depuis le modèle est celui des données brutes
+    assert render(evaluation.to_ai_data()) == render(local_result)
+
+
+def test_evaluation_round_trip(local_result):
+    evaluation = Evaluation.from_criteria(CRITERIA_SCORES, '❌ Ligne 3: img sans alt', '❌ **Structure**: x\n')
+    for original in (evaluation, Evaluation.from_ai_data(local_result, 'local')):
+        restored = Evaluation.from_dict(json.loads(json.dumps(original.to_dict())))
+        assert restored.to_dict() == original.to_dict()
+
+
+def test_criteria_evaluation_scores_and_findings():
+    evaluation = Evaluation.from_criteria(
+        CRITERIA_SCORES,
+        '❌ Ligne 3: Élément img sans attribut alt\nErreur de validation',
+        '❌ **Structure**: Aucune variable CSS\n⚠️ **Couleurs**: Peu de couleurs\n',
+    )
+    assert (evaluation.score, evaluation.max_score) == (7, 12)
+    assert evaluation.criteria['validation'] == (2, 3)
+    assert [(f.file, f.line, f.severity, f.rule) for f in evaluation.findings] == [
+        ('index.html', 3, 'error', 'html-validation'),
+        ('index.html', 0, 'error', 'html-validation'),
+        ('style.css', 0, 'error', 'css-structure'),
+        ('style.css', 0, 'warning', 'css-couleurs'),
+    ]
+    assert evaluation.error_count == 3
+    assert parse_criteria_errors('', '') == []
+
+
+def test_sarif_export(local_result):
+    evaluation = Evaluation.from_ai_data(local_result, 'local')
+    sarif = to_sarif(evaluation)
+    run = sarif['runs'][0]
+    assert sarif['version'] == '2.1.0'
+    assert len(run['results']) == len(evaluation.findings)
+    assert len({rule['id'] for rule in run['tool']['driver']['rules']}) == len(run['tool']['driver']['rules'])
+    assert {result['level'] for result in run['results']} <= {'error', 'warning', 'note'}
+    for finding, result in zip(evaluation.findings, run['results']):
+        location = result['locations'][0]['physicalLocation']
+        assert location['artifactLocation']['uri'] == finding.file
+        assert location.get('region', {}).get('startLine', 0) == finding.line
+    assert run['properties'] == {'score': evaluation.score, 'maxScore': 20}
+
+
+def test_write_exports(tmp_path, local_result):
+    evaluation = Evaluation.from_ai_data(local_result, 'local')
+    formats = get_export_formats(' JSON, jsonl,,sarif,pdf ')
+    assert formats == ['json', 'jsonl', 'sarif', 'pdf']
+
+    for _ in range(2):
+        written = write_exports(evaluation, formats, str(tmp_path), repository='r/x')
+    assert [path.rsplit('/', 1)[-1] for path in written] == ['FEEDBACK.json', 'feedback.jsonl', 'FEEDBACK.sarif']
+
+    data = json.loads((tmp_path / 'FEEDBACK.json').read_text(encoding='utf-8'))
+    assert (data['repository'], data['score']) == ('r/x', evaluation.score)
+    lines = list(iter_jsonl(str(tmp_path / 'feedback.jsonl')))
+    assert len(lines) == 2
+    assert Evaluation.from_dict(lines[-1]).to_dict() == evaluation.to_dict()
+    json.loads((tmp_path / 'FEEDBACK.sarif').read_text(encoding='utf-8'))
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from html_validator import score_validation, validate_html_file
+
+HEAD = '<!DOCTYPE html>\n<html lang="fr"><head><title>Page</title></head><body>\n'
+FOOT = '\n</body></html>\n'
+
+
+def validate(tmp_path, body):
+    path = tmp_path / 'index.html'
+    path.write_text(HEAD + body + FOOT, encoding='utf-8')
+    return [message for message in validate_html_file(str(path)) if message['severity'] == 'error']
+
+
+@pytest.mark.parametrize('body', [
+    '<ul><li>a<li>b<li>c</ul>',
+    '<ul><li><p>a<li>b</ul>',
+    '<p>one<p>two</p><table><tr><td>1</td></tr></table>',
+    '<table><tr><td>1<td>2<tr><th>3<td>4</table>',
+    '<table><thead><tr><th>h<tbody><tr><td>1<tfoot><tr><td>f</table>',
+    '<dl><dt>x<dd>y<dt>z<dd>w</dl>',
+    '<select><option>a<option>b</select>',
+    '<p>paragraphe<div>bloc</div>',
+    '<ul><li>a<ul><li>b<li>c</ul><li>d</ul>',
+])
+def test_optional_end_tags_are_valid(tmp_path, body):
+    assert validate(tmp_path, body) == []
+
+
+@pytest.mark.parametrize('body, issue', [
+    ('<ul><li><div><li>x</div></ul>', 'Élément <li> interdit comme enfant de <div>'),
+    ('<p><span><div>b</div></span></p>', 'Élément <div> interdit à l\'intérieur de <p>'),
+    ('<p>texte<div>b</div></p>', 'Élément <div> interdit à l\'intérieur de <p>'),
+    ('<p>texte<ul><li>a</li></ul>suite</p>', 'Élément <ul> interdit à l\'intérieur de <p>'),
+    ('<p>a</p></p>', 'Balise fermante </p> sans ouverture correspondante'),
+    ('<li>orphelin</li>', 'Élément <li> interdit comme enfant de <body>'),
+    ('<a href="#"><button>x</button></a>', 'Élément interactif <button> interdit à l\'intérieur de <a>'),
+])
+def test_invalid_nesting_is_reported(tmp_path, body, issue):
+    assert [error['issue'] for error in validate(tmp_path, body)] == [issue]
+
+
+def test_valid_page_keeps_full_score(tmp_path):
+    path = tmp_path / 'index.html'
+    path.write_text(HEAD + '<ul><li>a<li>b</ul><dl><dt>x<dd>y</dl><p>un<p>deux' + FOOT, encoding='utf-8')
+    assert score_validation(validate_html_file(str(path)), 10)['html_score'] == 10
+
+
+def test_missing_lang_is_a_warning_without_penalty(tmp_path):
+    path = tmp_path / 'index.html'
+    path.write_text(HEAD.replace(' lang="fr"', '') + '<p>a</p>' + FOOT, encoding='utf-8')
+    messages = validate_html_file(str(path))
+    assert [(m['rule'], m['severity'], m['penalty']) for m in messages] == [('html-missing-lang', 'warning', 0)]
+    assert score_validation(messages, 3)['html_score'] == 3
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+import subprocess
+
+import pytest
+
+from generate_feedback import analyze_files_locally
+from incremental import evaluate_incrementally, parse_unified_diff, shift_line
+
+HTML = '<!DOCTYPE html>\n<html lang="fr"><head><title>Page</title>\n<link rel="stylesheet" href="style.css"></head>\n<body><main class="box">Bonjour</main></body></html>\n'
+CSS = '.box {\n  color: red;\n  width: 150%;\n}\n'
+
+
+def git(root, *args):
+    subprocess.run(['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args],
+                   cwd=root, check=True, capture_output=True)
+
+
+@pytest.fixture
+def submission(tmp_path, monkeypatch):
+    monkeypatch.setenv('FILES_TO_ANALYZE', 'index.html,style.css')
+    (tmp_path / 'index.html').write_text(HTML, encoding='utf-8')
+    (tmp_path / 'style.css').write_text(CSS, encoding='utf-8')
+    git(tmp_path, 'init', '-q')
+    git(tmp_path, 'add', '.')
+    git(tmp_path, 'commit', '-q', '-m', 'init')
+    return tmp_path
+
+
+def findings(result):
+    return sorted((f['file'], f['line'], f['rule']) for f in result['technicalDetails'])
+
+
+def assert_matches_full_analysis(root):
+    state = str(root / '.feedback-state.json')
+    result = evaluate_incrementally(str(root), state)
+    full = analyze_files_locally(str(root), workers=1)
+    assert findings(result) == findings(full)
+    assert result['score'] == full['score']
+
+
+def test_uncommitted_changes_are_applied_once(submission):
+    assert_matches_full_analysis(submission)
+    style = submission / 'style.css'
+    style.write_text('.b { width: 250%; }\n' + CSS, encoding='utf-8')
+    # Modification non commitée : chaque réévaluation doit donner le même résultat
+    for _ in range(3):
+        assert_matches_full_analysis(submission)
+
+    style.write_text(style.read_text(encoding='utf-8') + '.c { height: 300%; }\n', encoding='utf-8')
+    assert_matches_full_analysis(submission)
+    git(submission, 'commit', '-q', '-am', 'styles')
+    assert_matches_full_analysis(submission)
+
+
+def test_untracked_file_changes_are_detected(submission, monkeypatch):
+    monkeypatch.setenv('FILES_TO_ANALYZE', 'index.html,style.css,theme.css')
+    assert_matches_full_analysis(submission)
+    theme = submission / 'theme.css'
+    theme.write_text('.a { width: 200%; }\n', encoding='utf-8')
+    assert_matches_full_analysis(submission)
+    theme.write_text('.z { color: blue; }\n.a { width: 200%; }\n', encoding='utf-8')
+    assert_matches_full_analysis(submission)
+
+
+def test_shift_line_follows_hunks():
+    hunks = parse_unified_diff(
+        'diff --git a/style.css b/style.css\n--- a/style.css\n+++ b/style.css\n'
+        '@@ -0,0 +1,2 @@\n+a\n+b\n@@ -5 +7 @@\n-x\n+y\n'
+    )['style.css']
+    assert shift_line(1, hunks) == 3
+    assert shift_line(5, hunks) is None
+    assert shift_line(6, hunks) == 8
+
+
+def test_submission_in_a_subdirectory_of_the_repository(tmp_path, monkeypatch):
+    monkeypatch.setenv('FILES_TO_ANALYZE', 'index.html,style.css')
+    root = tmp_path / 'site'
+    root.mkdir()
+    (root / 'index.html').write_text(HTML, encoding='utf-8')
+    (root / 'style.css').write_text(CSS, encoding='utf-8')
+    (tmp_path / 'style.css').write_text('.autre { width: 500%; }\n', encoding='utf-8')
+    git(tmp_path, 'init', '-q')
+    git(tmp_path, 'add', '.')
+    git(tmp_path, 'commit', '-q', '-m', 'init')
+
+    assert_matches_full_analysis(root)
+    # Chemins du diff relatifs à la soumission, pas à la racine du dépôt
+    (root / 'style.css').write_text('.b { width: 250%; }\n' + CSS, encoding='utf-8')
+    (tmp_path / 'style.css').write_text('.x { height: 300%; }\n.autre { width: 500%; }\n', encoding='utf-8')
+    assert_matches_full_analysis(root)
+    git(tmp_path, 'commit', '-q', '-am', 'styles')
+    assert_matches_full_analysis(root)
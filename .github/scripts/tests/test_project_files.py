@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from project_files import discover_files
+
+TREE = (
+    'index.html', 'about.htm', 'style.css', 'notes.txt',
+    'pages/contact.html', 'pages/blog/post.html', 'css/theme.css', 'js/app.js',
+    'node_modules/lib/index.html', 'dist/index.html', 'build/style.css', 'vendor/bootstrap.css',
+    '.cache/page.html', 'pages/.brouillon/old.html', '.github/template.html',
+)
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    for name in ('FILES', 'FILES_TO_ANALYZE', 'EXERCISE_PROFILE'):
+        monkeypatch.delenv(name, raising=False)
+    for name in TREE:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('x\n', encoding='utf-8')
+    return str(tmp_path)
+
+
+def test_recursive_pattern_skips_dependencies_outputs_and_hidden_directories(project):
+    assert discover_files(project, ['**/*.html']) == [
+        ('index.html', 'html'), ('pages/blog/post.html', 'html'), ('pages/contact.html', 'html'),
+    ]
+    assert discover_files(project, ['**/*.css']) == [('css/theme.css', 'css'), ('style.css', 'css')]
+
+
+def test_patterns_keep_order_without_duplicates(project):
+    assert discover_files(project, ['style.css', '*.htm*', 'index.html', 'js/*.js', 'absent.html', 'notes.txt']) == [
+        ('style.css', 'css'), ('about.htm', 'html'), ('index.html', 'html'), ('js/app.js', 'js'),
+    ]
+
+
+def test_default_list_comes_from_the_profile(project, monkeypatch):
+    assert discover_files(project) == [('index.html', 'html'), ('style.css', 'css')]
+    monkeypatch.setenv('FILES_TO_ANALYZE', 'pages/*.html, js/app.js')
+    assert discover_files(project) == [('pages/contact.html', 'html'), ('js/app.js', 'js')]
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+import json
+import sqlite3
+
+import pytest
+
+import generate_feedback
+import result_cache
+
+HTML = '<!DOCTYPE html>\n<html lang="fr"><head><title>Page</title>\n<link rel="stylesheet" href="style.css"></head>\n<body><main class="box">Bonjour</main></body></html>\n'
+CSS = '.box {\n  color: red;\n  width: 150%;\n}\n'
+
+
+@pytest.fixture
+def submission(tmp_path, monkeypatch):
+    (tmp_path / 'index.html').write_text(HTML, encoding='utf-8')
+    (tmp_path / 'style.css').write_text(CSS, encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('FEEDBACK_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setenv('FEEDBACK_HISTORY_DB', str(tmp_path / 'cache' / 'history.sqlite'))
+    monkeypatch.setenv('FEEDBACK_EXPORTS', 'jsonl')
+    monkeypatch.setenv('REPOSITORY', 'promo/etudiant')
+    monkeypatch.setenv('FILES_TO_ANALYZE', 'index.html,style.css')
+    monkeypatch.setenv('AI_AVAILABLE', 'false')
+    return tmp_path
+
+
+def run(monkeypatch, commit):
+    monkeypatch.setenv('GITHUB_SHA', commit)
+    assert generate_feedback.main() in (None, 0)
+
+
+def history_commits(root):
+    with sqlite3.connect(root / 'cache' / 'history.sqlite') as conn:
+        return [row[0] for row in conn.execute('SELECT commit_sha FROM evaluations ORDER BY id')]
+
+
+def assert_cache_hit_is_recorded(root, monkeypatch, capsys):
+    run(monkeypatch, 'a' * 40)
+    first = (root / 'FEEDBACK.md').read_text(encoding='utf-8')
+    assert 'Progression' not in first
+
+    # Commit qui ne touche pas les fichiers évalués : succès du cache
+    run(monkeypatch, 'b' * 40)
+    assert 'restaurée depuis le cache' in capsys.readouterr().out
+    second = (root / 'FEEDBACK.md').read_text(encoding='utf-8')
+    assert 'Progression' in second and 'aaaaaaa' in second
+
+    assert history_commits(root) == ['a' * 40, 'b' * 40]
+    exported = [json.loads(line) for line in (root / 'feedback.jsonl').read_text(encoding='utf-8').splitlines()]
+    assert len(exported) == 2
+    assert exported[0]['score'] == exported[1]['score']
+    return first, second
+
+
+def test_cache_hit_records_and_exports_local_evaluation(submission, monkeypatch, capsys):
+    first, second = assert_cache_hit_is_recorded(submission, monkeypatch, capsys)
+    # Seule la ligne de progression s'ajoute : date de génération et contenu conservés
+    progression = next(line for line in second.splitlines() if 'Progression' in line)
+    assert second.replace(f'\n\n{progression}', '') == first
+
+
+def test_cache_hit_rerenders_criteria_report(submission, monkeypatch, capsys):
+    # Aucun fichier à analyser localement : rapport par critères du workflow
+    monkeypatch.setenv('FILES_TO_ANALYZE', 'absent.html')
+    for name, value in (('HTML_SCORE', '2'), ('CSS_SCORE', '6'), ('STRUCTURE_SCORE', '2'),
+                        ('TYPOGRAPHY_SCORE', '2'), ('PRACTICES_SCORE', '2')):
+        monkeypatch.setenv(name, value)
+    assert_cache_hit_is_recorded(submission, monkeypatch, capsys)
+
+
+def test_cache_key_follows_files_of_exercise_profile(tmp_path):
+    (tmp_path / 'index.html').write_text(HTML, encoding='utf-8')
+    (tmp_path / 'exercice.config').write_text('FILES_TO_ANALYZE="*.html"\n', encoding='utf-8')
+    env = {'EXERCISE_PROFILE': 'exercice.config'}
+    first = result_cache.compute_cache_key(str(tmp_path), env)
+
+    # Page désignée par le seul motif du profil : ajout puis modification
+    (tmp_path / 'contact.html').write_text(HTML, encoding='utf-8')
+    second = result_cache.compute_cache_key(str(tmp_path), env)
+    (tmp_path / 'contact.html').write_text(HTML.replace('Bonjour', 'Contact'), encoding='utf-8')
+    third = result_cache.compute_cache_key(str(tmp_path), env)
+    assert len({first, second, third}) == 3
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+import random
+
+from rules import (
+    COMPILED_RULES, apply_rules_to_file, compile_literal_matcher, compile_rules, find_rules, match_line,
+    required_literals,
+)
+
+OVERLAPPING_RULES = [
+    {'id': 'wide', 'file_type': 'css', 'pattern': r'width: 250%', 'severity': 'error', 'penalty': 4,
+     'issue': 'Largeur excessive', 'suggestion': ''},
+    {'id': 'width', 'file_type': 'css', 'pattern': r'width:', 'severity': 'info', 'penalty': 0,
+     'issue': 'Largeur fixée', 'suggestion': ''},
+    {'id': 'percent', 'file_type': 'css', 'pattern': r'\d+%', 'severity': 'info', 'penalty': 0,
+     'issue': 'Pourcentage', 'suggestion': ''},
+    {'id': 'no-semicolon', 'file_type': 'css', 'pattern': r'width', 'exclude': r';\s*$', 'severity': 'warning',
+     'penalty': 1, 'issue': 'Point-virgule manquant', 'suggestion': ''},
+]
+
+
+def rule_ids(rules):
+    return [rule['id'] for rule in rules]
+
+
+def test_overlapping_rules_all_fire():
+    compiled = compile_rules(OVERLAPPING_RULES)['css']
+    assert rule_ids(match_line(compiled, '  width: 250%;')) == ['wide', 'width', 'percent']
+    assert rule_ids(match_line(compiled, '  width: 250%')) == ['wide', 'width', 'percent', 'no-semicolon']
+    assert match_line(compiled, '  color: red;') == []
+
+
+def test_overlapping_rules_in_split_lines(tmp_path):
+    path = tmp_path / 'style.css'
+    path.write_text('a{color:red}' * 50 + 'width: 250%' + 'b{color:blue}' * 50 + '\n', encoding='utf-8')
+    compiled = compile_rules(OVERLAPPING_RULES)
+    findings = apply_rules_to_file(compiled, 'css', str(path), 'style.css', segment_size=64)
+    assert [f['rule'] for f in findings] == ['wide', 'width', 'percent', 'no-semicolon']
+    assert {f['line'] for f in findings} == {1}
+
+
+def test_required_literals():
+    assert required_literals(r'cursor: pointer|height: 400px') == ('cursor: pointer', 'height: 400px')
+    assert required_literals(r'document\.write(ln)?\s*\(') == ('document.write',)
+    assert required_literals(r'(^|[;{(\s])var\s+[A-Za-z_$]') == ('var',)
+    assert required_literals(r'\d+%') == ('%',)
+    assert required_literals(r'(?i)width') is None
+    assert required_literals(r'\d+') is None
+
+
+def test_builtin_rules_and_excludes():
+    css = COMPILED_RULES['css']
+    assert rule_ids(match_line(css, '.a { width: 250%; cursor: pointer')) == [
+        'css-excessive-width', 'css-missing-semicolon']
+    assert rule_ids(match_line(css, '.a { position: sticky; }')) == []
+    assert rule_ids(match_line(css, '.a { position: stick; }')) == ['css-invalid-position-stick']
+    js = COMPILED_RULES['js']
+    assert rule_ids(match_line(js, 'var a = b == c; console.log(a)')) == [
+        'js-var-declaration', 'js-loose-equality', 'js-console-log']
+    assert rule_ids(match_line(js, 'const a = b === c;')) == []
+
+
+def test_literal_matcher_finds_overlapping_and_nested_literals():
+    literals_by_rule = {0: ('==',), 1: ('!=',), 2: ('width',), 3: ('width: 250%',), 4: ('th: 2',)}
+    matcher, candidates = compile_literal_matcher(literals_by_rule)
+
+    def found(text):
+        return sorted({index for match in matcher.finditer(text) for index in candidates[match.group(1)]})
+
+    assert found('a !== b') == [0, 1]
+    assert found('width: 250%') == [2, 3, 4]
+    assert found('color: red') == []
+
+    # Même ensemble de candidats qu'une recherche littéral par littéral
+    rng = random.Random(4)
+    alphabet = 'ab=!: '
+    for _ in range(200):
+        literals_by_rule = {index: tuple(''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+                                         for _ in range(rng.randint(1, 2)))
+                            for index in range(rng.randint(1, 12))}
+        matcher, candidates = compile_literal_matcher(literals_by_rule)
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        expected = sorted(index for index, literals in literals_by_rule.items()
+                          if any(literal in text for literal in literals))
+        assert found(text) == expected, (literals_by_rule, text)
+
+
+def test_rules_without_literal_are_always_confirmed():
+    rules = OVERLAPPING_RULES + [{'id': 'digits', 'file_type': 'css', 'pattern': r'\d{3}', 'severity': 'info',
+                                  'penalty': 0, 'issue': 'Nombre', 'suggestion': ''}]
+    compiled = compile_rules(rules)['css']
+    assert [rule['id'] for _, rule in find_rules(compiled, 'margin: 100px;')] == ['digits']
+    assert find_rules(compiled, 'margin: 0;') == []
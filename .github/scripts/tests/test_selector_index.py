@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+from selector_index import analyze_project_index, index_css_file
+
+HTML = (
+    '<!DOCTYPE html>\n<html lang="fr"><head><title>Page</title></head>\n<body>\n'
+    '<nav class="menu"><a href="#contact">Contact</a> <a href="#top">Haut</a></nav>\n'
+    '<main class="carte btn">Bonjour</main>\n</body></html>\n'
+)
+CSS = '.menu { color: red; }\n.carte { margin: 0; }\n.ancien { color: blue; }\n#page .a .b .c .d { color: green; }\n'
+FILES = [('index.html', 'html'), ('style.css', 'css')]
+
+
+def write(root, **contents):
+    for name, text in contents.items():
+        (root / name.replace('_', '.')).write_text(text, encoding='utf-8')
+
+
+def by_rule(findings):
+    grouped = {}
+    for finding in findings:
+        grouped.setdefault(finding['rule'], []).append((finding['file'], finding['line']))
+    return grouped
+
+
+def test_unused_and_undefined_selectors(tmp_path):
+    write(tmp_path, index_html=HTML, style_css=CSS)
+    findings = by_rule(analyze_project_index(str(tmp_path), FILES))
+    # .ancien et #page... ne correspondent à aucun élément ; .menu et .carte sont utilisées
+    assert findings['css-unused-selector'] == [('style.css', 3), ('style.css', 4)]
+    assert findings['css-specificity-hotspot'] == [('style.css', 4)]
+    # .btn n'est définie nulle part ; #top est une ancre implicite
+    assert findings['html-undefined-class'] == [('index.html', 5)]
+    assert findings['html-undefined-id'] == [('index.html', 4)]
+    assert all(finding['penalty'] == 0 for finding in analyze_project_index(str(tmp_path), FILES))
+
+
+def test_classes_added_by_script_are_used(tmp_path):
+    write(tmp_path, index_html=HTML, style_css=CSS, script_js="menu.classList.add('ancien');\n")
+    findings = by_rule(analyze_project_index(str(tmp_path), FILES + [('script.js', 'js')]))
+    assert findings['css-unused-selector'] == [('style.css', 4)]
+
+
+def test_vendored_stylesheet_is_not_parsed(tmp_path):
+    library = '/*! Bootstrap v5.3.0 */\n.btn { padding: 1rem; }\n.modal .fade .show .in { top: 0; }\n'
+    write(tmp_path, index_html=HTML, style_css=CSS, bootstrap_css=library)
+    index = index_css_file(str(tmp_path / 'bootstrap.css'), 'bootstrap.css')
+    assert index['vendored'] and index['selectors'] == []
+    assert {'btn', 'modal', 'fade'} <= index['classes']
+
+    findings = analyze_project_index(str(tmp_path), FILES + [('bootstrap.css', 'css')])
+    assert not [f for f in findings if f['file'] == 'bootstrap.css']
+    # .btn est fournie par la bibliothèque : plus signalée comme indéfinie
+    assert 'html-undefined-class' not in by_rule(findings)
+
+
+def test_minified_stylesheet_is_not_parsed(tmp_path):
+    minified = '.x{color:red}' * 4000
+    write(tmp_path, index_html=HTML, style_css=minified)
+    index = index_css_file(str(tmp_path / 'style.css'), 'style.css')
+    assert index['vendored'] and index['selectors'] == [] and index['classes'] == {'x'}
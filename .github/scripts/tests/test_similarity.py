@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+import similarity
+from batch_feedback import discover_submissions
+
+HTML = '''<!DOCTYPE html>
+<html lang="fr">
+<head><title>Portfolio</title><link rel="stylesheet" href="style.css"></head>
+<body>
+  <header class="entete"><h1 class="titre">Marie Curie</h1>
+    <nav class="menu"><a href="#projets">Projets</a> <a href="#contact">Contact</a></nav></header>
+  <main id="contenu">
+    <section id="projets" class="grille"><article class="carte"><h2>Radium</h2>
+      <p>Découverte du radium et du polonium avec Pierre en 1898.</p></article>
+      <article class="carte"><h2>Prix Nobel</h2><p>Deux prix Nobel en physique puis en chimie.</p></article>
+    </section>
+    <section id="contact"><p>Écrivez-moi pour parler de science.</p></section>
+  </main>
+</body>
+</html>
+'''
+CSS = '''.entete { display: flex; justify-content: space-between; padding: 1rem; }
+.titre { font-size: 2rem; color: #333; }
+.menu a { margin: 0 0.5rem; text-decoration: none; }
+.grille { display: grid; grid-template-columns: repeat(2, 1fr); gap: 1rem; }
+.carte { border: 1px solid #ccc; border-radius: 8px; padding: 1rem; }
+#contenu { max-width: 960px; margin: 0 auto; }
+'''
+OTHER_HTML = '''<!DOCTYPE html>
+<html lang="fr">
+<head><title>Recettes</title></head>
+<body>
+  <h1>Mes recettes de cuisine</h1>
+  <ol class="etapes"><li>Éplucher les pommes de terre</li><li>Couper en rondelles fines</li>
+  <li>Faire revenir les oignons dans le beurre</li><li>Gratiner au four trente minutes</li></ol>
+  <table><tr><th>Ingrédient</th><th>Quantité</th></tr><tr><td>Crème</td><td>20 cl</td></tr></table>
+  <footer>Bon appétit à toutes et à tous</footer>
+</body>
+</html>
+'''
+OTHER_CSS = 'body { font-family: Georgia, serif; background: linear-gradient(#fff, #eee); }\nol.etapes li { line-height: 1.8; }\n'
+
+
+def disguise(text):
+    """Copie maquillée : classes renommées, blancs et commentaires ajoutés"""
+    for old, new in (('entete', 'haut'), ('titre', 'nom'), ('menu', 'liens'), ('grille', 'galerie'),
+                     ('carte', 'bloc'), ('contenu', 'principal')):
+        text = text.replace(old, new)
+    return '/* copie */\n' + text.replace('; ', ';\n    ').replace('{ ', '{\n    ') + '\n\n'
+
+
+@pytest.fixture
+def submissions(tmp_path, monkeypatch):
+    for name in ('FILES', 'FILES_TO_ANALYZE', 'EXERCISE_PROFILE'):
+        monkeypatch.delenv(name, raising=False)
+    for name, html, css in (('alice', HTML, CSS),
+                            ('bob', disguise(HTML).replace('/* copie */', '<!-- copie -->'), disguise(CSS)),
+                            ('chloe', OTHER_HTML, OTHER_CSS)):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / 'index.html').write_text(html, encoding='utf-8')
+        (tmp_path / name / 'style.css').write_text(css, encoding='utf-8')
+    return tmp_path
+
+
+def test_disguised_copy_is_paired_but_unrelated_work_is_not(submissions):
+    store = similarity.load_store(None)
+    current, computed = similarity.update_signatures(discover_submissions(str(submissions)), store, workers=1)
+    assert (sorted(current), computed) == (['alice', 'bob', 'chloe'], 3)
+
+    entries = store['entries']
+    assert similarity.estimate_similarity(entries['alice']['signature'], entries['bob']['signature']) >= 0.99
+    assert similarity.estimate_similarity(entries['alice']['signature'], entries['chloe']['signature']) < 0.2
+
+    clusters = similarity.detect_near_duplicates(store, current)
+    assert [cluster['members'] for cluster in clusters] == [['alice', 'bob']]
+
+
+def test_second_run_only_hashes_new_or_changed_submissions(submissions, monkeypatch):
+    store_path = str(submissions / 'signatures.json')
+    store = similarity.load_store(store_path)
+    similarity.update_signatures(discover_submissions(str(submissions)), store, promotion='2025', workers=1)
+    similarity.save_store(store_path, store)
+
+    hashed = []
+    compute_signature = similarity.compute_signature
+    monkeypatch.setattr(similarity, 'compute_signature', lambda task: hashed.append(task['id']) or compute_signature(task))
+
+    (submissions / 'david').mkdir()
+    (submissions / 'david' / 'index.html').write_text(HTML, encoding='utf-8')
+    (submissions / 'chloe' / 'style.css').write_text(OTHER_CSS + 'h1 { color: teal; }\n', encoding='utf-8')
+    store = similarity.load_store(store_path)
+    current, computed = similarity.update_signatures(discover_submissions(str(submissions)), store,
+                                                     promotion='2025', workers=1)
+    assert computed == 2 and sorted(hashed) == ['2025/chloe', '2025/david']
+    assert len(current) == 4 and store['entries']['2025/alice']['signature']
+
+
+def test_signatures_with_other_parameters_are_recomputed(submissions, monkeypatch):
+    store_path = str(submissions / 'signatures.json')
+    store = similarity.load_store(store_path)
+    similarity.update_signatures(discover_submissions(str(submissions)), store, workers=1)
+    similarity.save_store(store_path, store)
+
+    monkeypatch.setattr(similarity, 'NUM_PERM', similarity.NUM_PERM // 2)
+    store = similarity.load_store(store_path)
+    assert store['entries'] == {}
+    _, computed = similarity.update_signatures(discover_submissions(str(submissions)), store, workers=1)
+    assert computed == 3
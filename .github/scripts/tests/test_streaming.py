@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+from rules import COMPILED_RULES, apply_rules_to_file
+from streaming import detect_vendored, iter_line_segments
+
+DECLARATIONS = '.a{color:red}.b{width: 250%;position: stick}.c{margin-left: -9999px}' * 40
+
+
+def test_segments_rebuild_each_line(tmp_path):
+    path = tmp_path / 'style.css'
+    path.write_text(f'a{{}}\n{DECLARATIONS}\r\n\n', encoding='utf-8')
+    lines = {}
+    for line_number, segment, _ in iter_line_segments(str(path), segment_size=64, newline=''):
+        lines[line_number] = lines.get(line_number, '') + segment
+    assert lines == {1: 'a{}', 2: DECLARATIONS + '\r', 3: ''}
+
+
+def test_minified_line_gives_the_same_findings(tmp_path):
+    path = tmp_path / 'style.css'
+    path.write_text(f'body {{}}\n{DECLARATIONS}\n.d {{ width: 250%; }}\n', encoding='utf-8')
+    whole = apply_rules_to_file(COMPILED_RULES, 'css', str(path), 'style.css')
+    assert {(f['line'], f['rule']) for f in whole} >= {
+        (2, 'css-excessive-width'), (2, 'css-invalid-position-stick'), (2, 'css-offscreen-margin'),
+        (3, 'css-excessive-width'),
+    }
+    for segment_size in (16, 64, 200):
+        segmented = apply_rules_to_file(COMPILED_RULES, 'css', str(path), 'style.css', segment_size=segment_size)
+        assert segmented == whole
+
+
+def test_detect_vendored(tmp_path, monkeypatch):
+    library = tmp_path / 'bootstrap.min.css'
+    library.write_text('.a{}\n', encoding='utf-8')
+    own = tmp_path / 'style.css'
+    own.write_text('/* mes styles */\n.a {}\n', encoding='utf-8')
+    assert detect_vendored(str(library))
+    assert detect_vendored(str(own)) is None
+
+    monkeypatch.setenv('ANALYZE_VENDORED', 'true')
+    assert detect_vendored(str(library)) is None
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from watch_feedback import InotifyWatcher, PollingWatcher, WatchSession
+
+HTML = '<!DOCTYPE html>\n<html lang="fr"><head><title>Page</title></head>\n<body><p>Bonjour</p></body></html>\n'
+CSS = '.box {\n  width: 250%;\n}\n'
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    for name in ('FILES', 'FILES_TO_ANALYZE', 'EXERCISE_PROFILE'):
+        monkeypatch.delenv(name, raising=False)
+    (tmp_path / 'index.html').write_text(HTML, encoding='utf-8')
+    (tmp_path / 'style.css').write_text(CSS, encoding='utf-8')
+    return tmp_path
+
+
+def configure(root, files):
+    (root / '.evaluation-config').write_text(f'FILES_TO_ANALYZE="{files}"\n', encoding='utf-8')
+
+
+def start(root):
+    session = WatchSession(str(root), write=False)
+    session.evaluate({name for name, _ in session.files})
+    return session
+
+
+def analysed(session):
+    return sorted({finding['file'] for finding in session.result['technicalDetails']})
+
+
+def test_configuration_change_reloads_profile(project):
+    configure(project, 'index.html')
+    session = start(project)
+    assert '.evaluation-config' in session.watched()[0]
+    assert analysed(session) == []
+
+    configure(project, 'index.html,style.css')
+    changed = session.refresh({'.evaluation-config'})
+    assert changed == {'index.html', 'style.css'}
+    session.evaluate(changed)
+    assert analysed(session) == ['style.css']
+
+
+def test_file_created_for_a_pattern_is_discovered(project):
+    configure(project, '*.css')
+    session = start(project)
+    watcher = PollingWatcher(str(project), *session.watched(), interval=0.01)
+    assert session.refresh(watcher.wait(0)) == set()
+
+    (project / 'print.css').write_text(CSS, encoding='utf-8')
+    changed = session.refresh(watcher.wait(1))
+    assert changed == {'print.css'}
+    _, added, _ = session.evaluate(changed)
+    assert {finding['file'] for finding in added} == {'print.css'}
+
+    watcher.update(*session.watched())
+    (project / 'print.css').unlink()
+    changed = session.refresh(watcher.wait(1))
+    assert changed == {'print.css'}
+    _, _, resolved = session.evaluate(changed)
+    assert {finding['file'] for finding in resolved} == {'print.css'}
+    assert analysed(session) == ['style.css']
+
+
+def test_pattern_directory_is_watched_before_it_has_files(project):
+    configure(project, 'pages/*.css')
+    (project / 'pages').mkdir()
+    session = start(project)
+    assert session.files == [] and 'pages' in session.watched()[1]
+    try:
+        watcher = InotifyWatcher(str(project), *session.watched())
+    except OSError:
+        pytest.skip('inotify indisponible')
+    try:
+        (project / 'pages' / 'a.css').write_text(CSS, encoding='utf-8')
+        assert session.refresh(watcher.wait(1)) == {'pages/a.css'}
+    finally:
+        watcher.close()
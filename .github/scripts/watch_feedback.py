@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Mode surveillance : feedback local en continu pendant que l'étudiant code.
+
+Le processus reste actif avec les règles et les gabarits déjà chargés. À
+chaque enregistrement d'un fichier de l'exercice (détecté par inotify, ou
+par scrutation des dates de modification quand inotify est indisponible),
+seul le fichier modifié est réanalysé ; les findings des autres fichiers
+sont conservés en mémoire. Une modification de .evaluation-config (ou du
+profil EXERCISE_PROFILE) recharge le profil et réanalyse tout ; un fichier
+créé ou supprimé dans un dossier surveillé relance la découverte des
+fichiers, de sorte qu'une page correspondant à un motif (`*.html`) est
+prise en compte dès sa création. Les enregistrements rapprochés (sauvegarde
+automatique, formatage à l'enregistrement) sont regroupés en une seule
+évaluation. FEEDBACK.md est réécrit et les problèmes apparus ou résolus
+sont affichés dans le terminal.
+
+Usage (Codespaces) :
+    python3 .github/scripts/watch_feedback.py [--root .] [--no-write] [--poll]
+"""
+
+import os
+import sys
+import glob
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import argparse
+from collections import Counter
+
+from generate_feedback import analyze_file, summarize_local_findings, render_ai_feedback
+from project_files import discover_files, file_type_of
+from exercise_profile import get_config_paths, load_profile
+from selector_index import cross_file_findings, index_file
+from report_renderer import get_score_emoji
+
+DEBOUNCE_SECONDS = 0.15
+POLL_INTERVAL = 0.3
+
+# Masque inotify : écriture terminée, création, remplacement par renommage, suppression
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """Surveillance du dossier de la soumission par inotify (Linux, via ctypes)"""
+
+    def __init__(self, root, names, directories=()):
+        libc_name = ctypes.util.find_library('c')
+        if not libc_name:
+            raise OSError(errno.ENOSYS, 'libc introuvable')
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, 'inotify indisponible')
+
+        self.libc = libc
+        self.root = root
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1')
+        # Les dossiers plutôt que les fichiers : les éditeurs enregistrent souvent par renommage
+        self.directories = {}
+        try:
+            self.update(names, directories)
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def update(self, names, directories=()):
+        """Fichiers surveillés après une nouvelle découverte ; surveille les nouveaux dossiers"""
+        self.names = set(names)
+        watched = set(self.directories.values())
+        for directory in sorted({os.path.dirname(name) for name in names} | set(directories)):
+            if directory in watched:
+                continue
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(os.path.abspath(os.path.join(self.root, directory))),
+                                             WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), 'inotify_add_watch')
+            self.directories[wd] = directory
+
+    def wait(self, timeout=None):
+        """Noms des fichiers surveillés modifiés (ensemble vide à l'expiration du délai)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                return set()
+            changed = self._read_events()
+            if changed:
+                return changed
+
+    def _read_events(self):
+        changed = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'replace')
+            offset += length
+            directory = self.directories.get(wd, '')
+            if directory:
+                name = f'{directory}/{name}'
+            # Fichier surveillé, fichier analysable ou dossier créés : candidats à la découverte
+            if name in self.names or mask & IN_ISDIR or file_type_of(name):
+                changed.add(name)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Surveillance par scrutation (date de modification et taille)
+
+    La date de modification des dossiers change à chaque création ou
+    suppression d'entrée : le dossier est alors signalé (nom terminé par /).
+    """
+
+    def __init__(self, root, names, directories=(), interval=POLL_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.snapshot = {}
+        self.update(names, directories)
+
+    def update(self, names, directories=()):
+        """Fichiers et dossiers scrutés ; l'état déjà relevé est conservé"""
+        self.paths = {name: os.path.join(self.root, name) for name in names}
+        for directory in directories:
+            self.paths[os.path.join(directory, '')] = os.path.join(self.root, directory)
+        current = self._stat_all()
+        self.snapshot = {name: self.snapshot.get(name, value) for name, value in current.items()}
+
+    def _stat_all(self):
+        snapshot = {}
+        for name, path in self.paths.items():
+            try:
+                stat = os.stat(path)
+                snapshot[name] = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                snapshot[name] = None
+        return snapshot
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._stat_all()
+            changed = {name for name, value in current.items() if value != self.snapshot[name]}
+            self.snapshot = current
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            delay = self.interval if deadline is None else min(self.interval, max(0.0, deadline - time.monotonic()))
+            time.sleep(delay)
+
+    def close(self):
+        pass
+
+
+def create_watcher(root, names, directories=(), poll=False):
+    """inotify si disponible, scrutation sinon"""
+    if not poll:
+        try:
+            return InotifyWatcher(root, names, directories)
+        except (OSError, AttributeError) as e:
+            print(f"⚠️ inotify indisponible ({e}), surveillance par scrutation")
+    return PollingWatcher(root, names, directories)
+
+
+def wait_for_changes(watcher, debounce=DEBOUNCE_SECONDS):
+    """Attend une modification puis regroupe celles qui suivent de près (debounce)"""
+    changed = watcher.wait()
+    while True:
+        more = watcher.wait(debounce)
+        if not more:
+            return changed
+        changed |= more
+
+
+def finding_key(finding):
+    # Sans le numéro de ligne : un ajout de lignes au-dessus ne crée pas de « nouveau » problème
+    return (finding.get('file'), finding.get('rule'), finding.get('issue'))
+
+
+def diff_findings(previous, current):
+    """Findings apparus et résolus entre deux évaluations"""
+    remaining = Counter(finding_key(finding) for finding in previous)
+    added = []
+    for finding in current:
+        key = finding_key(finding)
+        if remaining[key] > 0:
+            remaining[key] -= 1
+        else:
+            added.append(finding)
+
+    unmatched = Counter(finding_key(finding) for finding in current)
+    resolved = []
+    for finding in previous:
+        key = finding_key(finding)
+        if unmatched[key] > 0:
+            unmatched[key] -= 1
+        else:
+            resolved.append(finding)
+    return added, resolved
+
+
+class WatchSession:
+    """Findings en mémoire par fichier ; chaque tour ne réanalyse que les fichiers modifiés"""
+
+    def __init__(self, root='.', write=True, files=None):
+        self.root = root
+        self.write = write
+        # Profil compilé chargé une fois pour toute la session
+        self.profile = load_profile(root)
+        settings = self.profile['settings']
+        self.files = discover_files(root, settings['files_to_analyze']) if files is None else files
+        self.findings = {}
+        self.indexes = {}
+        self.result = None
+        self.repository = os.environ.get('REPOSITORY', 'repository')
+        self.competence = settings['competence']
+        self.niveau = settings['niveau']
+
+    def watched(self):
+        """(fichiers, dossiers) à surveiller : fichiers analysés, configuration et dossiers des motifs"""
+        names = [file_name for file_name, _ in self.files]
+        for path in get_config_paths(self.root):
+            relative_path = os.path.relpath(path, self.root).replace(os.sep, '/')
+            if not relative_path.startswith('../'):
+                names.append(relative_path)
+        directories = {''}
+        for pattern in self.profile['settings']['files_to_analyze']:
+            # Partie fixe du motif : « pages » pour pages/**/*.html
+            fixed = []
+            for part in pattern.split('/')[:-1]:
+                if glob.has_magic(part):
+                    break
+                fixed.append(part)
+            directories.add('/'.join(fixed))
+        directories.update(os.path.dirname(name) for name in names)
+        return names, sorted(d for d in directories if os.path.isdir(os.path.join(self.root, d)))
+
+    def refresh(self, changed):
+        """Fichiers à réanalyser ; profil et liste des fichiers rechargés si besoin
+
+        Un nom inconnu (configuration, fichier créé, dossier) relance la
+        découverte ; un profil modifié fait réanalyser tous les fichiers.
+        """
+        known = {file_name for file_name, _ in self.files}
+        if changed <= known:
+            return set(changed)
+
+        previous_profile = self.profile
+        self.profile = load_profile(self.root)
+        settings = self.profile['settings']
+        self.competence = settings['competence']
+        self.niveau = settings['niveau']
+        self.files = discover_files(self.root, settings['files_to_analyze'])
+        names = {file_name for file_name, _ in self.files}
+
+        removed = set(self.findings) - names
+        for file_name in removed:
+            self.findings.pop(file_name)
+            self.indexes.pop(file_name, None)
+        if self.profile is not previous_profile:
+            return names | removed
+        return (changed & names) | (names - known) | removed
+
+    def evaluate(self, changed):
+        """Réanalyse les fichiers modifiés ; retourne (résultat, apparus, résolus)"""
+        for file_name, file_type in self.files:
+            if file_name not in changed:
+                continue
+            if os.path.exists(os.path.join(self.root, file_name)):
+                self.findings[file_name] = analyze_file(self.root, file_name, file_type, self.profile['checks'])
+                index = index_file(self.root, file_name, file_type)
+                if index is not None:
+                    self.indexes[file_name] = index
+            else:
+                self.findings.pop(file_name, None)
+                self.indexes.pop(file_name, None)
+
+        technical_details = []
+        present = []
+        for file_name, file_type in self.files:
+            if file_name in self.findings:
+                present.append((file_name, file_type))
+                technical_details.extend(self.findings[file_name])
+        # Index croisé recalculé à partir des index par fichier conservés en mémoire
+        technical_details.extend(cross_file_findings(self.indexes))
+
+        previous = self.result['technicalDetails'] if self.result else []
+        self.result = summarize_local_findings(technical_details, present, self.profile['weights'])
+        added, resolved = diff_findings(previous, technical_details)
+
+        if self.write:
+            feedback = render_ai_feedback(self.result, self.repository, self.competence, self.niveau)
+            with open(os.path.join(self.root, 'FEEDBACK.md'), 'w', encoding='utf-8') as f:
+                f.write(feedback)
+        return self.result, added, resolved
+
+
+def print_round(result, added, resolved, previous_score, duration, changed):
+    score = result['score']
+    delta = '' if previous_score is None or previous_score == score else f' ({score - previous_score:+d})'
+    print(f"{get_score_emoji(score)} Note: {score}/20{delta} - {len(result['technicalDetails'])} problème(s)"
+          f" [{', '.join(sorted(changed))} en {duration * 1000:.1f} ms]")
+    for finding in added:
+        print(f"  ➕ {finding.get('file')}:{finding.get('line')} {finding.get('issue')}")
+    for finding in resolved:
+        print(f"  ✅ Résolu : {finding.get('file')}:{finding.get('line')} {finding.get('issue')}")
+
+
+def watch(root='.', write=True, poll=False, debounce=DEBOUNCE_SECONDS, once=False):
+    session = WatchSession(root, write)
+    names = [file_name for file_name, _ in session.files]
+
+    started = time.perf_counter()
+    result, _, _ = session.evaluate(set(names))
+    print_round(result, [], [], None, time.perf_counter() - started, names)
+    if once:
+        return result
+
+    watcher = create_watcher(root, *session.watched(), poll=poll)
+    print(f"👀 Surveillance de {', '.join(session.watched()[0])} (Ctrl+C pour arrêter)")
+    try:
+        while True:
+            changed = session.refresh(wait_for_changes(watcher, debounce))
+            watcher.update(*session.watched())
+            if not changed:
+                continue
+            previous_score = session.result['score']
+            started = time.perf_counter()
+            result, added, resolved = session.evaluate(changed)
+            print_round(result, added, resolved, previous_score, time.perf_counter() - started, changed)
+    except KeyboardInterrupt:
+        print("👋 Surveillance arrêtée")
+    finally:
+        watcher.close()
+    return session.result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Feedback local en continu à chaque enregistrement')
+    parser.add_argument('--root', default='.', help='Dossier de la soumission')
+    parser.add_argument('--no-write', action='store_true', help='Ne pas réécrire FEEDBACK.md (affichage seul)')
+    parser.add_argument('--poll', action='store_true', help='Scrutation plutôt qu\'inotify (dossiers montés, hors Linux)')
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE_SECONDS,
+                        help=f'Délai de regroupement des enregistrements en secondes (défaut: {DEBOUNCE_SECONDS})')
+    parser.add_argument('--once', action='store_true', help='Une seule évaluation puis sortie')
+    args = parser.parse_args(argv)
+
+    watch(args.root, not args.no_write, args.poll, args.debounce, args.once)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())